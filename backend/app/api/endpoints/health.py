@@ -9,6 +9,8 @@ import os
 from datetime import datetime
 
 from app.core.config import settings
+from app.services.retention import get_free_space
+from app.tasks.worker_lifecycle import list_ready_workers
 
 router = APIRouter()
 
@@ -52,11 +54,17 @@ async def detailed_health_check() -> Dict[str, Any]:
     try:
         upload_dir = settings.UPLOAD_DIR
         if os.path.exists(upload_dir) and os.access(upload_dir, os.W_OK):
+            free_bytes = get_free_space()
+            low_space = free_bytes < settings.STORAGE_LOW_WATERMARK_BYTES
             health_status["dependencies"]["upload_directory"] = {
-                "status": "healthy",
+                "status": "low_space" if low_space else "healthy",
                 "path": upload_dir,
-                "writable": True
+                "writable": True,
+                "free_bytes": free_bytes,
+                "low_watermark_bytes": settings.STORAGE_LOW_WATERMARK_BYTES
             }
+            if low_space:
+                health_status["status"] = "degraded"
         else:
             health_status["dependencies"]["upload_directory"] = {
                 "status": "unhealthy",
@@ -92,6 +100,20 @@ async def detailed_health_check() -> Dict[str, Any]:
             "error": str(e)
         }
     
+    # 检查已完成模型预热的Worker
+    try:
+        ready_workers = list_ready_workers()
+        health_status["dependencies"]["workers"] = {
+            "status": "healthy" if ready_workers else "warning",
+            "ready_count": len(ready_workers),
+            "workers": ready_workers
+        }
+    except Exception as e:
+        health_status["dependencies"]["workers"] = {
+            "status": "unhealthy",
+            "error": str(e)
+        }
+    
     # 检查DeepSeek API配置
     if settings.DEEPSEEK_API_KEY:
         health_status["dependencies"]["deepseek_api"] = {
@@ -2,13 +2,17 @@
 任务状态查询API端点
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from typing import Dict, Any, List
 from celery.result import AsyncResult
 from datetime import datetime
 
 from app.core.config import settings
 from app.core.celery_app import celery_app
+from app.services.model_cache import collect_stats
+from app.services.result_store import load_task_result, load_batch_manifest
+from app.services.segment_stream import read_segments
+from app.services.summary_stream import read_summary
 
 router = APIRouter()
 
@@ -37,6 +41,18 @@ async def get_task_status(task_id: str) -> Dict[str, Any]:
                 }
             }
         
+        # 重复上传直接复用的历史结果
+        if task_id.startswith("cached_"):
+            result = load_task_result(task_id[len("cached_"):])
+            if result is None:
+                raise HTTPException(status_code=404, detail="缓存结果不存在或已被清理")
+            return {
+                "task_id": task_id,
+                "status": "completed",
+                "message": "任务完成（复用历史结果）",
+                "result": result
+            }
+        
         task_result = AsyncResult(task_id, app=celery_app)
         
         if task_result.state == 'PENDING':
@@ -52,7 +68,8 @@ async def get_task_status(task_id: str) -> Dict[str, Any]:
                 "message": "任务处理中",
                 "progress": task_result.info.get('progress', 0),
                 "current_step": task_result.info.get('current_step', ''),
-                "total_steps": task_result.info.get('total_steps', 0)
+                "total_steps": task_result.info.get('total_steps', 0),
+                "audio_duration": task_result.info.get('audio_duration')
             }
         elif task_result.state == 'SUCCESS':
             result = task_result.result
@@ -78,6 +95,8 @@ async def get_task_status(task_id: str) -> Dict[str, Any]:
             
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -195,4 +214,169 @@ async def get_task_stats() -> Dict[str, Any]:
         raise HTTPException(
             status_code=500,
             detail=f"获取任务统计失败: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.get("/stats/models")
+async def get_model_cache_stats() -> Dict[str, Any]:
+    """
+    获取各Worker进程的Whisper模型缓存统计
+    
+    Returns:
+        汇总的命中/未命中/淘汰次数以及每个Worker当前缓存的模型
+    """
+    try:
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            **collect_stats()
+        }
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"获取模型缓存统计失败: {str(e)}"
+        )
+
+def get_task_progress(task_id: str) -> Dict[str, Any]:
+    """获取单个任务的状态与进度（不含结果内容）"""
+    if task_id.startswith("minimal_") or task_id.startswith("cached_"):
+        return {"status": "completed", "progress": 100}
+    
+    task_result = AsyncResult(task_id, app=celery_app)
+    if task_result.state == 'PROGRESS':
+        return {
+            "status": "processing",
+            "progress": task_result.info.get('progress', 0),
+            "current_step": task_result.info.get('current_step', '')
+        }
+    if task_result.state == 'SUCCESS':
+        return {"status": "completed", "progress": 100}
+    if task_result.state == 'FAILURE':
+        return {"status": "failed", "progress": 100, "error": str(task_result.info)}
+    return {"status": task_result.state.lower(), "progress": 0}
+
+@router.get("/batch/{batch_id}")
+async def get_batch_status(batch_id: str) -> Dict[str, Any]:
+    """
+    获取批量上传的汇总进度
+    
+    Args:
+        batch_id: 批次ID
+        
+    Returns:
+        批次汇总进度以及每个文件的任务状态
+    """
+    manifest = load_batch_manifest(batch_id)
+    if manifest is None:
+        raise HTTPException(status_code=404, detail="批次不存在")
+    
+    try:
+        files = []
+        counts = {"completed": 0, "failed": 0, "processing": 0, "pending": 0}
+        for item in manifest["files"]:
+            task_progress = get_task_progress(item["task_id"])
+            files.append({**item, **task_progress})
+            counts[task_progress["status"] if task_progress["status"] in counts else "pending"] += 1
+        
+        total = len(files)
+        finished = counts["completed"] + counts["failed"]
+        if finished < total:
+            status = "processing" if finished or counts["processing"] else "pending"
+        else:
+            status = "completed" if counts["failed"] == 0 else "completed_with_errors"
+        
+        return {
+            "batch_id": batch_id,
+            "status": status,
+            "created_at": manifest["created_at"],
+            "total": total,
+            **counts,
+            "progress": round(sum(f["progress"] for f in files) / total, 1) if total else 100,
+            "files": files
+        }
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"获取批次状态失败: {str(e)}"
+        )
+
+@router.get("/{task_id}/segments")
+async def get_task_segments(
+    task_id: str,
+    cursor: int = Query(0, ge=0),
+    limit: int = Query(200, ge=1, le=1000)
+) -> Dict[str, Any]:
+    """
+    增量获取转录进行中已完成的片段
+    
+    Args:
+        task_id: 任务ID
+        cursor: 上次返回的next_cursor（首次为0）
+        limit: 最多返回的片段数
+        
+    Returns:
+        片段列表、下一次请求的游标，以及转录是否已结束
+    """
+    try:
+        if task_id.startswith("minimal_"):
+            return {"task_id": task_id, "segments": [], "next_cursor": cursor, "complete": True}
+        
+        # 复用的历史结果直接从结果文件中分页返回
+        if task_id.startswith("cached_"):
+            result = load_task_result(task_id[len("cached_"):])
+            if result is None:
+                raise HTTPException(status_code=404, detail="缓存结果不存在或已被清理")
+            segments = (result.get("transcription") or {}).get("segments", [])[cursor:cursor + limit]
+            return {
+                "task_id": task_id,
+                "segments": segments,
+                "next_cursor": cursor + len(segments),
+                "complete": True
+            }
+        
+        return {"task_id": task_id, **read_segments(task_id, cursor, limit)}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"获取转录片段失败: {str(e)}"
+        )
+
+@router.get("/{task_id}/summary-stream")
+async def get_task_summary_stream(
+    task_id: str,
+    cursor: int = Query(0, ge=0)
+) -> Dict[str, Any]:
+    """
+    增量获取生成中的会议纪要（大模型流式输出）
+    
+    Args:
+        task_id: 任务ID
+        cursor: 上次返回的next_cursor（首次为0）
+        
+    Returns:
+        新增的思考过程与纪要正文文本、下一次请求的游标、摘要是否已生成结束
+    """
+    try:
+        if task_id.startswith("minimal_"):
+            return {"task_id": task_id, "reasoning": "", "content": "", "next_cursor": cursor, "complete": True, "error": None}
+        
+        # 复用的历史结果一次性返回完整纪要
+        if task_id.startswith("cached_"):
+            result = load_task_result(task_id[len("cached_"):])
+            if result is None:
+                raise HTTPException(status_code=404, detail="缓存结果不存在或已被清理")
+            content = (result.get("summary") or {}).get("summary", "") if cursor == 0 else ""
+            return {"task_id": task_id, "reasoning": "", "content": content, "next_cursor": 1, "complete": True, "error": None}
+        
+        return {"task_id": task_id, **read_summary(task_id, cursor)}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"获取摘要增量失败: {str(e)}"
+        )
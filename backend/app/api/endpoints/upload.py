@@ -2,27 +2,114 @@
 文件上传API端点
 """
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Form
-from typing import Dict, Any
+from fastapi import APIRouter, HTTPException, Request, Query
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
+from celery import group
+from typing import Dict, Any, List, Optional
 import os
 import uuid
 from pathlib import Path
 from datetime import datetime
 
+from app.core.celery_app import model_queue
 from app.core.config import settings
+from app.services import file_index
+from app.services.audio_probe import probe_audio, AudioProbeError, SNIFF_HEADER_SIZE
+from app.services.blob_storage import get_storage, StorageError
+from app.services.file_index import get_audio_key, get_audio_path
+from app.services.retention import has_capacity
+from app.services.transcription_engines import ENGINES
+from app.services.queue_balancer import request_rebalance
+from app.services.result_store import find_cached_result, load_task_result, save_batch_manifest
+from app.services.upload_stream import (
+    stream_multipart_upload,
+    stream_multipart_files,
+    extract_zip_members,
+    compute_sha256,
+    UploadTooLargeError,
+    UploadFormatError,
+)
+from app.services import upload_sessions
+from app.services.upload_sessions import UploadSessionError, UploadSessionNotFound
 from app.tasks.audio_processing import process_audio_task
 
 router = APIRouter()
 
-def validate_audio_file(file: UploadFile) -> bool:
+# 上传接口的表单结构（请求体由流式解析器处理，此处仅用于生成API文档）
+AUDIO_UPLOAD_FORM_SCHEMA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {
+                        "file": {"type": "string", "format": "binary"},
+                        "meeting_title": {"type": "string"},
+                        "language": {"type": "string", "default": "auto"},
+                        "whisper_model": {"type": "string", "default": "base"},
+                        "engine": {"type": "string", "enum": ["whisper", "faster-whisper"]},
+                    },
+                }
+            }
+        },
+    }
+}
+
+BATCH_UPLOAD_FORM_SCHEMA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["files"],
+                    "properties": {
+                        "files": {
+                            "type": "array",
+                            "items": {"type": "string", "format": "binary"}
+                        },
+                        "language": {"type": "string", "default": "auto"},
+                        "whisper_model": {"type": "string", "default": "base"},
+                        "engine": {"type": "string", "enum": ["whisper", "faster-whisper"]},
+                    },
+                }
+            }
+        },
+    }
+}
+
+class UploadSessionCreate(BaseModel):
+    """创建可续传上传会话的请求参数"""
+    filename: str
+    file_size: int = Field(..., gt=0)
+    meeting_title: Optional[str] = None
+    language: str = "auto"
+    whisper_model: str = "base"
+    engine: Optional[str] = None
+
+class DirectUploadCreate(UploadSessionCreate):
+    """创建对象存储直传的请求参数"""
+    content_type: Optional[str] = None
+    sha256: Optional[str] = Field(None, pattern=r"^[0-9a-fA-F]{64}$")  # 文件内容哈希（可选，提供时存储端校验）
+
+def validate_audio_file(filename: str) -> bool:
     """验证音频文件格式"""
     # 检查文件扩展名
-    file_extension = Path(file.filename).suffix.lower().lstrip('.')
+    file_extension = Path(filename).suffix.lower().lstrip('.')
     if file_extension not in settings.ALLOWED_AUDIO_FORMATS:
         return False
     
     return True
 
+def validate_engine(engine: Optional[str]) -> Optional[str]:
+    """校验转录引擎，未指定时返回None（使用TRANSCRIBE_ENGINE配置）"""
+    if engine and engine not in ENGINES:
+        raise HTTPException(status_code=400, detail=f"不支持的转录引擎: {engine}，可选: {', '.join(ENGINES)}")
+    return engine or None
+
 def get_file_type(file_path: str) -> str:
     """获取文件MIME类型"""
     try:
@@ -41,89 +128,206 @@ def get_file_type(file_path: str) -> str:
     except:
         return "unknown"
 
-@router.post("/audio")
-async def upload_audio_file(
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(...),
-    meeting_title: str = Form(None),
-    language: str = Form("auto"),
-    whisper_model: str = Form("base")
+def build_file_info(
+    file_id: str,
+    file_path: Path,
+    original_filename: str,
+    file_size: int,
+    meeting_title: Optional[str],
+    language: str,
+    whisper_model: str,
+    sha256: Optional[str] = None,
+    audio_meta: Optional[Dict[str, Any]] = None,
+    engine: Optional[str] = None
 ) -> Dict[str, Any]:
+    """构建传递给处理任务的文件信息"""
+    audio_meta = audio_meta or {}
+    return {
+        "file_id": file_id,
+        "original_filename": original_filename,
+        "file_path": str(file_path),
+        "file_size": file_size,
+        "file_type": get_file_type(str(file_path)),
+        "upload_time": datetime.utcnow().isoformat(),
+        "meeting_title": meeting_title or f"会议录音_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+        "language": language,
+        "whisper_model": whisper_model,
+        "engine": engine or settings.TRANSCRIBE_ENGINE,
+        "sha256": sha256,
+        "duration": audio_meta.get("duration"),
+        "audio": audio_meta
+    }
+
+def summarize_file_info(file_info: Dict[str, Any]) -> Dict[str, Any]:
+    """提取返回给客户端的文件信息字段"""
+    return {
+        "file_id": file_info["file_id"],
+        "original_filename": file_info["original_filename"],
+        "file_size": file_info["file_size"],
+        "meeting_title": file_info["meeting_title"],
+        "language": file_info["language"],
+        "upload_time": file_info["upload_time"],
+        "duration": file_info.get("duration")
+    }
+
+async def probe_upload(file_path: Path) -> Dict[str, Any]:
     """
-    上传音频文件并启动处理任务
-    
-    Args:
-        file: 音频文件
-        meeting_title: 会议标题（可选）
-        language: 转录语言（默认自动检测）
-        whisper_model: Whisper模型类型（base/large/turbo，默认base）
+    探测已落盘的上传文件，损坏或非音频文件直接删除并拒绝
     
     Returns:
-        包含任务ID和文件信息的响应
+        音频元数据（时长、声道、采样率、编码），未启用探测时返回空字典
+    """
+    if not settings.AUDIO_PROBE_ENABLED:
+        return {}
+    
+    try:
+        return await run_in_threadpool(probe_audio, file_path)
+    except AudioProbeError as e:
+        file_path.unlink(missing_ok=True)
+        raise HTTPException(status_code=400, detail=f"音频文件无效: {str(e)}")
+
+def ensure_storage_capacity(incoming_bytes: int = 0) -> None:
+    """磁盘可用空间低于低水位线时拒绝上传"""
+    if not has_capacity(incoming_bytes):
+        raise HTTPException(status_code=507, detail="服务器存储空间不足，请稍后再试")
+
+def declared_content_length(request: Request) -> int:
+    """读取请求声明的Content-Length，缺失或无效时返回0"""
+    try:
+        return int(request.headers.get("content-length", 0))
+    except ValueError:
+        return 0
+
+def find_legacy_files(file_id: str) -> List[Path]:
+    """查找建立索引前以 {file_id}.* 保存在上传目录根下的文件"""
+    try:
+        uuid.UUID(file_id)
+    except ValueError:
+        return []
+    return [path for path in Path(settings.UPLOAD_DIR).glob(f"{file_id}.*") if path.is_file()]
+
+def persist_audio(file_id: str, file_path: Path) -> str:
+    """将已落盘的音频保存到存储后端，返回存储key"""
+    return get_storage().save(file_path, get_audio_key(file_id, file_path.suffix))
+
+def find_duplicate(
+    file_path: Path,
+    sha256: Optional[str],
+    whisper_model: str,
+    language: str
+) -> Optional[Dict[str, Any]]:
     """
+    查找相同内容、相同模型和语言的已完成结果
     
-    # 验证文件
-    if not file.filename:
-        raise HTTPException(status_code=400, detail="未选择文件")
+    命中时删除本次上传的文件，返回历史文件ID与结果；未命中返回None。
+    """
+    if not sha256:
+        return None
     
-    if not validate_audio_file(file):
-        raise HTTPException(
-            status_code=400, 
-            detail=f"不支持的文件格式。支持的格式: {', '.join(settings.ALLOWED_AUDIO_FORMATS)}"
-        )
+    cached = find_cached_result(sha256, whisper_model, language)
+    cached_result = load_task_result(cached["file_id"]) if cached else None
+    if not cached_result:
+        return None
     
-    # 检查文件大小
-    file_content = await file.read()
-    if len(file_content) > settings.MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=413, 
-            detail=f"文件过大。最大允许大小: {settings.MAX_FILE_SIZE / 1024 / 1024:.1f}MB"
-        )
+    if file_path.exists():
+        file_path.unlink()
     
-    # 生成唯一文件名
-    file_id = str(uuid.uuid4())
-    file_extension = Path(file.filename).suffix.lower()
-    unique_filename = f"{file_id}{file_extension}"
-    file_path = Path(settings.UPLOAD_DIR) / unique_filename
+    return {
+        "file_id": cached["file_id"],
+        "task_id": f"cached_{cached['file_id']}",
+        "result": cached_result
+    }
+
+def start_processing(
+    file_id: str,
+    file_path: Path,
+    original_filename: str,
+    file_size: int,
+    meeting_title: Optional[str],
+    language: str,
+    whisper_model: str,
+    sha256: Optional[str] = None,
+    audio_meta: Optional[Dict[str, Any]] = None,
+    storage_key: Optional[str] = None,
+    engine: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    为已落盘的音频文件构建文件信息，保存到存储后端并启动处理任务
+    
+    若相同内容已用相同模型和语言处理完成，则删除本次上传的文件并直接返回历史结果，不再入队。
+    包含网络与数据库操作，异步接口中应通过线程池调用。
+    
+    Args:
+        file_id: 文件ID
+        file_path: 音频文件路径
+        original_filename: 原始文件名
+        file_size: 文件大小
+        meeting_title: 会议标题（可选）
+        language: 转录语言
+        whisper_model: Whisper模型类型
+        sha256: 文件内容哈希（可选，用于去重）
+        audio_meta: 上传时探测到的音频元数据（可选）
+        storage_key: 已在存储后端中的key（客户端直传时提供，此时不再保存本地文件）
+        engine: 转录引擎（可选，默认使用TRANSCRIBE_ENGINE配置）
+    
+    Returns:
+        包含任务ID和文件信息的响应
+    """
+    duplicate = find_duplicate(file_path, sha256, whisper_model, language)
+    if duplicate:
+        if storage_key:
+            # 直传的重复文件已在存储后端中，一并删除
+            get_storage().delete(storage_key)
+        return {
+            "success": True,
+            "message": "检测到相同文件，已直接返回历史处理结果",
+            "task_id": duplicate["task_id"],
+            "deduplicated": True,
+            "file_info": {
+                "file_id": duplicate["file_id"],
+                "original_filename": original_filename,
+                "file_size": file_size,
+                "meeting_title": meeting_title or duplicate["result"]["summary"].get("meeting_title", ""),
+                "language": language,
+                "upload_time": datetime.utcnow().isoformat()
+            },
+            "result": duplicate["result"]
+        }
     
     try:
-        # 保存文件
-        with open(file_path, "wb") as buffer:
-            buffer.write(file_content)
-        
         # 获取文件信息
-        file_info = {
-            "file_id": file_id,
-            "original_filename": file.filename,
-            "file_path": str(file_path),
-            "file_size": len(file_content),
-            "file_type": get_file_type(str(file_path)),
-            "upload_time": datetime.utcnow().isoformat(),
-            "meeting_title": meeting_title or f"会议录音_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-            "language": language,
-            "whisper_model": whisper_model
-        }
+        file_info = build_file_info(
+            file_id=file_id,
+            file_path=file_path,
+            original_filename=original_filename,
+            file_size=file_size,
+            meeting_title=meeting_title,
+            language=language,
+            whisper_model=whisper_model,
+            sha256=sha256,
+            audio_meta=audio_meta,
+            engine=engine
+        )
+        file_info["storage_key"] = storage_key or persist_audio(file_id, file_path)
+        
+        file_index.register_file(file_info, state="uploaded")
         
         # 检查是否为最小化模式（没有Celery）
         try:
             # 尝试启动后台处理任务
-            task_result = process_audio_task.delay(
-                file_path=str(file_path),
-                file_info=file_info
+            task_result = process_audio_task.apply_async(
+                kwargs={"file_path": str(file_path), "file_info": file_info},
+                queue=model_queue(whisper_model)
             )
+            file_index.update_file(file_id, state="queued", task_id=task_result.id)
+            # 所选模型的队列可能无人订阅（Worker未预加载该模型），立即请求均衡
+            request_rebalance()
             
             return {
                 "success": True,
                 "message": "文件上传成功，正在处理中",
                 "task_id": task_result.id,
-                "file_info": {
-                    "file_id": file_id,
-                    "original_filename": file.filename,
-                    "file_size": len(file_content),
-                    "meeting_title": file_info["meeting_title"],
-                    "language": language,
-                    "upload_time": file_info["upload_time"]
-                }
+                "file_info": summarize_file_info(file_info)
             }
         except Exception as celery_error:
             # Celery不可用，返回最小化响应
@@ -131,20 +335,13 @@ async def upload_audio_file(
                 "success": True,
                 "message": "文件上传成功（最小化模式）",
                 "task_id": f"minimal_{file_id}",
-                "file_info": {
-                    "file_id": file_id,
-                    "original_filename": file.filename,
-                    "file_size": len(file_content),
-                    "meeting_title": file_info["meeting_title"],
-                    "language": language,
-                    "upload_time": file_info["upload_time"]
-                },
+                "file_info": summarize_file_info(file_info),
                 "note": "当前为最小化模式，音频处理功能需要完整部署才能使用"
             }
         
     except Exception as e:
-        # 清理已上传的文件
-        if file_path.exists():
+        # 清理已上传的文件（直传的文件不在本机）
+        if storage_key is None and file_path.exists():
             file_path.unlink()
         
         raise HTTPException(
@@ -152,23 +349,594 @@ async def upload_audio_file(
             detail=f"文件处理失败: {str(e)}"
         )
 
-@router.delete("/audio/{file_id}")
-async def delete_audio_file(file_id: str) -> Dict[str, Any]:
-    """删除上传的音频文件"""
+@router.post("/audio", openapi_extra=AUDIO_UPLOAD_FORM_SCHEMA)
+async def upload_audio_file(request: Request) -> Dict[str, Any]:
+    """
+    上传音频文件并启动处理任务
+    
+    请求体按块流式写入上传目录，内存占用与文件大小无关。
+    
+    Form Args:
+        file: 音频文件
+        meeting_title: 会议标题（可选）
+        language: 转录语言（默认自动检测）
+        whisper_model: Whisper模型类型（base/large/turbo，默认base）
+        engine: 转录引擎（whisper/faster-whisper，默认使用服务端配置）
+    
+    Returns:
+        包含任务ID和文件信息的响应
+    """
+    
+    ensure_storage_capacity(declared_content_length(request))
+    
+    # 生成唯一文件名
+    file_id = str(uuid.uuid4())
+    
+    def build_file_path(filename: str) -> Path:
+        # 验证文件
+        if not filename:
+            raise UploadFormatError("未选择文件")
+        if not validate_audio_file(filename):
+            raise UploadFormatError(
+                f"不支持的文件格式。支持的格式: {', '.join(settings.ALLOWED_AUDIO_FORMATS)}"
+            )
+        return get_audio_path(file_id, Path(filename).suffix)
+    
+    # 流式保存文件，超过大小限制时中途中止
+    try:
+        upload = await stream_multipart_upload(
+            request,
+            file_field="file",
+            build_path=build_file_path,
+            max_size=settings.MAX_FILE_SIZE,
+            chunk_size=settings.UPLOAD_CHUNK_SIZE
+        )
+    except UploadTooLargeError:
+        raise HTTPException(
+            status_code=413, 
+            detail=f"文件过大。最大允许大小: {settings.MAX_FILE_SIZE / 1024 / 1024:.1f}MB"
+        )
+    except UploadFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        engine = validate_engine(upload["fields"].get("engine"))
+    except HTTPException:
+        upload["file_path"].unlink(missing_ok=True)
+        raise
+    
+    # 探测音频头信息，损坏或非音频文件不进入队列
+    audio_meta = await probe_upload(upload["file_path"])
+    
+    return await run_in_threadpool(
+        start_processing,
+        file_id=file_id,
+        file_path=upload["file_path"],
+        original_filename=upload["filename"],
+        file_size=upload["file_size"],
+        meeting_title=upload["fields"].get("meeting_title") or None,
+        language=upload["fields"].get("language") or "auto",
+        whisper_model=upload["fields"].get("whisper_model") or "base",
+        sha256=upload["sha256"],
+        audio_meta=audio_meta,
+        engine=engine
+    )
+
+@router.post("/audio/batch", openapi_extra=BATCH_UPLOAD_FORM_SCHEMA)
+async def upload_audio_batch(request: Request) -> Dict[str, Any]:
+    """
+    批量上传多个音频文件（或包含音频的zip压缩包）并以Celery group分发处理
     
-    # 查找文件
-    upload_dir = Path(settings.UPLOAD_DIR)
-    file_pattern = f"{file_id}.*"
+    所有文件共用同一组表单参数；按文件大小升序入队，短文件先出结果。
     
-    matching_files = list(upload_dir.glob(file_pattern))
+    Form Args:
+        files: 音频文件或zip压缩包（可重复）
+        language: 转录语言（默认自动检测）
+        whisper_model: Whisper模型类型（base/large/turbo，默认base）
+        engine: 转录引擎（whisper/faster-whisper，默认使用服务端配置）
+    
+    Returns:
+        批次ID以及每个文件的任务ID
+    """
+    ensure_storage_capacity(declared_content_length(request))
+    
+    def build_file_path(filename: str) -> Path:
+        extension = Path(filename).suffix.lower()
+        if extension == ".zip":
+            tmp_dir = Path(settings.UPLOAD_DIR) / "tmp"
+            tmp_dir.mkdir(exist_ok=True)
+            return tmp_dir / f"batch_{uuid.uuid4()}.zip"
+        if not validate_audio_file(filename):
+            raise UploadFormatError(
+                f"不支持的文件格式: {filename}。支持的格式: {', '.join(settings.ALLOWED_AUDIO_FORMATS)}, zip"
+            )
+        return get_audio_path(str(uuid.uuid4()), extension)
     
-    if not matching_files:
-        raise HTTPException(status_code=404, detail="文件未找到")
+    def file_size_limit(filename: str) -> int:
+        if Path(filename).suffix.lower() == ".zip":
+            return settings.MAX_BATCH_TOTAL_SIZE
+        return settings.MAX_FILE_SIZE
+    
+    def build_member_path(filename: str) -> Path:
+        return get_audio_path(str(uuid.uuid4()), Path(filename).suffix)
+    
+    try:
+        upload = await stream_multipart_files(
+            request,
+            file_field="files",
+            build_path=build_file_path,
+            max_file_size=settings.MAX_FILE_SIZE,
+            max_total_size=settings.MAX_BATCH_TOTAL_SIZE,
+            max_files=settings.MAX_BATCH_FILES,
+            chunk_size=settings.UPLOAD_CHUNK_SIZE,
+            file_size_limit=file_size_limit
+        )
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=f"上传内容过大: {str(e)}")
+    except UploadFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # 展开zip压缩包中的音频文件：直接上传的音频先计入总量，各压缩包依次使用剩余的解压额度
+    entries = [saved for saved in upload["files"] if saved["file_path"].suffix != ".zip"]
+    remaining_size = settings.MAX_BATCH_TOTAL_SIZE - sum(entry["file_size"] for entry in entries)
+    try:
+        for saved in upload["files"]:
+            if saved["file_path"].suffix != ".zip":
+                continue
+            extracted = await run_in_threadpool(
+                extract_zip_members,
+                saved["file_path"],
+                build_path=build_member_path,
+                is_allowed=validate_audio_file,
+                max_file_size=settings.MAX_FILE_SIZE,
+                max_total_size=remaining_size,
+                max_files=settings.MAX_BATCH_FILES - len(entries),
+                chunk_size=settings.UPLOAD_CHUNK_SIZE
+            )
+            entries.extend(extracted)
+            remaining_size -= sum(entry["file_size"] for entry in extracted)
+            saved["file_path"].unlink(missing_ok=True)
+    except Exception as e:
+        # 任一文件失败时删除本次请求已写入的全部文件（含尚未展开的压缩包）
+        for entry in upload["files"] + entries:
+            entry["file_path"].unlink(missing_ok=True)
+        if isinstance(e, UploadTooLargeError):
+            raise HTTPException(status_code=413, detail=str(e))
+        if isinstance(e, UploadFormatError):
+            raise HTTPException(status_code=400, detail=str(e))
+        raise HTTPException(status_code=500, detail=f"文件处理失败: {str(e)}")
+    
+    if not entries:
+        raise HTTPException(status_code=400, detail="上传内容中没有可处理的音频文件")
+    
+    language = upload["fields"].get("language") or "auto"
+    whisper_model = upload["fields"].get("whisper_model") or "base"
+    try:
+        engine = validate_engine(upload["fields"].get("engine"))
+    except HTTPException:
+        for entry in entries:
+            entry["file_path"].unlink(missing_ok=True)
+        raise
+    
+    batch_files = []
+    pending = []
+    rejected = []
+    for entry in entries:
+        try:
+            audio_meta = await probe_upload(entry["file_path"])
+        except HTTPException as e:
+            rejected.append({"original_filename": entry["filename"], "error": e.detail})
+            continue
+        
+        duplicate = await run_in_threadpool(
+            find_duplicate, entry["file_path"], entry["sha256"], whisper_model, language
+        )
+        if duplicate:
+            batch_files.append({
+                "file_id": duplicate["file_id"],
+                "original_filename": entry["filename"],
+                "file_size": entry["file_size"],
+                "task_id": duplicate["task_id"],
+                "deduplicated": True
+            })
+            continue
+        
+        pending.append(build_file_info(
+            file_id=entry["file_path"].stem,
+            file_path=entry["file_path"],
+            original_filename=entry["filename"],
+            file_size=entry["file_size"],
+            meeting_title=Path(entry["filename"]).stem,
+            language=language,
+            whisper_model=whisper_model,
+            sha256=entry["sha256"],
+            audio_meta=audio_meta,
+            engine=engine
+        ))
+    
+    if not batch_files and not pending:
+        raise HTTPException(
+            status_code=400,
+            detail="没有有效的音频文件: " + "; ".join(f"{r['original_filename']}: {r['error']}" for r in rejected)
+        )
+    
+    # 短音频优先入队，降低批次内的平均完成时间（无时长信息时按文件大小）
+    pending.sort(key=lambda info: (info["duration"] is None, info["duration"] or 0, info["file_size"]))
+    
+    try:
+        for info in pending:
+            info["storage_key"] = await run_in_threadpool(
+                persist_audio, info["file_id"], Path(info["file_path"])
+            )
+            await run_in_threadpool(file_index.register_file, info, state="uploaded")
+    except Exception as e:
+        for info in pending:
+            Path(info["file_path"]).unlink(missing_ok=True)
+            if info.get("storage_key"):
+                await run_in_threadpool(get_storage().delete, info["storage_key"])
+        raise HTTPException(status_code=500, detail=f"文件处理失败: {str(e)}")
+    
+    batch_id = str(uuid.uuid4())
+    minimal_mode = False
+    task_ids = []
+    if pending:
+        try:
+            group_result = group(
+                process_audio_task.s(file_path=info["file_path"], file_info=info).set(
+                    queue=model_queue(whisper_model)
+                )
+                for info in pending
+            ).apply_async()
+            batch_id = group_result.id
+            task_ids = [child.id for child in group_result.results]
+            await run_in_threadpool(request_rebalance)
+        except Exception:
+            # Celery不可用，返回最小化响应
+            minimal_mode = True
+            task_ids = [f"minimal_{info['file_id']}" for info in pending]
+    
+    for info, task_id in zip(pending, task_ids):
+        if not minimal_mode:
+            await run_in_threadpool(file_index.update_file, info["file_id"], state="queued", task_id=task_id)
+        batch_files.append({
+            "file_id": info["file_id"],
+            "original_filename": info["original_filename"],
+            "file_size": info["file_size"],
+            "duration": info["duration"],
+            "task_id": task_id,
+            "deduplicated": False
+        })
+    
+    manifest = {
+        "batch_id": batch_id,
+        "created_at": datetime.utcnow().isoformat(),
+        "language": language,
+        "whisper_model": whisper_model,
+        "files": batch_files,
+        "rejected": rejected
+    }
+    try:
+        await run_in_threadpool(save_batch_manifest, batch_id, manifest)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"保存批次信息失败: {str(e)}")
+    
+    response = {
+        "success": True,
+        "message": f"已接收 {len(batch_files)} 个文件，正在批量处理",
+        **manifest
+    }
+    if minimal_mode:
+        response["note"] = "当前为最小化模式，音频处理功能需要完整部署才能使用"
+    return response
+
+@router.post("/sessions")
+async def create_upload_session(params: UploadSessionCreate) -> Dict[str, Any]:
+    """
+    创建可续传的分块上传会话
+    
+    客户端随后按偏移量PUT各分块（可乱序、可并行），中断后查询已接收区间只补传缺失部分，
+    全部到齐后调用complete接口合并文件并启动处理任务。
+    
+    Returns:
+        会话ID与建议的分块大小
+    """
+    if not validate_audio_file(params.filename):
+        raise HTTPException(
+            status_code=400, 
+            detail=f"不支持的文件格式。支持的格式: {', '.join(settings.ALLOWED_AUDIO_FORMATS)}"
+        )
+    
+    validate_engine(params.engine)
+    
+    if params.file_size > settings.MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=413, 
+            detail=f"文件过大。最大允许大小: {settings.MAX_FILE_SIZE / 1024 / 1024:.1f}MB"
+        )
+    
+    ensure_storage_capacity(params.file_size)
+    
+    try:
+        session = await run_in_threadpool(
+            upload_sessions.create_session,
+            settings.UPLOAD_DIR,
+            file_size=params.file_size,
+            metadata={
+                "filename": params.filename,
+                "meeting_title": params.meeting_title,
+                "language": params.language,
+                "whisper_model": params.whisper_model,
+                "engine": params.engine
+            }
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"创建上传会话失败: {str(e)}")
+    
+    return {
+        "success": True,
+        "session_id": session["session_id"],
+        "file_size": session["file_size"],
+        "chunk_size": settings.UPLOAD_SESSION_CHUNK_SIZE,
+        "max_chunk_size": settings.UPLOAD_SESSION_MAX_CHUNK_SIZE
+    }
+
+@router.put("/sessions/{session_id}/chunks")
+async def upload_session_chunk(
+    session_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0)
+) -> Dict[str, Any]:
+    """
+    上传一个分块（请求体为原始字节），写入文件的指定偏移
+    
+    Args:
+        session_id: 会话ID
+        offset: 分块在文件中的起始偏移
+    """
+    try:
+        start, end = await upload_sessions.write_chunk(
+            settings.UPLOAD_DIR,
+            session_id,
+            offset=offset,
+            request=request,
+            max_chunk_size=settings.UPLOAD_SESSION_MAX_CHUNK_SIZE,
+            write_size=settings.UPLOAD_CHUNK_SIZE
+        )
+    except UploadSessionNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except UploadSessionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "success": True,
+        "session_id": session_id,
+        "start": start,
+        "end": end
+    }
+
+@router.get("/sessions/{session_id}")
+async def get_upload_session(session_id: str) -> Dict[str, Any]:
+    """查询上传会话的已接收区间"""
+    try:
+        session = await run_in_threadpool(upload_sessions.load_session, settings.UPLOAD_DIR, session_id)
+        ranges = await run_in_threadpool(upload_sessions.get_received_ranges, settings.UPLOAD_DIR, session_id)
+    except UploadSessionNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    received_bytes = sum(end - start for start, end in ranges)
+    return {
+        "session_id": session_id,
+        "filename": session["filename"],
+        "file_size": session["file_size"],
+        "received_ranges": [[start, end] for start, end in ranges],
+        "received_bytes": received_bytes,
+        "complete": received_bytes == session["file_size"]
+    }
+
+@router.post("/sessions/{session_id}/complete")
+async def complete_upload_session(session_id: str) -> Dict[str, Any]:
+    """合并已上传的分块并启动处理任务"""
+    file_id = str(uuid.uuid4())
+    
+    try:
+        session = await run_in_threadpool(upload_sessions.load_session, settings.UPLOAD_DIR, session_id)
+        file_path = await run_in_threadpool(get_audio_path, file_id, Path(session['filename']).suffix)
+        await run_in_threadpool(upload_sessions.finalize_session, settings.UPLOAD_DIR, session_id, file_path)
+    except UploadSessionNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except UploadSessionError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    # 分块乱序到达，合并后再统一计算内容哈希
+    sha256 = await run_in_threadpool(compute_sha256, file_path, settings.UPLOAD_CHUNK_SIZE)
+    audio_meta = await probe_upload(file_path)
+    
+    return await run_in_threadpool(
+        start_processing,
+        file_id=file_id,
+        file_path=file_path,
+        original_filename=session["filename"],
+        file_size=session["file_size"],
+        meeting_title=session.get("meeting_title"),
+        language=session.get("language") or "auto",
+        whisper_model=session.get("whisper_model") or "base",
+        sha256=sha256,
+        audio_meta=audio_meta,
+        engine=session.get("engine")
+    )
+
+@router.delete("/sessions/{session_id}")
+async def delete_upload_session(session_id: str) -> Dict[str, Any]:
+    """放弃上传会话"""
+    try:
+        await run_in_threadpool(upload_sessions.delete_session, settings.UPLOAD_DIR, session_id)
+    except UploadSessionNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    return {
+        "success": True,
+        "message": "上传会话已删除",
+        "session_id": session_id
+    }
+
+@router.post("/direct")
+async def create_direct_upload(params: DirectUploadCreate) -> Dict[str, Any]:
+    """
+    创建客户端直传对象存储的上传
+    
+    客户端使用返回的预签名URL将文件直接上传到对象存储，完成后调用complete接口，
+    音频数据不经过API服务器。仅在STORAGE_BACKEND=s3时可用。
+    
+    Returns:
+        会话ID与预签名上传参数
+    """
+    storage = get_storage()
+    if not storage.supports_presign:
+        raise HTTPException(status_code=501, detail="当前存储后端不支持直传，请使用分块上传接口")
+    
+    if not validate_audio_file(params.filename):
+        raise HTTPException(
+            status_code=400, 
+            detail=f"不支持的文件格式。支持的格式: {', '.join(settings.ALLOWED_AUDIO_FORMATS)}"
+        )
+    
+    validate_engine(params.engine)
+    
+    if params.file_size > settings.MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=413, 
+            detail=f"文件过大。最大允许大小: {settings.MAX_FILE_SIZE / 1024 / 1024:.1f}MB"
+        )
+    
+    file_id = str(uuid.uuid4())
+    storage_key = get_audio_key(file_id, Path(params.filename).suffix)
+    content_type = params.content_type or get_file_type(params.filename)
+    sha256 = params.sha256.lower() if params.sha256 else None
+    
+    try:
+        upload = storage.presign_upload(storage_key, content_type, settings.S3_PRESIGN_EXPIRES, sha256=sha256)
+        session = await run_in_threadpool(
+            upload_sessions.create_session,
+            settings.UPLOAD_DIR,
+            file_size=params.file_size,
+            metadata={
+                "file_id": file_id,
+                "storage_key": storage_key,
+                "filename": params.filename,
+                "meeting_title": params.meeting_title,
+                "language": params.language,
+                "whisper_model": params.whisper_model,
+                "engine": params.engine,
+                "sha256": sha256
+            },
+            direct=True
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"创建直传失败: {str(e)}")
+    
+    return {
+        "success": True,
+        "session_id": session["session_id"],
+        "file_id": file_id,
+        "expires_in": settings.S3_PRESIGN_EXPIRES,
+        "upload": upload
+    }
+
+@router.post("/direct/{session_id}/complete")
+async def complete_direct_upload(session_id: str) -> Dict[str, Any]:
+    """确认直传已完成：校验对象大小与内容哈希、探测音频头信息并启动处理任务"""
+    try:
+        session = await run_in_threadpool(upload_sessions.load_session, settings.UPLOAD_DIR, session_id)
+    except UploadSessionNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if not session.get("direct"):
+        raise HTTPException(status_code=409, detail="该会话不是直传会话")
+    
+    storage = get_storage()
+    storage_key = session["storage_key"]
+    try:
+        uploaded_size = await run_in_threadpool(storage.size, storage_key)
+    except FileNotFoundError:
+        raise HTTPException(status_code=409, detail="文件尚未上传到存储")
+    except StorageError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if uploaded_size != session["file_size"]:
+        await run_in_threadpool(storage.delete, storage_key)
+        await run_in_threadpool(upload_sessions.delete_session, settings.UPLOAD_DIR, session_id)
+        raise HTTPException(
+            status_code=400,
+            detail=f"上传文件大小不符: 声明 {session['file_size']} 字节，实际 {uploaded_size} 字节"
+        )
+    
+    # 内容哈希用于去重与转录结果缓存：客户端提供时已由存储端校验，否则流式读取对象计算
+    try:
+        sha256 = await run_in_threadpool(storage.sha256, storage_key, settings.UPLOAD_CHUNK_SIZE)
+    except (FileNotFoundError, StorageError) as e:
+        raise HTTPException(status_code=500, detail=f"计算文件哈希失败: {str(e)}")
+    if session.get("sha256") and session["sha256"] != sha256:
+        await run_in_threadpool(storage.delete, storage_key)
+        await run_in_threadpool(upload_sessions.delete_session, settings.UPLOAD_DIR, session_id)
+        raise HTTPException(status_code=400, detail="上传文件内容与声明的SHA-256不符")
+    
+    # 只读取文件头，ffprobe通过预签名URL按需范围读取容器元数据，无需下载整个文件
+    audio_meta: Dict[str, Any] = {}
+    if settings.AUDIO_PROBE_ENABLED:
+        try:
+            header = await run_in_threadpool(storage.read_head, storage_key, SNIFF_HEADER_SIZE)
+            probe_url = storage.presign_download(storage_key, settings.S3_PRESIGN_EXPIRES)
+            audio_meta = await run_in_threadpool(probe_audio, probe_url, header)
+        except AudioProbeError as e:
+            await run_in_threadpool(storage.delete, storage_key)
+            await run_in_threadpool(upload_sessions.delete_session, settings.UPLOAD_DIR, session_id)
+            raise HTTPException(status_code=400, detail=f"音频文件无效: {str(e)}")
+    
+    await run_in_threadpool(upload_sessions.delete_session, settings.UPLOAD_DIR, session_id)
+    
+    return await run_in_threadpool(
+        start_processing,
+        file_id=session["file_id"],
+        file_path=Path(storage_key),
+        original_filename=session["filename"],
+        file_size=uploaded_size,
+        meeting_title=session.get("meeting_title"),
+        language=session.get("language") or "auto",
+        whisper_model=session.get("whisper_model") or "base",
+        sha256=sha256,
+        audio_meta=audio_meta,
+        storage_key=storage_key,
+        engine=session.get("engine")
+    )
+
+@router.delete("/audio/{file_id}")
+async def delete_audio_file(file_id: str) -> Dict[str, Any]:
+    """删除上传的音频文件及其处理结果"""
+    
+    # 通过索引直接定位文件，无需扫描上传目录
+    record = await run_in_threadpool(file_index.get_file, file_id)
+    if record is None:
+        # 建立索引前上传的文件只存在于上传目录根下，按文件ID匹配
+        legacy_files = await run_in_threadpool(find_legacy_files, file_id)
+        if not legacy_files:
+            raise HTTPException(status_code=404, detail="文件未找到")
+        try:
+            for file_path in legacy_files:
+                await run_in_threadpool(file_path.unlink, missing_ok=True)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"文件删除失败: {str(e)}")
+        return {
+            "success": True,
+            "message": "文件删除成功",
+            "file_id": file_id
+        }
     
     try:
         # 删除文件
-        for file_path in matching_files:
-            file_path.unlink()
+        storage = get_storage()
+        for key in (record["audio_path"], record["result_path"]):
+            if key:
+                await run_in_threadpool(storage.delete, key)
+        await run_in_threadpool(file_index.delete_file, file_id)
         
         return {
             "success": True,
@@ -3,14 +3,35 @@ Celery应用配置
 """
 
 from celery import Celery
-from .config import settings
+from .config import settings, WHISPER_MODEL_SIZES
+
+# 未区分模型的音频处理队列（兼容旧任务及未知模型）
+AUDIO_PROCESSING_QUEUE = "audio_processing"
+
+def model_queue(model_name: str) -> str:
+    """
+    获取Whisper模型对应的专用音频处理队列
+    
+    Worker只订阅自己预加载的模型队列，避免在多个大模型之间反复切换
+    """
+    if model_name not in WHISPER_MODEL_SIZES:
+        return AUDIO_PROCESSING_QUEUE
+    return f"{AUDIO_PROCESSING_QUEUE}.{model_name}"
+
+MODEL_QUEUES = [model_queue(name) for name in WHISPER_MODEL_SIZES]
 
 # 创建Celery应用实例
 celery_app = Celery(
     "meetmemo",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
-    include=["app.tasks.audio_processing", "app.tasks.ai_processing"]
+    include=[
+        "app.tasks.audio_processing",
+        "app.tasks.ai_processing",
+        "app.tasks.storage_maintenance",
+        "app.tasks.worker_lifecycle",
+        "app.tasks.queue_balancing",
+    ]
 )
 
 # Celery配置
@@ -25,11 +46,29 @@ celery_app.conf.update(
     # 任务路由
     task_routes={
         "process_audio_task": {"queue": "audio_processing"},
+        "transcribe_chunk_task": {"queue": "transcription"},
+        "merge_transcription_chunks": {"queue": "default"},
+        "mark_processing_failed": {"queue": "default"},
+        "finalize_processing_task": {"queue": "default"},
         "generate_meeting_summary": {"queue": "ai_summary"},
         "cleanup_temp_files": {"queue": "default"},
+        "sweep_storage": {"queue": "default"},
+        "rebalance_model_queues": {"queue": "default"},
         "test_deepseek_connection": {"queue": "default"},
     },
     
+    # 定时任务（需启动 celery beat）
+    beat_schedule={
+        "sweep-storage": {
+            "task": "sweep_storage",
+            "schedule": settings.RETENTION_SWEEP_INTERVAL_SECONDS,
+        },
+        "rebalance-model-queues": {
+            "task": "rebalance_model_queues",
+            "schedule": settings.MODEL_QUEUE_REBALANCE_INTERVAL_SECONDS,
+        },
+    },
+    
     # 任务超时设置
     task_time_limit=settings.TASK_TIMEOUT,
     task_soft_time_limit=settings.TASK_TIMEOUT - 60,
@@ -38,6 +77,8 @@ celery_app.conf.update(
     worker_prefetch_multiplier=1,
     task_acks_late=True,
     worker_max_tasks_per_child=1000,
+    # 子进程启动时预加载并预热模型，默认4秒的存活检测超时不够
+    worker_proc_alive_timeout=settings.WORKER_PRELOAD_TIMEOUT,
     
     # 结果过期时间
     result_expires=3600,
@@ -69,6 +110,10 @@ celery_app.conf.update(
             "exchange": "ai_summary",
             "routing_key": "ai_summary",
         },
+        **{
+            queue: {"exchange": queue, "routing_key": queue}
+            for queue in MODEL_QUEUES
+        },
     },
 )
 
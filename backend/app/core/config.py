@@ -30,16 +30,134 @@ class Settings(BaseSettings):
     # DeepSeek API配置
     DEEPSEEK_API_URL: str = "https://api.deepseek.com/chat/completions"
     DEEPSEEK_API_KEY: str = ""
+    DEEPSEEK_HTTP2: bool = True  # 共享客户端启用HTTP/2（需要h2包）
+    DEEPSEEK_MAX_CONNECTIONS: int = 20  # 连接池上限
+    DEEPSEEK_MAX_KEEPALIVE_CONNECTIONS: int = 10  # 保持的空闲长连接数
+    DEEPSEEK_KEEPALIVE_EXPIRY: float = 60.0  # 空闲长连接保留时长（秒）
+    DEEPSEEK_CONNECT_TIMEOUT: float = 10.0  # 建立连接超时（秒）
+    DEEPSEEK_READ_TIMEOUT: float = 120.0  # 读取/写入超时（秒），推理模型生成较慢
     
     # Whisper配置
     WHISPER_MODEL: str = "base"
     WHISPER_DEVICE: str = "cuda"  # 'cuda' if GPU available
     WHISPER_MODELS_DIR: str = "./models"
+    WHISPER_MODEL_CACHE_MAX_BYTES: int = 8589934592  # 每个Worker进程缓存模型的内存预算，8GB
+    WHISPER_PRELOAD_ENABLED: bool = True  # Worker进程启动时预加载模型
+    WHISPER_PRELOAD_MODELS: str = ""  # 逗号分隔的预加载模型，all为全部，留空为WHISPER_MODEL
+    WHISPER_WARMUP_ENABLED: bool = True  # 预加载后用合成音频预热推理
+    WORKER_PRELOAD_TIMEOUT: int = 600  # Worker子进程启动（含预加载）超时（秒）
+    MODEL_QUEUE_REBALANCE_INTERVAL_SECONDS: int = 30  # 模型队列工作窃取检查间隔
+    MODEL_QUEUE_STEAL_THRESHOLD: int = 2  # 模型队列积压达到该数量时，由空闲Worker临时分担
     
     # 文件上传配置
     MAX_FILE_SIZE: int = 524288000  # 500MB
     UPLOAD_DIR: str = "./uploads"
     ALLOWED_AUDIO_FORMATS: List[str] = ["mp3", "wav", "m4a", "flac", "ogg"]
+    UPLOAD_CHUNK_SIZE: int = 1048576  # 流式写盘块大小，1MB
+    UPLOAD_SESSION_CHUNK_SIZE: int = 8388608  # 续传建议分块大小，8MB
+    UPLOAD_SESSION_MAX_CHUNK_SIZE: int = 67108864  # 续传单个分块上限，64MB
+    MAX_BATCH_FILES: int = 50  # 批量上传最多文件数
+    MAX_BATCH_TOTAL_SIZE: int = 5368709120  # 批量上传总大小上限，5GB
+    AUDIO_PROBE_ENABLED: bool = True  # 上传时探测音频头信息并拒绝无效文件
+    FFPROBE_PATH: str = "ffprobe"
+    AUDIO_PROBE_TIMEOUT: int = 15  # 秒
+    
+    # 语音活动检测（转录前跳过静音）
+    VAD_ENABLED: bool = True
+    VAD_ENERGY_MARGIN_DB: float = 12.0  # 高于噪声底多少dB视为可能的语音
+    VAD_MIN_ENERGY_DB: float = -55.0  # 绝对能量下限（dBFS）
+    VAD_SPEECH_BAND_RATIO: float = 0.3  # 300-3400Hz频带能量占比下限
+    VAD_MIN_SPEECH_MS: int = 150  # 短于该时长的孤立声音不算语音
+    VAD_MIN_SILENCE_MS: int = 1500  # 只剪掉长于该时长的静音
+    VAD_SPEECH_PAD_MS: int = 300  # 语音区间前后保留的余量
+    VAD_MIN_SKIP_SECONDS: float = 5.0  # 可跳过的静音总时长低于该值时不剪辑
+    
+    # 长音频并行分块转录（仅CPU推理）
+    TRANSCRIBE_PARALLEL_ENABLED: bool = True
+    TRANSCRIBE_PARALLEL_MIN_SECONDS: int = 600  # 语音时长超过该值才并行
+    TRANSCRIBE_CHUNK_SECONDS: int = 300  # 目标分块时长，实际在附近的静音处切分
+    TRANSCRIBE_CHUNK_OVERLAP_SECONDS: float = 2.0  # 相邻分块的重叠时长
+    TRANSCRIBE_PARALLEL_PROCESSES: int = 0  # 进程数，0为可用核数的一半
+    TRANSCRIBE_THREADS_PER_PROCESS: int = 0  # 每进程线程数，0为按核数均分
+    
+    # 超长音频拆分到集群中多个Worker并行转录（Celery chord，需使用对象存储或共享存储）
+    CLUSTER_FANOUT_ENABLED: bool = True
+    CLUSTER_FANOUT_MIN_SECONDS: int = 2700  # 音频时长超过45分钟时拆分
+    CLUSTER_CHUNK_SECONDS: int = 900  # 每个分块任务的时长
+    
+    # CPU上对Whisper模型的线性层做动态int8量化，量化结果缓存在WHISPER_MODELS_DIR/quantized
+    WHISPER_QUANTIZE_MODELS: str = ""  # 逗号分隔的模型名，"all"为全部模型，为空时不量化
+    
+    # 转录引擎：whisper（openai-whisper）或faster-whisper（CTranslate2，CPU上int8推理）
+    TRANSCRIBE_ENGINE: str = "whisper"
+    FASTER_WHISPER_COMPUTE_TYPE: str = ""  # 为空时CPU使用int8、GPU使用float16
+    FASTER_WHISPER_CPU_THREADS: int = 0  # 0为CTranslate2默认线程数
+    FASTER_WHISPER_BEAM_SIZE: int = 5
+    
+    # 短音频批量推理：同一Worker进程内多个任务的30秒窗口合批解码
+    BATCH_INFERENCE_ENABLED: bool = True
+    BATCH_INFERENCE_MAX_SECONDS: int = 600  # 语音时长不超过该值的音频走批量推理
+    BATCH_INFERENCE_MAX_SIZE: int = 8  # 每批最多窗口数
+    BATCH_INFERENCE_MAX_WAIT_MS: int = 50  # 不满一批时最多等待的时长
+    BATCH_INFERENCE_TIMEOUT_SECONDS: int = 600  # 等待全部窗口解码结果的最长时间，超时任务失败
+    AUDIO_WORKER_POOL: str = "prefork"  # 设为threads时多个任务共享一个进程与模型，可跨任务合批（不再fork并行分块转录）
+    AUDIO_WORKER_CONCURRENCY: int = 2
+    
+    # AI Worker：独立进程处理ai_summary队列（python celery_worker.py ai），音频Worker不等待大模型响应
+    AI_WORKER_ENABLED: bool = True  # 为False时音频Worker同时订阅ai_summary队列（未部署AI Worker时使用）
+    AI_WORKER_POOL: str = "threads"  # 请求在进程共享的asyncio事件循环上等待，线程只占少量内存
+    AI_WORKER_CONCURRENCY: int = 32  # 同时进行的大模型请求数
+    
+    # 长音频流式解码：ffmpeg后台解码到环形缓冲区，按窗口边解码边转录
+    STREAM_DECODE_ENABLED: bool = True
+    STREAM_DECODE_MIN_SECONDS: int = 2700  # 时长超过该值的音频流式解码（按窗口顺序转录，不再整段载入内存），不低于CLUSTER_FANOUT_MIN_SECONDS以保留并行分块转录
+    STREAM_DECODE_WINDOW_SECONDS: int = 300  # 每次转录的窗口时长，实际在末尾附近的静音处切分
+    STREAM_DECODE_BUFFER_SECONDS: int = 600  # 环形缓冲区可预先解码的时长
+    STREAM_DECODE_READ_TIMEOUT_SECONDS: int = 300  # 解码端超过该时长没有新数据时放弃，避免任务无限等待
+    
+    # 解码缓存：每个内容哈希保存一份16kHz单声道float32 PCM，后续转录memmap读取
+    PCM_CACHE_ENABLED: bool = True
+    PCM_CACHE_DIR: str = "./pcm_cache"
+    PCM_CACHE_MAX_BYTES: int = 20 * 1024 * 1024 * 1024  # 总大小上限，超出后按最近最少使用淘汰（1小时音频约230MB）
+    
+    # 转录结果缓存：按(内容哈希, 模型, 引擎, 语言, 解码选项)缓存，重试和重新生成摘要时不再转录
+    TRANSCRIPT_CACHE_ENABLED: bool = True
+    TRANSCRIPT_CACHE_DIR: str = "./transcript_cache"
+    TRANSCRIPT_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024  # 总大小上限，超出后按最近最少使用淘汰
+    TRANSCRIPT_CACHE_TTL_SECONDS: int = 30 * 86400  # 条目有效期
+    
+    # 转录过程中增量发布已完成的片段
+    TRANSCRIPT_STREAM_ENABLED: bool = True
+    TRANSCRIPT_STREAM_WINDOW_SECONDS: int = 60  # 顺序转录时按该时长分窗，每窗完成后发布
+    TRANSCRIPT_STREAM_TTL_SECONDS: int = 86400  # Redis中片段列表（及摘要增量）的保留时长
+    SUMMARY_STREAM_ENABLED: bool = True  # 流式调用大模型，生成中的纪要增量发布到Redis
+    
+    # 超长转录分段提炼要点后汇总成纪要（map-reduce），token数按字符估算
+    SUMMARY_MAP_REDUCE_ENABLED: bool = True
+    SUMMARY_SINGLE_PASS_MAX_TOKENS: int = 24000  # 转录不超过该token数时一次生成纪要
+    SUMMARY_CHUNK_TOKENS: int = 8000  # 每个分段的token预算，按转录片段边界切分
+    SUMMARY_MAP_MAX_TOKENS: int = 1500  # 每个分段要点的输出上限
+    SUMMARY_MAP_CONCURRENCY: int = 8  # 同时提炼的分段数
+    
+    # 存储保留策略
+    RETENTION_AUDIO_TTL_HOURS: int = 168  # 原始音频保留7天
+    RETENTION_RESULT_TTL_HOURS: int = 720  # 处理结果保留30天
+    RETENTION_SESSION_TTL_HOURS: int = 24  # 未完成的上传会话与临时文件保留1天
+    RETENTION_SWEEP_INTERVAL_SECONDS: int = 600  # 清理任务执行间隔
+    RETENTION_SWEEP_BATCH_SIZE: int = 200  # 每批处理的记录数
+    STORAGE_LOW_WATERMARK_BYTES: int = 5368709120  # 可用空间低于5GB时拒绝上传
+    STORAGE_HIGH_WATERMARK_BYTES: int = 21474836480  # 可用空间低于20GB时开始淘汰原始音频
+    
+    # 文件存储后端：local 要求API与Worker共享上传目录，s3 支持跨节点Worker与客户端直传
+    STORAGE_BACKEND: str = "local"
+    S3_ENDPOINT_URL: str = ""  # MinIO等S3兼容服务地址，留空使用AWS
+    S3_BUCKET: str = "meetmemo"
+    S3_ACCESS_KEY: str = ""
+    S3_SECRET_KEY: str = ""
+    S3_REGION: str = "us-east-1"
+    S3_PRESIGN_EXPIRES: int = 3600  # 预签名URL有效期（秒）
+    STORAGE_CACHE_DIR: str = "./storage_cache"  # Worker本地读穿缓存目录
+    STORAGE_CACHE_MAX_BYTES: int = 21474836480  # 本地缓存上限20GB
     
     # CORS配置
     ALLOWED_ORIGINS: List[str] = [
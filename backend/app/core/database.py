@@ -0,0 +1,51 @@
+"""
+数据库连接管理
+"""
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker, Session
+
+from .config import get_database_url
+
+DATABASE_URL = get_database_url()
+
+# SQLite 需要允许跨线程使用连接（FastAPI线程池与Celery线程）
+connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+
+engine = create_engine(DATABASE_URL, connect_args=connect_args, pool_pre_ping=True)
+SessionLocal = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+Base = declarative_base()
+
+_tables_created = False
+
+
+def init_db() -> None:
+    """创建所有数据表（已存在的表不受影响）"""
+    global _tables_created
+    if _tables_created:
+        return
+
+    # 导入模型以注册到 Base.metadata
+    import app.models  # noqa: F401
+
+    Base.metadata.create_all(bind=engine)
+    _tables_created = True
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """提供一个自动提交/回滚的数据库会话"""
+    init_db()
+    session = SessionLocal()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
@@ -3,5 +3,6 @@
 包含数据库模型定义
 """
 
-# 预留给未来的数据库模型
-__all__ = []
\ No newline at end of file
+from .file_record import FileRecord
+
+__all__ = ["FileRecord"]
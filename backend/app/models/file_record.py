@@ -0,0 +1,54 @@
+"""
+上传文件元数据模型
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Column, String, BigInteger, Float, DateTime, Index
+
+from app.core.database import Base
+
+
+class FileRecord(Base):
+    """上传文件索引：按file_id记录音频与结果文件的存储key、内容哈希、大小和处理状态"""
+
+    __tablename__ = "file_records"
+
+    file_id = Column(String(36), primary_key=True)
+    original_filename = Column(String(512), nullable=False)
+    audio_path = Column(String(1024), nullable=True)
+    result_path = Column(String(1024), nullable=True)
+    sha256 = Column(String(64), nullable=True)
+    file_size = Column(BigInteger, nullable=False, default=0)
+    duration = Column(Float, nullable=True)
+    whisper_model = Column(String(32), nullable=True)
+    language = Column(String(16), nullable=True)
+    task_id = Column(String(64), nullable=True)
+    # uploaded / queued / processing / completed / failed
+    state = Column(String(16), nullable=False, default="uploaded", index=True)
+    error = Column(String(1024), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_file_records_dedup", "sha256", "whisper_model", "language", "state"),
+    )
+
+    def to_dict(self) -> dict:
+        """转换为字典"""
+        return {
+            "file_id": self.file_id,
+            "original_filename": self.original_filename,
+            "audio_path": self.audio_path,
+            "result_path": self.result_path,
+            "sha256": self.sha256,
+            "file_size": self.file_size,
+            "duration": self.duration,
+            "whisper_model": self.whisper_model,
+            "language": self.language,
+            "task_id": self.task_id,
+            "state": self.state,
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
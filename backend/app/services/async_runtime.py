@@ -0,0 +1,67 @@
+"""
+进程内asyncio事件循环
+在后台线程中运行一个事件循环，同步代码（Celery任务）提交协程并等待结果。同一进程中的大模型请求
+都在这个循环上并发等待网络响应，AI Worker使用threads池时一个进程即可同时保持数十个请求
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+from typing import Any, Awaitable, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """获取当前进程的事件循环，首次调用时在后台线程中启动（fork后的子进程重新创建）"""
+    global _loop, _thread, _pid
+
+    with _lock:
+        if _loop is None or _pid != os.getpid() or not _loop.is_running():
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+            loop.call_soon(started.set)
+            _thread = threading.Thread(target=loop.run_forever, name="asyncio-runtime", daemon=True)
+            _thread.start()
+            started.wait()
+            _loop = loop
+            _pid = os.getpid()
+        return _loop
+
+
+def run(coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    """
+    在进程的事件循环上执行协程，阻塞当前线程直到完成
+
+    Args:
+        coro: 协程
+        timeout: 等待超时（秒），None为不限
+
+    Returns:
+        协程的返回值（协程抛出的异常原样抛出）
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_loop())
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
+def shutdown() -> None:
+    """停止事件循环（Worker退出时调用）"""
+    global _loop, _thread
+
+    with _lock:
+        if _loop is None or _pid != os.getpid():
+            return
+        _loop.call_soon_threadsafe(_loop.stop)
+        if _thread:
+            _thread.join(timeout=5)
+        _loop.close()
+        _loop = None
+        _thread = None
@@ -0,0 +1,60 @@
+"""
+音频解码服务
+通过ffmpeg将音频（或其中一段）解码为Whisper使用的16kHz单声道float32波形
+"""
+
+import subprocess
+from typing import List
+
+import numpy as np
+
+from app.services.vad import SAMPLE_RATE
+
+
+def _decode(command: List[str]) -> np.ndarray:
+    try:
+        completed = subprocess.run(command, capture_output=True, check=True)
+    except subprocess.CalledProcessError as e:
+        raise Exception(f"音频解码失败: {e.stderr.decode('utf-8', errors='replace').strip()}")
+
+    return np.frombuffer(completed.stdout, np.int16).astype(np.float32) / 32768.0
+
+
+def load_audio(file_path: str) -> np.ndarray:
+    """
+    解码整个音频文件（与whisper.load_audio一致，不依赖具体转录引擎）
+
+    Args:
+        file_path: 音频文件路径
+
+    Returns:
+        16kHz单声道float32波形
+    """
+    return _decode([
+        "ffmpeg", "-nostdin", "-threads", "0",
+        "-i", file_path,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE),
+        "-",
+    ])
+
+
+def load_audio_clip(file_path: str, start: float, duration: float) -> np.ndarray:
+    """
+    解码音频中的一段，ffmpeg直接定位到起点，不解码前面的部分
+
+    Args:
+        file_path: 音频文件路径
+        start: 起始时间（秒）
+        duration: 时长（秒）
+
+    Returns:
+        16kHz单声道float32波形
+    """
+    command = [
+        "ffmpeg", "-nostdin", "-threads", "0",
+        "-ss", f"{start:.3f}", "-t", f"{duration:.3f}",
+        "-i", file_path,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE),
+        "-",
+    ]
+    return _decode(command)
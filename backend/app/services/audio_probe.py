@@ -0,0 +1,186 @@
+"""
+音频文件探测服务
+通过文件头魔数识别格式，通过ffprobe读取容器头信息（时长、声道、采样率、编码），无需完整解码
+"""
+
+import json
+import shutil
+import subprocess
+import wave
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
+
+from app.core.config import settings
+
+# 读取用于格式识别的文件头长度
+SNIFF_HEADER_SIZE = 64
+
+# python-magic 依赖系统libmagic，不可用时退回内置的魔数表
+try:
+    import magic
+except Exception:  # ImportError 或 libmagic 缺失
+    magic = None
+
+
+class AudioProbeError(Exception):
+    """文件不是有效的音频或已损坏"""
+
+
+def _sniff_by_signature(header: bytes) -> Optional[str]:
+    """根据文件头魔数判断音频容器格式"""
+    if header.startswith(b"ID3"):
+        return "mp3"
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return "wav"
+    if header.startswith(b"fLaC"):
+        return "flac"
+    if header.startswith(b"OggS"):
+        return "ogg"
+    if header[4:8] == b"ftyp":
+        return "m4a"
+    if header.startswith(b"ADIF"):
+        return "aac"
+    if header.startswith(b"\x30\x26\xb2\x75\x8e\x66\xcf\x11"):
+        return "wma"
+    if len(header) >= 2 and header[0] == 0xFF:
+        # ADTS (AAC) 与 MPEG音频帧同步字
+        if header[1] & 0xF6 == 0xF0:
+            return "aac"
+        if header[1] & 0xE0 == 0xE0:
+            return "mp3"
+    return None
+
+
+def _sniff_by_magic(header: bytes) -> Optional[str]:
+    """使用libmagic识别MIME类型"""
+    if magic is None:
+        return None
+    try:
+        mime_type = magic.from_buffer(header, mime=True)
+    except Exception:
+        return None
+    if mime_type.startswith("audio/") or mime_type in ("video/mp4", "application/ogg"):
+        return mime_type
+    return None
+
+
+def sniff_audio_format(file_path: Path) -> Optional[str]:
+    """
+    根据文件头识别音频格式
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        识别出的格式（如mp3/wav）或MIME类型，无法识别为音频时返回None
+    """
+    with open(file_path, "rb") as f:
+        header = f.read(SNIFF_HEADER_SIZE)
+
+    return _sniff_by_signature(header) or _sniff_by_magic(header)
+
+
+def _probe_with_ffprobe(ffprobe: str, file_path: Union[Path, str]) -> Dict[str, Any]:
+    """使用ffprobe读取容器与音频流头信息"""
+    try:
+        completed = subprocess.run(
+            [
+                ffprobe, "-v", "error",
+                "-show_entries",
+                "format=format_name,duration,bit_rate:"
+                "stream=codec_type,codec_name,channels,sample_rate,duration",
+                "-of", "json",
+                str(file_path),
+            ],
+            capture_output=True,
+            timeout=settings.AUDIO_PROBE_TIMEOUT,
+        )
+    except subprocess.TimeoutExpired:
+        raise AudioProbeError("音频文件探测超时")
+
+    if completed.returncode != 0:
+        message = completed.stderr.decode("utf-8", errors="replace").strip()
+        raise AudioProbeError(f"无法解析音频文件: {message or '未知错误'}")
+
+    probe = json.loads(completed.stdout or b"{}")
+    audio_streams = [s for s in probe.get("streams", []) if s.get("codec_type") == "audio"]
+    if not audio_streams:
+        raise AudioProbeError("文件中没有音频流")
+
+    stream = audio_streams[0]
+    container = probe.get("format", {})
+    duration = container.get("duration") or stream.get("duration")
+
+    return {
+        "format_name": container.get("format_name"),
+        "codec": stream.get("codec_name"),
+        "channels": stream.get("channels"),
+        "sample_rate": int(stream["sample_rate"]) if stream.get("sample_rate") else None,
+        "duration": round(float(duration), 3) if duration else None,
+        "bit_rate": int(container["bit_rate"]) if container.get("bit_rate") else None,
+    }
+
+
+def _probe_wav(file_path: Path) -> Dict[str, Any]:
+    """没有ffprobe时，使用标准库读取WAV头信息"""
+    try:
+        with wave.open(str(file_path), "rb") as wav_file:
+            frames = wav_file.getnframes()
+            sample_rate = wav_file.getframerate()
+            return {
+                "format_name": "wav",
+                "codec": f"pcm_s{wav_file.getsampwidth() * 8}le",
+                "channels": wav_file.getnchannels(),
+                "sample_rate": sample_rate,
+                "duration": round(frames / sample_rate, 3) if sample_rate else None,
+                "bit_rate": sample_rate * wav_file.getnchannels() * wav_file.getsampwidth() * 8,
+            }
+    except (wave.Error, EOFError) as e:
+        raise AudioProbeError(f"无法解析WAV文件: {str(e)}")
+
+
+def probe_audio(file_path: Union[Path, str], header: Optional[bytes] = None) -> Dict[str, Any]:
+    """
+    探测音频文件：校验文件头并读取时长、声道、采样率和编码
+
+    只读取文件头与容器元数据，不做完整解码。
+
+    Args:
+        file_path: 文件路径，或对象存储中文件的预签名URL（ffprobe按需发起范围请求）
+        header: 已读取的文件头（探测URL时必须提供）
+
+    Returns:
+        音频元数据
+
+    Raises:
+        AudioProbeError: 文件不是音频或已损坏
+    """
+    is_local = isinstance(file_path, Path)
+    if header is None:
+        detected_format = sniff_audio_format(file_path)
+    else:
+        detected_format = _sniff_by_signature(header) or _sniff_by_magic(header)
+    if detected_format is None:
+        raise AudioProbeError("文件内容不是可识别的音频格式")
+
+    ffprobe = shutil.which(settings.FFPROBE_PATH)
+    if ffprobe:
+        metadata = _probe_with_ffprobe(ffprobe, file_path)
+    elif detected_format == "wav" and is_local:
+        metadata = _probe_wav(file_path)
+    else:
+        # 没有ffprobe时只能确认文件头，时长等信息留给转录阶段
+        metadata = {
+            "format_name": detected_format,
+            "codec": None,
+            "channels": None,
+            "sample_rate": None,
+            "duration": None,
+            "bit_rate": None,
+        }
+
+    if metadata["duration"] is not None and metadata["duration"] <= 0:
+        raise AudioProbeError("音频时长为0，文件可能已损坏")
+
+    metadata["detected_format"] = detected_format
+    return metadata
@@ -0,0 +1,242 @@
+"""
+流式音频解码
+ffmpeg在后台线程中将PCM写入有界环形缓冲区，转录端按固定窗口读取；解码与推理重叠进行，
+内存占用只取决于窗口与缓冲区大小，与音频总时长无关
+"""
+
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+from app.services import pcm_cache
+from app.services.vad import SAMPLE_RATE, FRAME_MS, frame_energy_db
+
+# 每次从ffmpeg管道读取的字节数
+READ_CHUNK_BYTES = 256 * 1024
+# 保留的ffmpeg错误输出长度（字节），只用于错误信息
+STDERR_TAIL_BYTES = 16 * 1024
+# 在窗口末尾多长范围内寻找最安静的位置切分（秒）
+WINDOW_CUT_SEARCH_SECONDS = 10
+
+
+class PcmRingBuffer:
+    """单生产者单消费者的float32环形缓冲区：写满时阻塞生产者，数据不足时阻塞消费者"""
+
+    def __init__(self, capacity: int):
+        self._buffer = np.zeros(capacity, dtype=np.float32)
+        self._capacity = capacity
+        self._start = 0
+        self._size = 0
+        self._eof = False
+        self._closed = False
+        self._error: Optional[str] = None
+        self._condition = threading.Condition()
+
+    def write(self, samples: np.ndarray) -> bool:
+        """写入采样点，缓冲区满时等待；消费者已关闭时返回False"""
+        position = 0
+        while position < len(samples):
+            with self._condition:
+                while self._size == self._capacity and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return False
+                count = min(len(samples) - position, self._capacity - self._size)
+                end = (self._start + self._size) % self._capacity
+                first = min(count, self._capacity - end)
+                self._buffer[end:end + first] = samples[position:position + first]
+                self._buffer[:count - first] = samples[position + first:position + count]
+                self._size += count
+                position += count
+                self._condition.notify_all()
+        return True
+
+    def finish(self, error: Optional[str] = None) -> None:
+        """生产者结束写入（error非空表示解码失败）"""
+        with self._condition:
+            self._eof = True
+            self._error = error
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        """消费者提前结束，唤醒并停止生产者"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def read(self, count: int, timeout: Optional[float] = None) -> np.ndarray:
+        """
+        读取count个采样点，数据不足时等待；解码结束后返回剩余部分（可能为空）
+
+        timeout为连续等不到新数据的最长时间（秒），超时说明解码端已卡死，抛出异常而不是无限等待
+        """
+        chunks = []
+        remaining = count
+        while remaining > 0:
+            with self._condition:
+                deadline = None if timeout is None else time.monotonic() + timeout
+                while self._size == 0 and not self._eof:
+                    wait_seconds = None if deadline is None else deadline - time.monotonic()
+                    if wait_seconds is not None and wait_seconds <= 0:
+                        raise Exception(f"音频解码超时: {timeout}秒内未产出数据")
+                    self._condition.wait(wait_seconds)
+                if self._error:
+                    raise Exception(f"音频解码失败: {self._error}")
+                if self._size == 0:
+                    break
+                take = min(remaining, self._size)
+                first = min(take, self._capacity - self._start)
+                chunks.append(self._buffer[self._start:self._start + first].copy())
+                if take > first:
+                    chunks.append(self._buffer[:take - first].copy())
+                self._start = (self._start + take) % self._capacity
+                self._size -= take
+                remaining -= take
+                self._condition.notify_all()
+        return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.float32)
+
+
+class StreamingDecoder:
+    """
+    后台线程运行ffmpeg解码为16kHz单声道PCM并写入环形缓冲区
+
+    用作上下文管理器，退出时终止ffmpeg与解码线程。指定cache_key时解码结果同时写入解码缓存，
+    完整解码后发布，之后的转录可直接memmap打开。ffmpeg的错误输出由单独的线程持续读取，
+    避免输出写满管道后ffmpeg阻塞、转录端一直等待；read_timeout秒内解码端没有新数据时放弃。
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        buffer_seconds: float,
+        cache_key: Optional[str] = None,
+        read_timeout: Optional[float] = None
+    ):
+        self.file_path = file_path
+        self.cache_key = cache_key
+        self.read_timeout = read_timeout
+        self.buffer = PcmRingBuffer(int(buffer_seconds * SAMPLE_RATE))
+        self._process: Optional[subprocess.Popen] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stderr_thread: Optional[threading.Thread] = None
+        self._stderr_tail = b""
+
+    def __enter__(self) -> "StreamingDecoder":
+        self._process = subprocess.Popen(
+            [
+                "ffmpeg", "-nostdin", "-loglevel", "error", "-threads", "0",
+                "-i", self.file_path,
+                "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE),
+                "-",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self._stderr_thread = threading.Thread(target=self._drain_stderr, name="audio-decoder-stderr", daemon=True)
+        self._stderr_thread.start()
+        self._thread = threading.Thread(target=self._pump, name="audio-decoder", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.buffer.close()
+        if self._process and self._process.poll() is None:
+            self._process.kill()
+        if self._thread:
+            self._thread.join(timeout=5)
+        if self._stderr_thread:
+            self._stderr_thread.join(timeout=5)
+        if self._process:
+            self._process.wait()
+            for stream in (self._process.stdout, self._process.stderr):
+                if stream:
+                    stream.close()
+
+    def _drain_stderr(self) -> None:
+        """持续读取ffmpeg错误输出，只保留末尾部分"""
+        try:
+            for line in iter(self._process.stderr.readline, b""):
+                self._stderr_tail = (self._stderr_tail + line)[-STDERR_TAIL_BYTES:]
+        except (OSError, ValueError):
+            # 退出时管道已关闭
+            pass
+
+    def _pump(self) -> None:
+        process = self._process
+        leftover = b""
+        tmp_path: Optional[Path] = None
+        cache_file = None
+        try:
+            if self.cache_key:
+                tmp_path = pcm_cache.temp_path(self.cache_key)
+                cache_file = open(tmp_path, "wb")
+            while True:
+                data = process.stdout.read(READ_CHUNK_BYTES)
+                if not data:
+                    break
+                data = leftover + data
+                # int16采样为2字节，奇数长度时保留最后一个字节到下一次
+                usable = len(data) - len(data) % 2
+                leftover = data[usable:]
+                samples = np.frombuffer(data[:usable], np.int16).astype(np.float32) / 32768.0
+                if cache_file:
+                    cache_file.write(samples.tobytes())
+                if not self.buffer.write(samples):
+                    return
+            returncode = process.wait()
+            error = None
+            if returncode != 0:
+                self._stderr_thread.join(timeout=5)
+                error = self._stderr_tail.decode("utf-8", errors="replace").strip() or f"ffmpeg退出码 {returncode}"
+            elif cache_file:
+                cache_file.close()
+                cache_file = None
+                pcm_cache.commit(tmp_path, self.cache_key)
+                tmp_path = None
+            self.buffer.finish(error)
+        except Exception as e:
+            self.buffer.finish(str(e))
+        finally:
+            # 解码失败或提前结束时丢弃不完整的缓存文件
+            if cache_file:
+                cache_file.close()
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+
+    def windows(self, window_seconds: float) -> Iterator[Tuple[float, np.ndarray]]:
+        """
+        按窗口读取音频，每个窗口在末尾附近最安静的位置切分，切点之后的部分并入下一个窗口
+
+        Yields:
+            (窗口起点（秒）, 窗口波形)
+        """
+        window = int(window_seconds * SAMPLE_RATE)
+
+        position = 0
+        carry = np.zeros(0, dtype=np.float32)
+        while True:
+            audio = np.concatenate([carry, self.buffer.read(window - len(carry), timeout=self.read_timeout)])
+            if len(audio) < window:
+                # 已读到结尾
+                if len(audio):
+                    yield position / SAMPLE_RATE, audio
+                return
+
+            cut = _quiet_cut(audio)
+            yield position / SAMPLE_RATE, audio[:cut]
+            carry = audio[cut:]
+            position += cut
+
+
+def _quiet_cut(window_audio: np.ndarray) -> int:
+    """在窗口末尾附近能量最低的帧处确定切分点"""
+    window = len(window_audio)
+    search = min(int(WINDOW_CUT_SEARCH_SECONDS * SAMPLE_RATE), window // 2)
+    frame_size = SAMPLE_RATE * FRAME_MS // 1000
+    tail = window_audio[window - search:]
+    return window - search + int(np.argmin(frame_energy_db(tail, frame_size))) * frame_size
+
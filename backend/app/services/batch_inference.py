@@ -0,0 +1,302 @@
+"""
+Whisper批量推理服务
+将音频切成不超过30秒的窗口提交到进程内的批处理线程，同一模型、同一语言的窗口
+（可来自多个任务）凑成一批做一次编码/解码，等待超过最大时长时不满一批也立即执行，
+结果按窗口分发回各自的任务
+"""
+
+import concurrent.futures
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.model_cache import inference_lock
+from app.services.vad import SAMPLE_RATE, FRAME_MS, frame_energy_db
+
+# Whisper一次处理的音频长度
+WINDOW_SECONDS = 30
+# 在窗口末尾多长范围内寻找最安静的位置切分（秒）
+WINDOW_CUT_SEARCH_SECONDS = 5
+# 时间戳token的精度（秒）
+TIME_PRECISION = 0.02
+
+# 与model.transcribe一致的质量阈值，不满足时该窗口改用带温度回退的转录
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+
+
+def plan_windows(audio: np.ndarray) -> List[Tuple[int, int]]:
+    """
+    将音频切成不超过30秒的窗口，在每个窗口末尾附近能量最低处切分
+
+    Returns:
+        窗口列表，单位为采样点 [start, end)
+    """
+    window = WINDOW_SECONDS * SAMPLE_RATE
+    frame_size = SAMPLE_RATE * FRAME_MS // 1000
+    search = WINDOW_CUT_SEARCH_SECONDS * SAMPLE_RATE
+
+    windows = []
+    start = 0
+    while len(audio) - start > window:
+        tail = audio[start + window - search:start + window]
+        quietest = int(np.argmin(frame_energy_db(tail, frame_size)))
+        end = start + window - search + quietest * frame_size
+        windows.append((start, end))
+        start = end
+    if start < len(audio):
+        windows.append((start, len(audio)))
+    return windows
+
+
+def tokens_to_segments(tokenizer, tokens: List[int], offset: float, duration: float) -> List[Dict[str, Any]]:
+    """
+    按时间戳token将解码结果拆分为片段
+
+    Args:
+        tokenizer: Whisper分词器
+        tokens: 解码得到的token（含时间戳token）
+        offset: 窗口在整段音频中的起点（秒）
+        duration: 窗口时长（秒）
+    """
+    segments = []
+    start: Optional[float] = None
+    text_tokens: List[int] = []
+
+    for token in tokens:
+        if token < tokenizer.timestamp_begin:
+            text_tokens.append(token)
+            continue
+        time_point = (token - tokenizer.timestamp_begin) * TIME_PRECISION
+        if text_tokens:
+            # 结束时间戳：输出片段，连续的下一个时间戳作为新片段的开始
+            segments.append((start or 0.0, time_point, text_tokens))
+            text_tokens = []
+            start = None
+        else:
+            start = time_point
+
+    if text_tokens:
+        segments.append((start or 0.0, duration, text_tokens))
+
+    results = []
+    for seg_start, seg_end, seg_tokens in segments:
+        text = tokenizer.decode(seg_tokens)
+        if text.strip():
+            results.append({
+                "start": round(offset + seg_start, 3),
+                "end": round(offset + min(seg_end, duration), 3),
+                "text": text,
+            })
+    return results
+
+
+class _Request:
+    def __init__(self, key: Tuple, model, mel, options: Dict[str, Any]):
+        self.key = key
+        self.model = model
+        self.mel = mel
+        self.options = options
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class InferenceBatcher:
+    """进程内的批量推理线程：按(模型, 语言, 任务)分组攒批，满一批或等待超时后执行"""
+
+    def __init__(self, max_batch_size: int, max_wait_ms: int):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._pending: List[_Request] = []
+        self._condition = threading.Condition()
+        self._start_lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self.batches = 0
+        self.windows = 0
+
+    def _ensure_thread(self) -> None:
+        # fork出的子进程不会继承父进程的线程，每个进程首次提交时启动
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._pending = []
+            self._condition = threading.Condition()
+            threading.Thread(target=self._run, name="whisper-batcher", daemon=True).start()
+            self._pid = os.getpid()
+
+    def submit(self, model, mel, options: Dict[str, Any]) -> Future:
+        """
+        提交一个窗口的梅尔频谱
+
+        Args:
+            model: Whisper模型
+            mel: 单个窗口的梅尔频谱（已补齐到30秒）
+            options: 解码选项（language/task/fp16）
+
+        Returns:
+            解码结果的Future
+        """
+        key = (id(model), options.get("language"), options.get("task"), options.get("fp16"))
+        request = _Request(key, model, mel, options)
+        self._ensure_thread()
+        with self._condition:
+            self._pending.append(request)
+            self._condition.notify()
+        return request.future
+
+    def _take_batch(self) -> List[_Request]:
+        """取出最早到达的请求所在分组中可执行的一批（未满一批且未超时时返回空列表）"""
+        oldest = self._pending[0]
+        group = [request for request in self._pending if request.key == oldest.key]
+        waited = time.monotonic() - oldest.enqueued_at
+        if len(group) < self.max_batch_size and waited < self.max_wait:
+            return []
+        batch = group[:self.max_batch_size]
+        self._pending = [request for request in self._pending if request not in batch]
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                batch = self._take_batch()
+                if not batch:
+                    remaining = self.max_wait - (time.monotonic() - self._pending[0].enqueued_at)
+                    self._condition.wait(max(remaining, 0.001))
+                    continue
+            self._decode(batch)
+
+    def _decode(self, batch: List[_Request]) -> None:
+        import torch
+        import whisper
+
+        # 跳过已超时取消的请求
+        batch = [request for request in batch if request.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        try:
+            model = batch[0].model
+            options = batch[0].options
+            mel = torch.stack([request.mel for request in batch])
+            with inference_lock(model):
+                results = whisper.decode(
+                    model,
+                    mel,
+                    whisper.DecodingOptions(
+                        language=options.get("language"),
+                        task=options.get("task", "transcribe"),
+                        fp16=options.get("fp16", False),
+                        temperature=0.0,
+                    ),
+                )
+            self.batches += 1
+            self.windows += len(batch)
+            for request, result in zip(batch, results):
+                request.future.set_result(result)
+        except Exception as e:
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+
+    def stats(self) -> Dict[str, Any]:
+        """批处理统计"""
+        return {
+            "batches": self.batches,
+            "windows": self.windows,
+            "avg_batch_size": round(self.windows / self.batches, 2) if self.batches else 0.0,
+        }
+
+
+_batcher = InferenceBatcher(settings.BATCH_INFERENCE_MAX_SIZE, settings.BATCH_INFERENCE_MAX_WAIT_MS)
+
+
+def get_batcher() -> InferenceBatcher:
+    """获取当前进程的批量推理服务"""
+    return _batcher
+
+
+def should_batch(audio: np.ndarray) -> bool:
+    """是否走批量推理（短音频）"""
+    return settings.BATCH_INFERENCE_ENABLED and len(audio) / SAMPLE_RATE <= settings.BATCH_INFERENCE_MAX_SECONDS
+
+
+def transcribe_batched(model, audio: np.ndarray, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    将音频的各窗口提交到批量推理服务并等待结果
+
+    质量不达标（重复或置信度过低）的窗口改用model.transcribe单独转录，以便使用温度回退。
+    BATCH_INFERENCE_TIMEOUT_SECONDS内未拿到全部窗口的结果时取消剩余窗口并抛出异常。
+
+    Args:
+        model: Whisper模型
+        audio: 16kHz单声道float32波形
+        options: model.transcribe的选项
+
+    Returns:
+        与model.transcribe结构一致的结果（text/language/segments）
+    """
+    import whisper
+    from app.services.parallel_transcription import detect_language
+
+    # 同一任务的各窗口使用同一语言，也便于与其他任务的窗口合批
+    language = options.get("language") or detect_language(model, audio)
+    options = {**options, "language": language}
+    tokenizer = whisper.tokenizer.get_tokenizer(
+        model.is_multilingual,
+        num_languages=model.num_languages,
+        language=language,
+        task=options.get("task", "transcribe"),
+    )
+
+    # 先算好全部窗口的梅尔频谱再一起提交，避免前面的窗口因等待超时而单独成批
+    windows = plan_windows(audio)
+    mels = [
+        whisper.log_mel_spectrogram(whisper.pad_or_trim(audio[start:end]), model.dims.n_mels).to(model.device)
+        for start, end in windows
+    ]
+    futures = [get_batcher().submit(model, mel, options) for mel in mels]
+    deadline = time.monotonic() + settings.BATCH_INFERENCE_TIMEOUT_SECONDS
+
+    segments: List[Dict[str, Any]] = []
+    for (start, end), future in zip(windows, futures):
+        try:
+            result = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except concurrent.futures.TimeoutError:
+            for pending in futures:
+                pending.cancel()
+            raise Exception(f"批量推理失败: {settings.BATCH_INFERENCE_TIMEOUT_SECONDS}秒内未完成全部窗口的解码")
+        offset = start / SAMPLE_RATE
+        duration = (end - start) / SAMPLE_RATE
+
+        if result.no_speech_prob > NO_SPEECH_THRESHOLD and result.avg_logprob < LOGPROB_THRESHOLD:
+            continue
+        if result.compression_ratio > COMPRESSION_RATIO_THRESHOLD or result.avg_logprob < LOGPROB_THRESHOLD:
+            with inference_lock(model):
+                fallback = model.transcribe(audio[start:end], **options)
+            segments.extend(
+                {
+                    "start": round(segment["start"] + offset, 3),
+                    "end": round(segment["end"] + offset, 3),
+                    "text": segment["text"],
+                }
+                for segment in fallback.get("segments", [])
+            )
+            continue
+        segments.extend(tokens_to_segments(tokenizer, result.tokens, offset, duration))
+
+    return {
+        "text": "".join(segment["text"] for segment in segments),
+        "language": language,
+        "segments": segments,
+        "batched": {"windows": len(windows)},
+    }
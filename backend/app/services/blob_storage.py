@@ -0,0 +1,316 @@
+"""
+文件存储后端
+统一以相对key（如 audio/3f/a2/<file_id>.mp3）访问音频与结果文件：
+- local: 直接存放在上传目录，要求API与Worker共享文件系统
+- s3: 存放在S3兼容对象存储（如MinIO），Worker按key拉取并缓存在本地，支持预签名直传
+"""
+
+import base64
+import hashlib
+import os
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+class StorageError(Exception):
+    """存储后端操作错误"""
+
+
+class StorageBackend(ABC):
+    """存储后端接口"""
+
+    name = "base"
+    supports_presign = False
+
+    def staging_path(self, key: str) -> Path:
+        """获取key在本机上的暂存/落盘路径（上传流式写入的位置）"""
+        path = Path(settings.UPLOAD_DIR) / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
+    @abstractmethod
+    def save(self, local_path: Path, key: str) -> str:
+        """将本地文件保存到key，返回key"""
+
+    @abstractmethod
+    def fetch(self, key: str) -> Path:
+        """获取key对应的本地可读路径"""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """key是否存在"""
+
+    @abstractmethod
+    def size(self, key: str) -> int:
+        """key对应对象的字节数"""
+
+    @abstractmethod
+    def read_head(self, key: str, length: int) -> bytes:
+        """读取对象开头的length个字节（用于格式识别）"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """删除key（不存在时忽略）"""
+
+    def release_local_space(self, bytes_needed: int) -> List[str]:
+        """腾出本机磁盘空间：只删除可重新获取的本地副本，不删除存储中的对象，返回删除的路径"""
+        return []
+
+    def sha256(self, key: str, chunk_size: int) -> str:
+        """分块计算key对应内容的SHA-256（十六进制）"""
+        file_hash = hashlib.sha256()
+        with open(self.fetch(key), "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
+
+    def presign_upload(
+        self,
+        key: str,
+        content_type: str,
+        expires: int,
+        sha256: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """生成客户端直传用的预签名上传参数（指定sha256时存储端校验上传内容）"""
+        raise StorageError(f"存储后端 {self.name} 不支持预签名直传")
+
+    def presign_download(self, key: str, expires: int) -> str:
+        """生成预签名下载URL"""
+        raise StorageError(f"存储后端 {self.name} 不支持预签名下载")
+
+
+class LocalStorage(StorageBackend):
+    """本地文件系统存储"""
+
+    name = "local"
+
+    def _path(self, key: str) -> Path:
+        # 兼容旧记录中保存的绝对路径
+        path = Path(key)
+        return path if path.is_absolute() else Path(settings.UPLOAD_DIR) / key
+
+    def save(self, local_path: Path, key: str) -> str:
+        target = self._path(key)
+        if Path(local_path).resolve() != target.resolve():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(local_path, target)
+        return key
+
+    def fetch(self, key: str) -> Path:
+        path = self._path(key)
+        if not path.exists():
+            raise FileNotFoundError(f"文件不存在: {key}")
+        return path
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def size(self, key: str) -> int:
+        return self._path(key).stat().st_size
+
+    def read_head(self, key: str, length: int) -> bytes:
+        with open(self._path(key), "rb") as f:
+            return f.read(length)
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+
+class S3Storage(StorageBackend):
+    """S3兼容对象存储，带本地读穿缓存"""
+
+    name = "s3"
+    supports_presign = True
+
+    def __init__(self):
+        try:
+            import boto3
+            from botocore.config import Config
+        except ImportError:
+            raise StorageError("使用S3存储需要安装boto3: pip install boto3")
+
+        self.bucket = settings.S3_BUCKET
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=settings.S3_ENDPOINT_URL or None,
+            aws_access_key_id=settings.S3_ACCESS_KEY or None,
+            aws_secret_access_key=settings.S3_SECRET_KEY or None,
+            region_name=settings.S3_REGION,
+            config=Config(signature_version="s3v4", s3={"addressing_style": "path"}),
+        )
+        self.cache_dir = Path(settings.STORAGE_CACHE_DIR)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _cache_path(self, key: str) -> Path:
+        return self.cache_dir / key
+
+    def _is_missing(self, error: Exception) -> bool:
+        response = getattr(error, "response", None) or {}
+        return response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+
+    def save(self, local_path: Path, key: str) -> str:
+        self.client.upload_file(str(local_path), self.bucket, key)
+
+        # 上传完成后将暂存文件移入缓存，本机后续读取无需再下载
+        cache_path = self._cache_path(key)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(local_path, cache_path)
+        self._trim_cache()
+        return key
+
+    def fetch(self, key: str) -> Path:
+        cache_path = self._cache_path(key)
+        if cache_path.exists():
+            os.utime(cache_path)  # 更新访问时间，供LRU淘汰使用
+            return cache_path
+
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f".{cache_path.name}.{uuid.uuid4().hex}.part")
+        try:
+            self.client.download_file(self.bucket, key, str(tmp_path))
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            if self._is_missing(e):
+                raise FileNotFoundError(f"文件不存在: {key}")
+            raise StorageError(f"下载文件失败: {key}: {str(e)}")
+        os.replace(tmp_path, cache_path)
+
+        self._trim_cache(keep=cache_path)
+        return cache_path
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except Exception as e:
+            if self._is_missing(e):
+                return False
+            raise
+
+    def size(self, key: str) -> int:
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+        except Exception as e:
+            if self._is_missing(e):
+                raise FileNotFoundError(f"文件不存在: {key}")
+            raise
+
+    def read_head(self, key: str, length: int) -> bytes:
+        response = self.client.get_object(Bucket=self.bucket, Key=key, Range=f"bytes=0-{length - 1}")
+        return response["Body"].read()
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+        self._cache_path(key).unlink(missing_ok=True)
+
+    def sha256(self, key: str, chunk_size: int) -> str:
+        cache_path = self._cache_path(key)
+        if cache_path.exists():
+            return super().sha256(key, chunk_size)
+
+        # 上传时带校验和的对象直接读取存储端记录的SHA-256（分片上传的组合校验和带"-N"后缀，不可用）
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=key, ChecksumMode="ENABLED")
+        except Exception as e:
+            if self._is_missing(e):
+                raise FileNotFoundError(f"文件不存在: {key}")
+            raise StorageError(f"读取文件信息失败: {key}: {str(e)}")
+        checksum = head.get("ChecksumSHA256")
+        if checksum and "-" not in checksum:
+            return base64.b64decode(checksum).hex()
+
+        # 否则流式读取对象计算，不落盘
+        file_hash = hashlib.sha256()
+        body = self.client.get_object(Bucket=self.bucket, Key=key)["Body"]
+        for chunk in body.iter_chunks(chunk_size):
+            file_hash.update(chunk)
+        return file_hash.hexdigest()
+
+    def presign_upload(
+        self,
+        key: str,
+        content_type: str,
+        expires: int,
+        sha256: Optional[str] = None
+    ) -> Dict[str, Any]:
+        params = {"Bucket": self.bucket, "Key": key, "ContentType": content_type}
+        headers = {"Content-Type": content_type}
+        if sha256:
+            # 校验和参与签名，客户端须携带该请求头，内容不符时存储端拒绝上传
+            checksum = base64.b64encode(bytes.fromhex(sha256)).decode("ascii")
+            params["ChecksumSHA256"] = checksum
+            headers["x-amz-checksum-sha256"] = checksum
+        url = self.client.generate_presigned_url("put_object", Params=params, ExpiresIn=expires)
+        return {"method": "PUT", "url": url, "headers": headers}
+
+    def presign_download(self, key: str, expires: int) -> str:
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=expires,
+        )
+
+    def release_local_space(self, bytes_needed: int) -> List[str]:
+        # 原始音频保存在对象存储中，本机只有读穿缓存可以淘汰
+        total = sum(size for _, size, _ in self._cache_entries())
+        return self._evict_cache(max(0, total - bytes_needed))
+
+    def _cache_entries(self) -> List[Tuple[float, int, Path]]:
+        """缓存中的文件 (最近访问时间, 字节数, 路径)，不含下载中的临时文件"""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".part"):
+                    continue
+                path = Path(root) / name
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict_cache(self, max_bytes: int, keep: Optional[Path] = None) -> List[str]:
+        """按最近访问时间淘汰缓存，直到总量不超过max_bytes，返回删除的路径"""
+        entries = self._cache_entries()
+        total = sum(size for _, size, _ in entries)
+        removed: List[str] = []
+        if total <= max_bytes:
+            return removed
+
+        for _, size, path in sorted(entries):
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            removed.append(str(path))
+            total -= size
+            if total <= max_bytes:
+                break
+        return removed
+
+    def _trim_cache(self, keep: Optional[Path] = None) -> None:
+        """缓存超过上限时按最近访问时间淘汰"""
+        self._evict_cache(settings.STORAGE_CACHE_MAX_BYTES, keep)
+
+
+_storage: Optional[StorageBackend] = None
+
+
+def get_storage() -> StorageBackend:
+    """获取当前配置的存储后端（进程内单例）"""
+    global _storage
+    if _storage is None:
+        if settings.STORAGE_BACKEND == "s3":
+            _storage = S3Storage()
+        elif settings.STORAGE_BACKEND == "local":
+            _storage = LocalStorage()
+        else:
+            raise StorageError(f"未知的存储后端: {settings.STORAGE_BACKEND}")
+    return _storage
@@ -0,0 +1,81 @@
+"""
+DeepSeek HTTP客户端
+进程内共享的httpx.AsyncClient：保持长连接、启用HTTP/2多路复用，连接池上限与连接/读取超时可配置，
+避免每次请求都重新进行DNS解析、TCP与TLS握手。Worker启动时创建，退出时关闭。
+
+连接绑定在创建它的事件循环上，因此按事件循环各保存一个客户端：Celery任务使用async_runtime的循环，
+独立脚本（如generate_meeting_minutes.py）在自己的循环中调用get_client，结束前调用aclose。
+"""
+
+import asyncio
+import threading
+from typing import Dict
+
+import httpx
+from celery.utils.log import get_logger
+
+from app.core.config import settings
+from app.services import async_runtime
+
+logger = get_logger(__name__)
+
+_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    """HTTP/2需要h2包（httpx[http2]）"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _create_client() -> httpx.AsyncClient:
+    http2 = settings.DEEPSEEK_HTTP2 and _http2_available()
+    if settings.DEEPSEEK_HTTP2 and not http2:
+        logger.warning("未安装h2，DeepSeek客户端使用HTTP/1.1（pip install 'httpx[http2]'）")
+
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=httpx.Timeout(settings.DEEPSEEK_READ_TIMEOUT, connect=settings.DEEPSEEK_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=settings.DEEPSEEK_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.DEEPSEEK_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.DEEPSEEK_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+def get_client() -> httpx.AsyncClient:
+    """获取当前事件循环的共享客户端（须在协程中调用），不存在或已关闭时创建"""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _clients.get(loop)
+        if client is None or client.is_closed:
+            client = _clients[loop] = _create_client()
+        return client
+
+
+async def aclose() -> None:
+    """关闭当前事件循环的共享客户端"""
+    with _lock:
+        client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def _open() -> None:
+    get_client()
+
+
+def open_client() -> None:
+    """在async_runtime的事件循环上创建共享客户端（Worker启动时调用）"""
+    async_runtime.run(_open())
+
+
+def close_client() -> None:
+    """关闭async_runtime事件循环上的共享客户端（Worker退出时调用）"""
+    if _clients:
+        async_runtime.run(aclose())
@@ -0,0 +1,168 @@
+"""
+文件元数据索引服务
+按file_id在数据库中记录音频与结果文件的存储key、内容哈希、大小和处理状态，
+并将文件分散存放到哈希分片子目录中，避免单目录文件过多
+"""
+
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence
+
+from app.core.config import settings
+from app.core.database import session_scope
+from app.services.blob_storage import get_storage
+from app.models import FileRecord
+
+
+def shard_prefix(key: str) -> str:
+    """获取key对应的两级哈希分片前缀（如 3f/a2）"""
+    digest = hashlib.md5(key.encode("utf-8")).hexdigest()
+    return f"{digest[:2]}/{digest[2:4]}"
+
+
+def shard_dir(root: Path, key: str) -> Path:
+    """
+    获取key对应的两级哈希分片目录（如 root/3f/a2/），不存在时创建
+
+    Args:
+        root: 根目录
+        key: 分片键（通常为file_id）
+
+    Returns:
+        分片目录
+    """
+    directory = root / shard_prefix(key)
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def get_audio_key(file_id: str, extension: str) -> str:
+    """获取上传音频在存储后端中的key"""
+    return f"audio/{shard_prefix(file_id)}/{file_id}{extension.lower()}"
+
+
+def get_audio_path(file_id: str, extension: str) -> Path:
+    """获取上传音频在本机的落盘（暂存）路径"""
+    return get_storage().staging_path(get_audio_key(file_id, extension))
+
+
+def register_file(file_info: Dict[str, Any], state: str = "uploaded", task_id: Optional[str] = None) -> None:
+    """
+    登记（或更新）上传文件的索引记录
+
+    Args:
+        file_info: 上传接口构建的文件信息
+        state: 初始状态
+        task_id: 处理任务ID
+    """
+    with session_scope() as session:
+        record = session.get(FileRecord, file_info["file_id"]) or FileRecord(file_id=file_info["file_id"])
+        record.original_filename = file_info["original_filename"]
+        record.audio_path = file_info.get("storage_key") or file_info["file_path"]
+        record.sha256 = file_info.get("sha256")
+        record.file_size = file_info.get("file_size", 0)
+        record.duration = file_info.get("duration")
+        record.whisper_model = file_info.get("whisper_model")
+        record.language = file_info.get("language")
+        record.state = state
+        record.task_id = task_id
+        session.add(record)
+
+
+def update_file(file_id: str, **fields: Any) -> bool:
+    """
+    更新索引记录的字段（如state、task_id、result_path、error）
+
+    Returns:
+        记录是否存在
+    """
+    with session_scope() as session:
+        record = session.get(FileRecord, file_id)
+        if record is None:
+            return False
+        for name, value in fields.items():
+            setattr(record, name, value)
+        return True
+
+
+def get_file(file_id: str) -> Optional[Dict[str, Any]]:
+    """按file_id查询索引记录"""
+    with session_scope() as session:
+        record = session.get(FileRecord, file_id)
+        return record.to_dict() if record else None
+
+
+def find_completed(sha256: str, whisper_model: str, language: str) -> Optional[Dict[str, Any]]:
+    """查找相同内容、模型和语言下最近完成的记录"""
+    with session_scope() as session:
+        record = (
+            session.query(FileRecord)
+            .filter(
+                FileRecord.sha256 == sha256,
+                FileRecord.whisper_model == whisper_model,
+                FileRecord.language == language,
+                FileRecord.state == "completed",
+            )
+            .order_by(FileRecord.updated_at.desc())
+            .first()
+        )
+        return record.to_dict() if record else None
+
+
+def delete_file(file_id: str) -> None:
+    """删除索引记录"""
+    with session_scope() as session:
+        record = session.get(FileRecord, file_id)
+        if record is not None:
+            session.delete(record)
+
+
+def list_expired_audio(before: datetime, states: Sequence[str], limit: int) -> List[Dict[str, Any]]:
+    """列出在给定时间之前最后更新、仍保留原始音频的记录（按最久未更新优先）"""
+    with session_scope() as session:
+        records = (
+            session.query(FileRecord)
+            .filter(
+                FileRecord.audio_path.isnot(None),
+                FileRecord.state.in_(list(states)),
+                FileRecord.updated_at < before,
+            )
+            .order_by(FileRecord.updated_at.asc())
+            .limit(limit)
+            .all()
+        )
+        return [record.to_dict() for record in records]
+
+
+def list_evictable_audio(limit: int) -> List[Dict[str, Any]]:
+    """列出已有结果、可以淘汰原始音频的记录（最近最少使用优先）"""
+    with session_scope() as session:
+        records = (
+            session.query(FileRecord)
+            .filter(
+                FileRecord.audio_path.isnot(None),
+                FileRecord.state == "completed",
+                FileRecord.result_path.isnot(None),
+            )
+            .order_by(FileRecord.updated_at.asc())
+            .limit(limit)
+            .all()
+        )
+        return [record.to_dict() for record in records]
+
+
+def list_expired_results(before: datetime, limit: int) -> List[Dict[str, Any]]:
+    """列出在给定时间之前创建的已完成/失败记录"""
+    with session_scope() as session:
+        records = (
+            session.query(FileRecord)
+            .filter(
+                FileRecord.state.in_(["completed", "failed"]),
+                FileRecord.created_at < before,
+            )
+            .order_by(FileRecord.created_at.asc())
+            .limit(limit)
+            .all()
+        )
+        return [record.to_dict() for record in records]
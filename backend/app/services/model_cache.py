@@ -0,0 +1,203 @@
+"""
+Whisper模型进程内缓存
+按(模型名, 设备, 引擎)缓存已加载的模型，超过内存预算时按最近最少使用淘汰，
+连续处理同一模型的任务无需重复反序列化模型
+"""
+
+import gc
+import json
+import os
+import socket
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Tuple
+
+from app.core.config import settings
+from app.services.redis_client import get_client
+
+# 各模型fp32权重的大致内存占用，加载前用于预先腾出空间（加载后以实际参数大小为准）
+ESTIMATED_MODEL_BYTES = {
+    "tiny": 160 * 1024 ** 2,
+    "base": 300 * 1024 ** 2,
+    "small": 1000 * 1024 ** 2,
+    "medium": 3 * 1024 ** 3,
+    "large": 6 * 1024 ** 3,
+    "turbo": 3 * 1024 ** 3,
+}
+
+# 缓存统计在Redis中的key前缀与过期时间（Worker退出后自动消失）
+STATS_KEY_PREFIX = "meetmemo:model_cache:"
+STATS_TTL_SECONDS = 3600
+
+# 每个模型实例一把推理锁（模型被回收后自动移除）
+_inference_locks: "weakref.WeakKeyDictionary[Any, threading.RLock]" = weakref.WeakKeyDictionary()
+_inference_locks_guard = threading.Lock()
+
+
+def estimate_model_bytes(model_name: str) -> int:
+    """估算模型加载后的内存占用"""
+    base_name = model_name.split(".")[0].split("-")[0]
+    return ESTIMATED_MODEL_BYTES.get(base_name, ESTIMATED_MODEL_BYTES["large"])
+
+
+def inference_lock(model) -> threading.RLock:
+    """
+    获取模型实例的推理锁
+
+    Whisper解码时在共享的解码器key/value模块上挂载kv-cache钩子，同一模型上的两次解码并发执行会
+    互相覆盖缓存、输出错误文本，因此同一模型的所有推理（批量解码、单独转录、语言检测）都须持有该锁。
+    """
+    with _inference_locks_guard:
+        lock = _inference_locks.get(model)
+        if lock is None:
+            lock = _inference_locks[model] = threading.RLock()
+        return lock
+
+
+def measure_model_bytes(model) -> int:
+    """统计模型参数与缓冲区实际占用的字节数"""
+    try:
+        tensors = list(model.parameters()) + list(model.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+    except Exception:
+        return 0
+
+
+class ModelCache:
+    """按(模型名, 设备, 引擎)缓存模型，超过内存预算时淘汰最近最少使用的模型"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._models: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, model_name: str, device: str, loader: Callable[[], Any], engine: str = "whisper") -> Any:
+        """
+        获取模型，未缓存时调用loader加载
+
+        Args:
+            model_name: 模型名称
+            device: 设备（cpu/cuda）
+            loader: 加载模型的回调
+            engine: 转录引擎
+
+        Returns:
+            模型
+        """
+        key = (model_name, device, engine)
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return entry["model"]
+
+            self.misses += 1
+            # 先按估算大小腾出空间，避免新旧模型同时驻留导致内存峰值
+            self._evict(estimate_model_bytes(model_name))
+
+            model = loader()
+            size = measure_model_bytes(model) or estimate_model_bytes(model_name)
+            self._models[key] = {"model": model, "bytes": size}
+            self._evict(0)
+            return model
+
+    def _used_bytes(self) -> int:
+        return sum(entry["bytes"] for entry in self._models.values())
+
+    def _evict(self, incoming_bytes: int) -> None:
+        """淘汰最近最少使用的模型，直到容纳incoming_bytes（至少保留最近使用的一个模型）"""
+        freed = False
+        while self._models and self._used_bytes() + incoming_bytes > self.max_bytes:
+            if incoming_bytes == 0 and len(self._models) == 1:
+                break
+            self._models.popitem(last=False)
+            self.evictions += 1
+            freed = True
+
+        if freed:
+            gc.collect()
+            self._release_cuda_memory()
+
+    def _release_cuda_memory(self) -> None:
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._models.clear()
+            gc.collect()
+            self._release_cuda_memory()
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存统计"""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / requests, 4) if requests else 0.0,
+                "used_bytes": self._used_bytes(),
+                "max_bytes": self.max_bytes,
+                "models": [
+                    {"model": model_name, "device": device, "engine": engine, "bytes": entry["bytes"]}
+                    for (model_name, device, engine), entry in self._models.items()
+                ],
+            }
+
+
+_model_cache = ModelCache(settings.WHISPER_MODEL_CACHE_MAX_BYTES)
+
+
+def get_model_cache() -> ModelCache:
+    """获取当前进程的模型缓存"""
+    return _model_cache
+
+
+def worker_id() -> str:
+    """当前Worker进程的标识"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def publish_stats() -> None:
+    """将当前进程的缓存统计写入Redis，供API汇总展示（失败时忽略）"""
+    try:
+        get_client().set(
+            STATS_KEY_PREFIX + worker_id(),
+            json.dumps(_model_cache.stats()),
+            ex=STATS_TTL_SECONDS,
+        )
+    except Exception:
+        pass
+
+
+def collect_stats() -> Dict[str, Any]:
+    """汇总各Worker进程上报的缓存统计"""
+    client = get_client()
+
+    workers = {}
+    for key in client.scan_iter(match=STATS_KEY_PREFIX + "*"):
+        value = client.get(key)
+        if value:
+            name = key.decode("utf-8")[len(STATS_KEY_PREFIX):]
+            workers[name] = json.loads(value)
+
+    hits = sum(w["hits"] for w in workers.values())
+    misses = sum(w["misses"] for w in workers.values())
+    return {
+        "hits": hits,
+        "misses": misses,
+        "evictions": sum(w["evictions"] for w in workers.values()),
+        "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+        "workers": workers,
+    }
@@ -0,0 +1,287 @@
+"""
+长音频并行转录服务
+在静音处把音频切成带少量重叠的分块，用fork出的进程池并行转录（子进程以写时复制共享父进程中的模型权重），
+再按片段中点归属去掉重叠部分的重复片段，拼接为完整转录结果。
+进程池使用Celery自带的billiard：prefork池的子进程是守护进程，标准库multiprocessing不允许其再创建子进程
+"""
+
+import os
+import threading
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+import billiard
+import numpy as np
+
+from app.core.config import settings
+from app.services.model_cache import inference_lock
+from app.services.vad import SAMPLE_RATE, FRAME_MS, frame_energy_db
+
+# fork前设置，子进程直接继承，避免序列化模型与音频（设置、fork与清理在_fork_lock内完成）
+_shared: Dict[str, Any] = {}
+_fork_lock = threading.Lock()
+
+# threads池的Worker中不fork：其他线程（批量推理、事件循环、其他任务）的锁与状态会被子进程继承
+_fork_allowed = True
+
+# 在目标切分点前后多大范围内寻找最安静的位置（秒）
+BOUNDARY_SEARCH_SECONDS = 15
+
+# 分窗转录时作为下一窗提示词的上文长度（字符）
+PROMPT_TAIL_CHARS = 200
+
+
+def available_cpus() -> int:
+    """当前进程可用的CPU核数"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def can_fork() -> bool:
+    """是否支持fork启动子进程（Windows不支持，多线程Worker中禁用）"""
+    return _fork_allowed and "fork" in billiard.get_all_start_methods()
+
+
+def disable_fork() -> None:
+    """禁用并行分块转录（Worker以threads池运行时调用）"""
+    global _fork_allowed
+    _fork_allowed = False
+
+
+def find_boundaries(audio: np.ndarray, chunk_seconds: float) -> List[int]:
+    """
+    在每个目标切分点附近能量最低的帧处切分
+
+    Returns:
+        切分点列表（采样点），包含起点0和终点len(audio)
+    """
+    frame_size = SAMPLE_RATE * FRAME_MS // 1000
+    energy_db = frame_energy_db(audio, frame_size)
+    frames_per_chunk = int(chunk_seconds * 1000 / FRAME_MS)
+    search = int(BOUNDARY_SEARCH_SECONDS * 1000 / FRAME_MS)
+
+    boundaries = [0]
+    target = frames_per_chunk
+    while target < len(energy_db) - frames_per_chunk // 4:
+        low = max(target - search, boundaries[-1] // frame_size + 1)
+        high = min(target + search, len(energy_db))
+        quietest = low + int(np.argmin(energy_db[low:high]))
+        boundaries.append(quietest * frame_size)
+        target = quietest + frames_per_chunk
+    boundaries.append(len(audio))
+    return boundaries
+
+
+def plan_chunks(audio: np.ndarray, chunk_seconds: float, overlap_seconds: float) -> List[Dict[str, int]]:
+    """
+    规划转录分块
+
+    Returns:
+        分块列表：start/end为实际转录范围（含重叠），own_start/own_end为该分块负责输出的范围
+    """
+    boundaries = find_boundaries(audio, chunk_seconds)
+    overlap = int(overlap_seconds * SAMPLE_RATE)
+    return [
+        {
+            "start": max(0, own_start - overlap),
+            "end": min(len(audio), own_end + overlap),
+            "own_start": own_start,
+            "own_end": own_end,
+        }
+        for own_start, own_end in zip(boundaries[:-1], boundaries[1:])
+    ]
+
+
+def plan_time_chunks(duration: float, chunk_seconds: float, overlap_seconds: float) -> List[Dict[str, int]]:
+    """
+    按固定时长规划分块（用于尚未解码、只知道时长的音频），结构与plan_chunks相同
+
+    最后一段不足四分之一分块时长时并入前一块。
+    """
+    total = int(duration * SAMPLE_RATE)
+    step = int(chunk_seconds * SAMPLE_RATE)
+    overlap = int(overlap_seconds * SAMPLE_RATE)
+
+    boundaries = list(range(0, total, step)) + [total]
+    if len(boundaries) > 2 and boundaries[-1] - boundaries[-2] < step // 4:
+        del boundaries[-2]
+
+    return [
+        {
+            "start": max(0, own_start - overlap),
+            "end": min(total, own_end + overlap),
+            "own_start": own_start,
+            "own_end": own_end,
+        }
+        for own_start, own_end in zip(boundaries[:-1], boundaries[1:])
+    ]
+
+
+def _init_process(num_threads: int) -> None:
+    import torch
+    torch.set_num_threads(num_threads)
+
+
+def _transcribe_chunk(chunk: Dict[str, int]) -> List[Dict[str, Any]]:
+    """在子进程中转录一个分块，返回映射到整段音频时间轴的片段"""
+    model = _shared["model"]
+    audio = _shared["audio"]
+    offset = chunk["start"] / SAMPLE_RATE
+
+    result = model.transcribe(audio[chunk["start"]:chunk["end"]], **_shared["options"])
+    return [
+        {
+            "start": round(segment["start"] + offset, 3),
+            "end": round(segment["end"] + offset, 3),
+            "text": segment["text"],
+        }
+        for segment in result.get("segments", [])
+    ]
+
+
+def stitch_segments(chunks: List[Dict[str, int]], results: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """按片段中点所在的负责范围去掉重叠区的重复片段"""
+    segments = []
+    for chunk, chunk_segments in zip(chunks, results):
+        own_start = chunk["own_start"] / SAMPLE_RATE
+        own_end = chunk["own_end"] / SAMPLE_RATE
+        for segment in chunk_segments:
+            midpoint = (segment["start"] + segment["end"]) / 2
+            if own_start <= midpoint < own_end:
+                segments.append(segment)
+    segments.sort(key=lambda segment: segment["start"])
+    return segments
+
+
+def detect_language(model, audio: np.ndarray) -> str:
+    """用开头30秒检测语言，保证各分块使用同一语言"""
+    import whisper
+
+    mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), model.dims.n_mels).to(model.device)
+    with inference_lock(model):
+        _, probs = model.detect_language(mel)
+    return max(probs, key=probs.get)
+
+
+def plan_workers(num_chunks: int) -> Tuple[int, int]:
+    """
+    确定进程数与每个进程的线程数，使 进程数 × 线程数 不超过可用核数
+
+    Returns:
+        (进程数, 每进程线程数)
+    """
+    cpus = available_cpus()
+    processes = settings.TRANSCRIBE_PARALLEL_PROCESSES or max(1, cpus // 2)
+    processes = max(1, min(processes, num_chunks, cpus))
+    threads = settings.TRANSCRIBE_THREADS_PER_PROCESS or max(1, cpus // processes)
+    return processes, threads
+
+
+def should_parallelize(model, audio: np.ndarray) -> bool:
+    """是否对该音频启用并行分块转录（仅CPU推理、支持fork且音频足够长时）"""
+    if not settings.TRANSCRIBE_PARALLEL_ENABLED or not can_fork():
+        return False
+    if next(model.parameters()).device.type != "cpu":
+        return False
+    return len(audio) / SAMPLE_RATE >= settings.TRANSCRIBE_PARALLEL_MIN_SECONDS
+
+
+def transcribe_parallel(
+    model,
+    audio: np.ndarray,
+    options: Dict[str, Any],
+    on_chunk: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+) -> Dict[str, Any]:
+    """
+    并行分块转录
+
+    Args:
+        model: Whisper模型（位于CPU）
+        audio: 16kHz单声道float32波形
+        options: model.transcribe的选项
+        on_chunk: 每个分块按顺序完成后，以该分块负责范围内的片段调用
+
+    Returns:
+        与model.transcribe结构一致的结果（text/language/segments）
+    """
+    language: Optional[str] = options.get("language") or detect_language(model, audio)
+    chunks = plan_chunks(audio, settings.TRANSCRIBE_CHUNK_SECONDS, settings.TRANSCRIBE_CHUNK_OVERLAP_SECONDS)
+    processes, threads = plan_workers(len(chunks))
+
+    with _fork_lock:
+        _shared.update(model=model, audio=audio, options={**options, "language": language})
+        try:
+            context = billiard.get_context("fork")
+            with context.Pool(processes, initializer=_init_process, initargs=(threads,)) as pool:
+                results = []
+                # imap按分块顺序返回，前面的分块完成即可发布，无需等待全部完成
+                for chunk, chunk_segments in zip(chunks, pool.imap(_transcribe_chunk, chunks, chunksize=1)):
+                    results.append(chunk_segments)
+                    if on_chunk:
+                        on_chunk(stitch_segments([chunk], [chunk_segments]))
+        finally:
+            _shared.clear()
+
+    segments = stitch_segments(chunks, results)
+
+    return {
+        # 与Whisper一致：片段文本自带前导空格（英文等），直接拼接
+        "text": "".join(segment["text"] for segment in segments),
+        "language": language,
+        "segments": segments,
+        "parallel": {"chunks": len(chunks), "processes": processes, "threads_per_process": threads},
+    }
+
+
+def transcribe_windowed(
+    model,
+    audio: np.ndarray,
+    options: Dict[str, Any],
+    window_seconds: float,
+    on_window: Callable[[List[Dict[str, Any]]], None]
+) -> Dict[str, Any]:
+    """
+    按静音处切分的窗口顺序转录，每个窗口完成后立即回调，用于增量发布转录片段
+
+    上一窗口的末尾文本作为下一窗口的提示词，保持上下文连贯。
+
+    Args:
+        model: Whisper模型
+        audio: 16kHz单声道float32波形
+        options: model.transcribe的选项
+        window_seconds: 目标窗口时长
+        on_window: 每个窗口完成后以该窗口的片段（整段音频时间轴）调用
+
+    Returns:
+        与model.transcribe结构一致的结果（text/language/segments）
+    """
+    language: Optional[str] = options.get("language") or detect_language(model, audio)
+    windows = plan_chunks(audio, window_seconds, 0)
+
+    segments: List[Dict[str, Any]] = []
+    prompt: Optional[str] = None
+    for window in windows:
+        offset = window["start"] / SAMPLE_RATE
+        with inference_lock(model):
+            result = model.transcribe(
+                audio[window["start"]:window["end"]],
+                **{**options, "language": language, "initial_prompt": prompt}
+            )
+        window_segments = [
+            {
+                "start": round(segment["start"] + offset, 3),
+                "end": round(segment["end"] + offset, 3),
+                "text": segment["text"],
+            }
+            for segment in result.get("segments", [])
+        ]
+        segments.extend(window_segments)
+        on_window(window_segments)
+        prompt = result["text"][-PROMPT_TAIL_CHARS:] or None
+
+    return {
+        "text": "".join(segment["text"] for segment in segments),
+        "language": language,
+        "segments": segments,
+    }
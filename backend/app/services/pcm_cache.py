@@ -0,0 +1,107 @@
+"""
+解码音频缓存
+每个内容哈希在首次解码时保存一份16kHz单声道float32原始PCM文件，之后的转录（重试、换模型、分块任务）
+通过numpy.memmap零拷贝打开，不再启动ffmpeg解码与重采样；总大小超过上限时按最近最少使用淘汰
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.file_index import shard_prefix
+
+PCM_SUFFIX = ".f32"
+
+_evict_lock = threading.Lock()
+
+
+def is_enabled(sha256: Optional[str]) -> bool:
+    """是否对该内容使用解码缓存（需要内容哈希）"""
+    return bool(settings.PCM_CACHE_ENABLED and sha256)
+
+
+def cache_path(sha256: str) -> Path:
+    """缓存文件路径（按哈希前缀分目录）"""
+    return Path(settings.PCM_CACHE_DIR) / shard_prefix(sha256) / f"{sha256}{PCM_SUFFIX}"
+
+
+def temp_path(sha256: str) -> Path:
+    """写入中的临时文件路径（写完后原子重命名，读者不会看到不完整的文件）"""
+    path = cache_path(sha256)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def open_cached(sha256: str) -> Optional[np.ndarray]:
+    """
+    以只读memmap打开缓存的PCM
+
+    Returns:
+        float32波形（memmap），未缓存时返回None
+    """
+    path = cache_path(sha256)
+    try:
+        if path.stat().st_size == 0:
+            return np.zeros(0, dtype=np.float32)
+        audio = np.memmap(path, dtype=np.float32, mode="r")
+        # 更新修改时间作为最近使用时间，供淘汰排序
+        os.utime(path)
+        return audio
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def commit(tmp_path: Path, sha256: str) -> None:
+    """将写完的临时文件发布为缓存文件，并按大小上限淘汰"""
+    os.replace(tmp_path, cache_path(sha256))
+    evict()
+
+
+def store(sha256: str, audio: np.ndarray) -> None:
+    """保存已解码的波形（失败时忽略，不影响转录）"""
+    tmp_path = None
+    try:
+        tmp_path = temp_path(sha256)
+        np.asarray(audio, dtype=np.float32).tofile(tmp_path)
+        commit(tmp_path, sha256)
+    except Exception:
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
+
+
+def evict(max_bytes: Optional[int] = None) -> int:
+    """
+    淘汰最近最少使用的缓存文件，直到总大小不超过上限
+
+    Returns:
+        删除的文件数
+    """
+    max_bytes = settings.PCM_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    root = Path(settings.PCM_CACHE_DIR)
+    if not root.exists():
+        return 0
+
+    with _evict_lock:
+        entries = []
+        total = 0
+        for path in root.rglob(f"*{PCM_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        removed = 0
+        # 正在被其他进程memmap的文件删除后，已打开的映射仍然有效
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,86 @@
+"""
+Whisper模型CPU动态int8量化
+将模型中的线性层动态量化为int8，量化后的模型缓存在模型目录下，后续加载直接读取，无需重新量化
+"""
+
+import copy
+import os
+from pathlib import Path
+from typing import Any, Callable
+
+from celery.utils.log import get_logger
+
+from app.core.config import settings
+
+logger = get_logger(__name__)
+
+
+def should_quantize(model_name: str, device: str) -> bool:
+    """该模型是否按配置（WHISPER_QUANTIZE_MODELS）在CPU上使用int8量化"""
+    if device != "cpu":
+        return False
+    configured = [name.strip() for name in settings.WHISPER_QUANTIZE_MODELS.split(",") if name.strip()]
+    return "all" in configured or model_name in configured
+
+
+def quantized_model_path(model_name: str) -> Path:
+    """量化模型的缓存路径（按PyTorch版本区分，升级后自动重新量化）"""
+    import torch
+
+    version = torch.__version__.split("+")[0]
+    return Path(settings.WHISPER_MODELS_DIR) / "quantized" / f"{model_name}-int8-torch{version}.pt"
+
+
+def quantize_model(model) -> Any:
+    """
+    对模型的线性层做动态int8量化
+
+    Whisper的线性层是nn.Linear的子类（仅在前向时按输入转换权重精度），PyTorch只量化精确类型为
+    nn.Linear的模块，因此先还原为nn.Linear；CPU上使用fp32推理，行为不变。
+    改写与量化都在深拷贝上进行，传入的模型（可能已在模型缓存中被其他任务使用）保持不变。
+    """
+    import torch
+    import whisper.model
+
+    quantized = copy.deepcopy(model)
+    for module in quantized.modules():
+        if isinstance(module, whisper.model.Linear):
+            module.__class__ = torch.nn.Linear
+
+    return torch.quantization.quantize_dynamic(quantized, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def load_quantized(model_name: str, loader: Callable[[], Any]) -> Any:
+    """
+    加载量化模型，磁盘上没有缓存时加载fp32模型并量化后写入缓存
+
+    Args:
+        model_name: 模型名称
+        loader: 加载fp32模型（CPU）的回调（返回的模型不会被修改，可以是共享实例）
+
+    Returns:
+        量化后的模型
+    """
+    import torch
+
+    path = quantized_model_path(model_name)
+    if path.exists():
+        try:
+            model = torch.load(path, map_location="cpu", weights_only=False)
+            model.eval()
+            return model
+        except Exception as e:
+            logger.warning(f"读取量化模型缓存失败，重新量化: {path}: {e}")
+
+    model = quantize_model(loader())
+    model.eval()
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        torch.save(model, tmp_path)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"写入量化模型缓存失败: {path}: {e}")
+
+    return model
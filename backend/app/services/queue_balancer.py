@@ -0,0 +1,144 @@
+"""
+模型队列负载均衡服务
+Worker默认只消费自己预加载模型的队列；某个模型队列积压而有Worker空闲时，
+临时让空闲Worker订阅该队列（工作窃取），积压清空后再取消订阅，恢复模型亲和。
+没有任何Worker订阅的模型队列（如未预加载的模型）只要有一个任务就立即分配
+"""
+
+import json
+from typing import Dict, Any, List
+
+from app.core.celery_app import celery_app, MODEL_QUEUES, AUDIO_PROCESSING_QUEUE
+from app.core.config import settings
+from app.services.redis_client import get_client
+
+# 记录由均衡器临时添加的订阅：Worker节点名 -> 队列列表
+STOLEN_QUEUES_KEY = "meetmemo:stolen_queues"
+
+# 入队后请求均衡的去重标记（一个均衡间隔内只发送一次均衡任务）
+REBALANCE_REQUESTED_KEY = "meetmemo:rebalance_requested"
+
+
+def get_queue_depths(queues: List[str]) -> Dict[str, int]:
+    """查询各队列中等待处理的消息数（队列不存在时为0）"""
+    depths = {}
+    with celery_app.connection_for_read() as connection:
+        channel = connection.default_channel
+        for queue in queues:
+            try:
+                depths[queue] = channel.queue_declare(queue=queue, passive=True).message_count
+            except Exception:
+                depths[queue] = 0
+    return depths
+
+
+def _load_stolen(client) -> Dict[str, List[str]]:
+    return {
+        worker.decode("utf-8"): json.loads(queues)
+        for worker, queues in client.hgetall(STOLEN_QUEUES_KEY).items()
+    }
+
+
+def _save_stolen(client, stolen: Dict[str, List[str]]) -> None:
+    client.delete(STOLEN_QUEUES_KEY)
+    mapping = {worker: json.dumps(queues) for worker, queues in stolen.items() if queues}
+    if mapping:
+        client.hset(STOLEN_QUEUES_KEY, mapping=mapping)
+
+
+def rebalance() -> Dict[str, Any]:
+    """
+    执行一轮工作窃取
+
+    1. 临时订阅的队列已清空时取消订阅
+    2. 没有Worker订阅且有任务的模型队列、积压达到阈值的模型队列，从空闲的音频Worker中挑选一个临时订阅
+       （无人订阅的队列优先，其中的任务否则永远不会被执行）
+
+    Returns:
+        各模型队列深度以及本轮新增/取消的订阅
+    """
+    client = get_client()
+    # 本轮开始执行后允许新的均衡请求
+    client.delete(REBALANCE_REQUESTED_KEY)
+    inspect = celery_app.control.inspect()
+    active_queues = {
+        worker: {queue["name"] for queue in queues}
+        for worker, queues in (inspect.active_queues() or {}).items()
+    }
+    active_tasks = inspect.active() or {}
+    reserved_tasks = inspect.reserved() or {}
+    depths = get_queue_depths(MODEL_QUEUES)
+
+    stolen = _load_stolen(client)
+    released = []
+    for worker in list(stolen):
+        if worker not in active_queues:
+            # Worker已下线
+            del stolen[worker]
+            continue
+        for queue in list(stolen[worker]):
+            if depths.get(queue, 0) == 0:
+                celery_app.control.cancel_consumer(queue, destination=[worker])
+                stolen[worker].remove(queue)
+                released.append({"worker": worker, "queue": queue})
+
+    def is_idle(worker: str) -> bool:
+        queues = active_queues[worker]
+        if not any(q == AUDIO_PROCESSING_QUEUE or q in depths for q in queues):
+            return False  # 不处理音频的Worker（如AI摘要Worker）
+        if active_tasks.get(worker) or reserved_tasks.get(worker):
+            return False
+        return all(depths.get(q, 0) == 0 for q in queues if q in depths)
+
+    consumed = {queue for queues in active_queues.values() for queue in queues}
+
+    def needs_consumer(queue: str) -> bool:
+        if queue not in consumed:
+            return depths[queue] >= 1
+        return depths[queue] >= settings.MODEL_QUEUE_STEAL_THRESHOLD
+
+    idle_workers = [worker for worker in active_queues if is_idle(worker)]
+    orphaned = [queue for queue in MODEL_QUEUES if queue not in consumed and depths[queue]]
+    backlog = sorted(
+        (queue for queue in MODEL_QUEUES if needs_consumer(queue)),
+        key=lambda queue: (queue in consumed, -depths[queue]),
+    )
+
+    added = []
+    for queue in backlog:
+        candidates = [worker for worker in idle_workers if queue not in active_queues[worker]]
+        if not candidates:
+            continue
+        worker = candidates[0]
+        celery_app.control.add_consumer(queue, destination=[worker])
+        stolen.setdefault(worker, []).append(queue)
+        idle_workers.remove(worker)
+        added.append({"worker": worker, "queue": queue})
+
+    _save_stolen(client, stolen)
+
+    assigned = {item["queue"] for item in added}
+    return {
+        "queue_depths": depths,
+        "added_consumers": added,
+        "cancelled_consumers": released,
+        # 仍无人订阅的队列（暂无空闲Worker），稍后需要再次均衡
+        "unassigned_queues": [queue for queue in orphaned if queue not in assigned],
+    }
+
+
+def request_rebalance(countdown: int = 0) -> None:
+    """
+    请求一轮均衡，不必等待beat周期（beat未运行时无人订阅的队列也能被分配）；
+    任务进入模型队列后调用，以及均衡后仍有无人订阅的队列时延迟重试。
+    同一时间只有一个待执行的请求，失败时忽略
+
+    Args:
+        countdown: 延迟执行的秒数
+    """
+    try:
+        expires = countdown + settings.MODEL_QUEUE_REBALANCE_INTERVAL_SECONDS
+        if get_client().set(REBALANCE_REQUESTED_KEY, 1, nx=True, ex=expires):
+            celery_app.send_task("rebalance_model_queues", countdown=countdown)
+    except Exception:
+        pass
@@ -0,0 +1,22 @@
+"""
+Redis客户端
+进程内共享一个客户端（自带连接池，线程安全），避免每次调用都新建连接池并重新建立TCP连接；
+fork出的子进程首次使用连接时，redis-py会自动重建连接池
+"""
+
+import threading
+
+from app.core.config import settings
+
+_client = None
+_lock = threading.Lock()
+
+
+def get_client():
+    """获取进程内共享的Redis客户端"""
+    global _client
+    with _lock:
+        if _client is None:
+            import redis
+            _client = redis.from_url(settings.REDIS_URL)
+        return _client
@@ -0,0 +1,126 @@
+"""
+处理结果存储服务
+负责结果文件的读写，以及按内容哈希查找已完成结果（重复上传去重）
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from app.core.config import settings
+from app.services.blob_storage import get_storage
+from app.services.file_index import shard_prefix, find_completed
+
+
+def get_results_dir() -> Path:
+    """获取结果目录"""
+    results_dir = Path(settings.UPLOAD_DIR) / "results"
+    results_dir.mkdir(exist_ok=True)
+    return results_dir
+
+
+def get_result_key(file_id: str) -> str:
+    """获取文件ID对应的结果文件在存储后端中的key（哈希分片）"""
+    return f"results/{shard_prefix(file_id)}/{file_id}_result.json"
+
+
+def get_result_path(file_id: str) -> Path:
+    """获取文件ID对应的结果文件在本机的落盘（暂存）路径"""
+    return get_storage().staging_path(get_result_key(file_id))
+
+
+def save_result(file_id: str, result_data: Dict[str, Any]) -> str:
+    """
+    保存处理结果
+
+    Returns:
+        结果文件的存储key
+    """
+    result_key = get_result_key(file_id)
+    result_path = get_result_path(file_id)
+    with open(result_path, "w", encoding="utf-8") as f:
+        json.dump(result_data, f, ensure_ascii=False, indent=2)
+    return get_storage().save(result_path, result_key)
+
+
+def _find_result_path(file_id: str) -> Optional[Path]:
+    """获取结果文件的本地可读路径，兼容分片前平铺在results目录下的旧结果"""
+    if Path(file_id).name != file_id:
+        return None
+
+    try:
+        return get_storage().fetch(get_result_key(file_id))
+    except FileNotFoundError:
+        legacy_path = get_results_dir() / f"{file_id}_result.json"
+        return legacy_path if legacy_path.exists() else None
+
+
+def load_result(file_id: str) -> Optional[Dict[str, Any]]:
+    """读取结果文件，不存在时返回None"""
+    result_path = _find_result_path(file_id)
+    if result_path is None:
+        return None
+
+    with open(result_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_task_result(file_id: str) -> Optional[Dict[str, Any]]:
+    """读取结果文件并转换为与process_audio_task返回值一致的结构"""
+    result_data = load_result(file_id)
+    if result_data is None:
+        return None
+
+    return {
+        "success": True,
+        "file_id": file_id,
+        "transcription": result_data.get("transcription"),
+        "summary": result_data.get("summary"),
+        "result_file": get_result_key(file_id),
+        "processing_completed_at": result_data.get("processing_time")
+    }
+
+
+def find_cached_result(sha256: str, whisper_model: str, language: str) -> Optional[Dict[str, Any]]:
+    """
+    查找相同内容、相同模型和语言的已完成结果
+
+    Args:
+        sha256: 音频内容哈希
+        whisper_model: Whisper模型
+        language: 转录语言
+
+    Returns:
+        文件索引记录，没有可用结果时返回None
+    """
+    record = find_completed(sha256, whisper_model, language)
+    if record is None:
+        return None
+
+    # 结果文件已被清理时不再复用
+    if not record["result_path"] or not get_storage().exists(record["result_path"]):
+        return None
+
+    return record
+
+
+def _batch_manifest_path(batch_id: str) -> Path:
+    batches_dir = get_results_dir() / "batches"
+    batches_dir.mkdir(exist_ok=True)
+    return batches_dir / f"{batch_id}.json"
+
+
+def save_batch_manifest(batch_id: str, manifest: Dict[str, Any]) -> None:
+    """保存批量上传的清单（批次内各文件与任务ID的对应关系）"""
+    with open(_batch_manifest_path(batch_id), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+
+
+def load_batch_manifest(batch_id: str) -> Optional[Dict[str, Any]]:
+    """读取批量上传清单，不存在时返回None"""
+    manifest_path = _batch_manifest_path(Path(batch_id).name)
+    if not manifest_path.exists():
+        return None
+
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return json.load(f)
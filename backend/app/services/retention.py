@@ -0,0 +1,139 @@
+"""
+存储保留策略服务
+按TTL清理各类文件，磁盘可用空间低于水位线时按LRU淘汰已有结果的原始音频（对象存储下只淘汰本地缓存），
+并为上传提供准入检查
+"""
+
+import shutil
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, List
+
+from app.core.config import settings
+from app.services import file_index
+from app.services.blob_storage import get_storage, LocalStorage
+from app.services.result_store import get_results_dir
+
+
+def get_free_space() -> int:
+    """获取上传目录所在磁盘的可用字节数"""
+    return shutil.disk_usage(settings.UPLOAD_DIR).free
+
+
+def has_capacity(incoming_bytes: int = 0) -> bool:
+    """
+    上传准入检查：写入incoming_bytes后可用空间仍不低于低水位线
+
+    Args:
+        incoming_bytes: 即将写入的字节数（未知时为0）
+    """
+    return get_free_space() - incoming_bytes >= settings.STORAGE_LOW_WATERMARK_BYTES
+
+
+def _delete(key: str, removed: List[str]) -> None:
+    """从存储后端删除文件（索引中记录的是存储key，旧记录为绝对路径）"""
+    storage = get_storage()
+    if key and storage.exists(key):
+        storage.delete(key)
+        removed.append(key)
+
+
+def expire_audio(now: datetime, batch_size: int) -> List[str]:
+    """删除超过原始音频TTL的音频文件（排队/处理中的不动）"""
+    removed: List[str] = []
+    before = now - timedelta(hours=settings.RETENTION_AUDIO_TTL_HOURS)
+    for record in file_index.list_expired_audio(before, ["uploaded", "completed", "failed"], batch_size):
+        _delete(record["audio_path"], removed)
+        file_index.update_file(record["file_id"], audio_path=None)
+    return removed
+
+
+def expire_results(now: datetime, batch_size: int) -> List[str]:
+    """删除超过结果TTL的结果文件及其索引记录"""
+    removed: List[str] = []
+    before = now - timedelta(hours=settings.RETENTION_RESULT_TTL_HOURS)
+    for record in file_index.list_expired_results(before, batch_size):
+        _delete(record["audio_path"], removed)
+        _delete(record["result_path"], removed)
+        file_index.delete_file(record["file_id"])
+    return removed
+
+
+def expire_stale_entries(directory: Path, ttl_hours: int, batch_size: int) -> List[str]:
+    """删除目录下修改时间超过TTL的直接子项（未完成的上传会话、临时文件、批次清单等）"""
+    removed: List[str] = []
+    if not directory.exists():
+        return removed
+
+    cutoff = time.time() - ttl_hours * 3600
+    for entry in directory.iterdir():
+        if len(removed) >= batch_size:
+            break
+        if entry.stat().st_mtime >= cutoff:
+            continue
+        if entry.is_dir():
+            shutil.rmtree(entry, ignore_errors=True)
+        else:
+            entry.unlink(missing_ok=True)
+        removed.append(str(entry))
+    return removed
+
+
+def evict_for_watermark(batch_size: int) -> List[str]:
+    """
+    可用空间低于高水位线时，按最近最少使用顺序淘汰已有结果的原始音频，
+    直到可用空间恢复到高水位线以上或没有可淘汰的文件
+
+    水位线衡量的是本机磁盘：对象存储中的原始音频不占本机空间，删除它们腾不出空间，
+    因此对象存储后端只淘汰本机的读穿缓存。
+    """
+    storage = get_storage()
+    if not isinstance(storage, LocalStorage):
+        shortfall = settings.STORAGE_HIGH_WATERMARK_BYTES - get_free_space()
+        return storage.release_local_space(shortfall) if shortfall > 0 else []
+
+    removed: List[str] = []
+    while get_free_space() < settings.STORAGE_HIGH_WATERMARK_BYTES:
+        candidates = file_index.list_evictable_audio(batch_size)
+        if not candidates:
+            break
+        for record in candidates:
+            _delete(record["audio_path"], removed)
+            file_index.update_file(record["file_id"], audio_path=None)
+            if get_free_space() >= settings.STORAGE_HIGH_WATERMARK_BYTES:
+                break
+    return removed
+
+
+def run_sweep() -> Dict[str, Any]:
+    """
+    执行一轮存储清理
+
+    Returns:
+        各类清理的文件数及清理前后的可用空间
+    """
+    now = datetime.utcnow()
+    batch_size = settings.RETENTION_SWEEP_BATCH_SIZE
+    upload_dir = Path(settings.UPLOAD_DIR)
+    free_before = get_free_space()
+
+    expired_audio = expire_audio(now, batch_size)
+    expired_results = expire_results(now, batch_size)
+    stale_sessions = expire_stale_entries(upload_dir / "sessions", settings.RETENTION_SESSION_TTL_HOURS, batch_size)
+    stale_tmp = expire_stale_entries(upload_dir / "tmp", settings.RETENTION_SESSION_TTL_HOURS, batch_size)
+    stale_batches = expire_stale_entries(
+        get_results_dir() / "batches", settings.RETENTION_RESULT_TTL_HOURS, batch_size
+    )
+    evicted_audio = evict_for_watermark(batch_size)
+
+    return {
+        "expired_audio": len(expired_audio),
+        "expired_results": len(expired_results),
+        "stale_sessions": len(stale_sessions),
+        "stale_tmp_files": len(stale_tmp),
+        "stale_batches": len(stale_batches),
+        "evicted_audio": len(evicted_audio),
+        "free_bytes_before": free_before,
+        "free_bytes_after": get_free_space(),
+    }
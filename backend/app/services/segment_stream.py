@@ -0,0 +1,63 @@
+"""
+转录片段增量发布服务
+转录过程中把已完成的片段追加到Redis列表，客户端按游标增量读取，无需等待整个任务结束
+"""
+
+import json
+from typing import Dict, Any, List
+
+from app.core.config import settings
+from app.services.redis_client import get_client as _client
+
+SEGMENTS_KEY_PREFIX = "meetmemo:segments:"
+SEGMENTS_DONE_KEY_PREFIX = "meetmemo:segments_done:"
+
+
+def append_segments(task_id: str, segments: List[Dict[str, Any]]) -> None:
+    """追加已完成的片段（发布失败时忽略，不影响转录本身）"""
+    if not task_id or not segments:
+        return
+    try:
+        client = _client()
+        key = SEGMENTS_KEY_PREFIX + task_id
+        pipe = client.pipeline()
+        pipe.rpush(key, *[json.dumps(segment, ensure_ascii=False) for segment in segments])
+        pipe.expire(key, settings.TRANSCRIPT_STREAM_TTL_SECONDS)
+        pipe.execute()
+    except Exception:
+        pass
+
+
+def mark_complete(task_id: str) -> None:
+    """标记转录已结束，不会再有新片段"""
+    if not task_id:
+        return
+    try:
+        _client().set(SEGMENTS_DONE_KEY_PREFIX + task_id, 1, ex=settings.TRANSCRIPT_STREAM_TTL_SECONDS)
+    except Exception:
+        pass
+
+
+def read_segments(task_id: str, cursor: int, limit: int) -> Dict[str, Any]:
+    """
+    读取游标之后的片段
+
+    Args:
+        task_id: 任务ID
+        cursor: 已读取的片段数
+        limit: 最多返回的片段数
+
+    Returns:
+        片段列表、下一次请求的游标，以及转录是否已结束
+    """
+    client = _client()
+    # 先读结束标记，避免结束前最后一批片段被漏读
+    complete = bool(client.exists(SEGMENTS_DONE_KEY_PREFIX + task_id))
+    values = client.lrange(SEGMENTS_KEY_PREFIX + task_id, cursor, cursor + limit - 1)
+    segments = [json.loads(value) for value in values]
+    next_cursor = cursor + len(segments)
+    return {
+        "segments": segments,
+        "next_cursor": next_cursor,
+        "complete": complete and next_cursor >= client.llen(SEGMENTS_KEY_PREFIX + task_id),
+    }
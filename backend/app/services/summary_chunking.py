@@ -0,0 +1,100 @@
+"""
+摘要分段
+按转录片段边界把超长转录切分为不超过token预算的分段，供分段提炼要点后再汇总成纪要（map-reduce）。
+token数按DeepSeek的经验比例估算（1个中文字符约0.6个token，1个英文字符约0.3个token），无需加载分词器
+"""
+
+import re
+from typing import Dict, Any, List, Optional
+
+# 句末标点之后切分（单个片段超出预算或没有片段信息时使用）
+SENTENCE_END = re.compile(r"(?<=[。！？；.!?;\n])")
+
+
+def estimate_tokens(text: str) -> int:
+    """估算文本的token数"""
+    wide = sum(1 for char in text if ord(char) > 0x2E7F)
+    return int(wide * 0.6 + (len(text) - wide) * 0.3) + 1
+
+
+def _split_text(text: str, budget: int) -> List[str]:
+    """在句末切分超出预算的文本，单句仍超出预算时按长度硬切"""
+    pieces = []
+    current = ""
+    for sentence in SENTENCE_END.split(text):
+        if current and estimate_tokens(current + sentence) > budget:
+            pieces.append(current)
+            current = ""
+        while estimate_tokens(sentence) > budget:
+            # 按最保守的比例（每个字符0.6个token）估算可容纳的字符数
+            size = max(1, int(budget / 0.6))
+            pieces.append(sentence[:size])
+            sentence = sentence[size:]
+        current += sentence
+    if current.strip():
+        pieces.append(current)
+    return pieces
+
+
+def plan_summary_chunks(
+    text: str,
+    segments: Optional[List[Dict[str, Any]]],
+    budget: int
+) -> List[Dict[str, Any]]:
+    """
+    把转录切分为不超过token预算的分段
+
+    Args:
+        text: 转录全文（没有片段信息时使用）
+        segments: 转录片段（{start, end, text}），分段只在片段之间切分
+        budget: 每段的token预算
+
+    Returns:
+        分段列表，每段为 {text, start, end}（没有片段信息时start/end为None）
+    """
+    if not segments:
+        return [{"text": piece, "start": None, "end": None} for piece in _split_text(text, budget)]
+
+    chunks = []
+    lines: List[str] = []
+    tokens = 0
+    start = end = None
+    for segment in segments:
+        line = segment["text"].strip()
+        if not line:
+            continue
+        line_tokens = estimate_tokens(line)
+        if lines and tokens + line_tokens > budget:
+            chunks.append({"text": "\n".join(lines), "start": start, "end": end})
+            lines, tokens, start = [], 0, None
+
+        if line_tokens > budget:
+            # 单个片段超出预算（如未分句的长片段）时单独切分
+            for piece in _split_text(line, budget):
+                chunks.append({"text": piece, "start": segment["start"], "end": segment["end"]})
+            continue
+
+        if start is None:
+            start = segment["start"]
+        end = segment["end"]
+        lines.append(line)
+        tokens += line_tokens
+
+    if lines:
+        chunks.append({"text": "\n".join(lines), "start": start, "end": end})
+    return chunks
+
+
+def group_by_budget(texts: List[str], budget: int) -> List[List[str]]:
+    """把按顺序排列的文本分组，每组总token数不超过预算（单个文本超出预算时单独成组）"""
+    groups: List[List[str]] = []
+    tokens = 0
+    for text in texts:
+        text_tokens = estimate_tokens(text)
+        if groups and tokens + text_tokens <= budget:
+            groups[-1].append(text)
+            tokens += text_tokens
+        else:
+            groups.append([text])
+            tokens = text_tokens
+    return groups
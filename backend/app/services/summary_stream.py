@@ -0,0 +1,128 @@
+"""
+摘要增量发布服务
+流式调用大模型时把思考过程与纪要正文的增量文本追加到Redis列表，客户端按游标增量读取，
+首个token生成后即可开始渲染，无需等待完整纪要。
+增量由单个后台线程按提交顺序写入Redis，事件循环上的流式读取不等待Redis
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+from app.core.config import settings
+from app.services.redis_client import get_client as _client
+
+SUMMARY_KEY_PREFIX = "meetmemo:summary:"
+SUMMARY_DONE_KEY_PREFIX = "meetmemo:summary_done:"
+
+# 增量类型：推理模型的思考过程与纪要正文
+REASONING = "reasoning"
+CONTENT = "content"
+
+# 合并增量后写入Redis的最短间隔（秒），避免每个token一次写入
+FLUSH_INTERVAL_SECONDS = 0.2
+
+# 结束时等待后台写入完成的最长时间（秒）
+CLOSE_TIMEOUT_SECONDS = 5
+
+_publisher: Optional[ThreadPoolExecutor] = None
+_publisher_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def _get_publisher() -> ThreadPoolExecutor:
+    """写入线程（单线程保证同一任务的增量与结束标记按顺序写入；fork出的子进程首次使用时重新创建）"""
+    global _publisher, _publisher_pid
+    with _lock:
+        if _publisher is None or _publisher_pid != os.getpid():
+            _publisher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summary-stream")
+            _publisher_pid = os.getpid()
+        return _publisher
+
+
+def _push(task_id: str, deltas: List[Dict[str, str]]) -> None:
+    try:
+        key = SUMMARY_KEY_PREFIX + task_id
+        pipe = _client().pipeline()
+        pipe.rpush(key, *[json.dumps(delta, ensure_ascii=False) for delta in deltas])
+        pipe.expire(key, settings.TRANSCRIPT_STREAM_TTL_SECONDS)
+        pipe.execute()
+    except Exception:
+        pass
+
+
+def _mark_done(task_id: str, error: Optional[str]) -> None:
+    try:
+        _client().set(
+            SUMMARY_DONE_KEY_PREFIX + task_id,
+            json.dumps({"error": error}, ensure_ascii=False),
+            ex=settings.TRANSCRIPT_STREAM_TTL_SECONDS
+        )
+    except Exception:
+        pass
+
+
+class SummaryStreamWriter:
+    """缓冲大模型输出的增量文本，按时间间隔合并后追加到任务的Redis列表（发布失败时忽略）"""
+
+    def __init__(self, task_id: str):
+        self.task_id = task_id
+        self._pending: List[Dict[str, str]] = []
+        self._last_flush = 0.0
+
+    def add(self, kind: str, text: str) -> None:
+        """追加一段增量文本"""
+        if not text:
+            return
+        # 相邻的同类增量合并为一条
+        if self._pending and self._pending[-1]["type"] == kind:
+            self._pending[-1]["text"] += text
+        else:
+            self._pending.append({"type": kind, "text": text})
+        if time.monotonic() - self._last_flush >= FLUSH_INTERVAL_SECONDS:
+            self.flush()
+
+    def flush(self) -> None:
+        """把缓冲的增量交给写入线程（不等待写入完成）"""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        _get_publisher().submit(_push, self.task_id, pending)
+
+    def close(self, error: Optional[str] = None) -> None:
+        """写入剩余增量并标记摘要生成已结束（error非空表示生成失败），等待写入完成"""
+        self.flush()
+        done = _get_publisher().submit(_mark_done, self.task_id, error)
+        try:
+            done.result(timeout=CLOSE_TIMEOUT_SECONDS)
+        except Exception:
+            pass
+
+
+def read_summary(task_id: str, cursor: int) -> Dict[str, Any]:
+    """
+    读取游标之后的增量文本
+
+    Args:
+        task_id: 任务ID
+        cursor: 已读取的增量条数
+
+    Returns:
+        新增的思考过程与正文文本、下一次请求的游标、摘要是否已生成结束及失败原因
+    """
+    client = _client()
+    # 先读结束标记，避免结束前最后一批增量被漏读
+    done = client.get(SUMMARY_DONE_KEY_PREFIX + task_id)
+    values = client.lrange(SUMMARY_KEY_PREFIX + task_id, cursor, -1)
+    deltas = [json.loads(value) for value in values]
+    return {
+        "reasoning": "".join(delta["text"] for delta in deltas if delta["type"] == REASONING),
+        "content": "".join(delta["text"] for delta in deltas if delta["type"] == CONTENT),
+        "next_cursor": cursor + len(deltas),
+        "complete": done is not None,
+        "error": json.loads(done)["error"] if done else None,
+    }
@@ -0,0 +1,123 @@
+"""
+转录结果缓存
+按(内容哈希, 模型, 引擎, 语言, 解码选项)缓存转录结果，任务因摘要失败重试或重新生成摘要时直接复用，
+不再重复运行Whisper；条目超过有效期或总大小超过上限时淘汰
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from app.core.config import settings
+from app.services.file_index import shard_prefix
+
+# 结果结构变化时递增，使旧条目失效
+CACHE_VERSION = 1
+ENTRY_SUFFIX = ".json"
+
+_evict_lock = threading.Lock()
+
+
+def make_key(
+    content_hash: str,
+    model_name: str,
+    engine: str,
+    language: str,
+    options: Dict[str, Any]
+) -> str:
+    """由内容哈希、模型、引擎、语言与解码选项生成缓存key"""
+    payload = json.dumps(
+        {
+            "version": CACHE_VERSION,
+            "sha256": content_hash,
+            "model": model_name,
+            "engine": engine,
+            "language": language,
+            "options": options,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def entry_path(key: str) -> Path:
+    """缓存条目路径（按key前缀分目录）"""
+    return Path(settings.TRANSCRIPT_CACHE_DIR) / shard_prefix(key) / f"{key}{ENTRY_SUFFIX}"
+
+
+def get(key: str) -> Optional[Dict[str, Any]]:
+    """
+    读取缓存的转录结果
+
+    Returns:
+        转录结果，未命中、已过期或文件损坏时返回None
+    """
+    path = entry_path(key)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+        if time.time() - entry["cached_at"] > settings.TRANSCRIPT_CACHE_TTL_SECONDS:
+            path.unlink(missing_ok=True)
+            return None
+        # 更新修改时间作为最近使用时间，供淘汰排序
+        os.utime(path)
+        return entry["transcription"]
+    except (FileNotFoundError, ValueError, KeyError):
+        return None
+
+
+def put(key: str, transcription: Dict[str, Any]) -> None:
+    """写入转录结果（失败时忽略，不影响任务）"""
+    path = entry_path(key)
+    tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"cached_at": time.time(), "transcription": transcription}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        evict()
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+
+
+def evict(max_bytes: Optional[int] = None) -> int:
+    """
+    删除过期条目，再按最近最少使用淘汰，直到总大小不超过上限
+
+    Returns:
+        删除的条目数
+    """
+    max_bytes = settings.TRANSCRIPT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    root = Path(settings.TRANSCRIPT_CACHE_DIR)
+    if not root.exists():
+        return 0
+
+    with _evict_lock:
+        # 修改时间不早于写入时间，修改时间已超出有效期的条目必然已过期；其余过期条目在读取时删除
+        expire_before = time.time() - settings.TRANSCRIPT_CACHE_TTL_SECONDS
+        entries = []
+        total = 0
+        removed = 0
+        for path in root.rglob(f"*{ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if stat.st_mtime < expire_before:
+                path.unlink(missing_ok=True)
+                removed += 1
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,206 @@
+"""
+转录引擎
+统一模型加载与转录接口：openai-whisper（PyTorch实现）与faster-whisper（CTranslate2实现，CPU上使用int8推理），
+可通过TRANSCRIBE_ENGINE配置或在上传时按文件选择；两者返回相同结构的片段
+"""
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional
+
+import numpy as np
+from celery.utils.log import get_logger
+
+from app.core.config import settings
+from app.services.vad import SAMPLE_RATE
+
+logger = get_logger(__name__)
+
+WHISPER_ENGINE = "whisper"
+FASTER_WHISPER_ENGINE = "faster-whisper"
+
+SegmentCallback = Callable[[List[Dict[str, Any]]], None]
+
+
+class TranscriptionEngine(ABC):
+    """转录引擎接口"""
+
+    name = ""
+
+    @abstractmethod
+    def load(self, model_name: str, device: str) -> Any:
+        """
+        加载模型
+
+        Args:
+            model_name: 模型名称（tiny/base/small/medium/large/turbo）
+            device: 设备（cpu/cuda）
+        """
+
+    def decode_options(self, model_name: str, device: str) -> Dict[str, Any]:
+        """影响转录输出的引擎配置（作为转录结果缓存key的一部分）"""
+        return {}
+
+    @abstractmethod
+    def transcribe(
+        self,
+        model,
+        audio: np.ndarray,
+        language: Optional[str],
+        on_segments: Optional[SegmentCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        转录16kHz单声道波形
+
+        Args:
+            model: load返回的模型
+            audio: 16kHz单声道float32波形
+            language: 语言代码，None为自动检测
+            on_segments: 增量片段回调
+
+        Returns:
+            text/language/segments（片段为 {start, end, text}），可附带引擎相关的统计信息
+        """
+
+
+def _models_dir() -> str:
+    models_dir = Path(settings.WHISPER_MODELS_DIR)
+    models_dir.mkdir(exist_ok=True)
+    return str(models_dir)
+
+
+class WhisperEngine(TranscriptionEngine):
+    """openai-whisper：长音频并行分块、短音频批量推理、分窗增量输出，CPU上可选int8量化"""
+
+    name = WHISPER_ENGINE
+
+    def load(self, model_name: str, device: str) -> Any:
+        import whisper
+        from app.services.quantization import should_quantize, load_quantized
+
+        loader = lambda: whisper.load_model(model_name, device=device, download_root=_models_dir())
+        # CPU上按配置使用动态int8量化的模型（量化结果缓存在磁盘上）
+        if should_quantize(model_name, device):
+            return load_quantized(model_name, loader)
+        return loader()
+
+    def decode_options(self, model_name: str, device: str) -> Dict[str, Any]:
+        from app.services.quantization import should_quantize
+
+        return {"int8": should_quantize(model_name, device)}
+
+    def transcribe(
+        self,
+        model,
+        audio: np.ndarray,
+        language: Optional[str],
+        on_segments: Optional[SegmentCallback] = None
+    ) -> Dict[str, Any]:
+        from app.services.batch_inference import should_batch, transcribe_batched
+        from app.services.model_cache import inference_lock
+        from app.services.parallel_transcription import (
+            should_parallelize,
+            transcribe_parallel,
+            transcribe_windowed,
+        )
+
+        is_cuda = next(model.parameters()).device.type == "cuda"
+        options = {
+            "fp16": is_cuda,  # 在GPU上使用fp16，CPU上使用fp32
+            "language": language,
+            "task": "transcribe"
+        }
+
+        # CPU上的长音频按静音切块，在多进程中并行转录
+        if should_parallelize(model, audio):
+            try:
+                return transcribe_parallel(model, audio, options, on_chunk=on_segments)
+            except (OSError, AssertionError) as e:
+                # 无法创建子进程（如进程数或内存受限），退回顺序转录
+                logger.warning("并行分块转录不可用，改为顺序转录: %s", str(e))
+
+        # 短音频按30秒窗口提交到进程内的批量推理服务，与其他任务的窗口合批解码
+        if should_batch(audio):
+            result = transcribe_batched(model, audio, options)
+            if on_segments:
+                on_segments(result["segments"])
+            return result
+
+        window_seconds = settings.TRANSCRIPT_STREAM_WINDOW_SECONDS
+        if on_segments and len(audio) / SAMPLE_RATE > window_seconds * 1.5:
+            # 分窗顺序转录，每窗完成即发布，首批文本无需等待整段音频转录完成
+            return transcribe_windowed(model, audio, options, window_seconds, on_segments)
+
+        with inference_lock(model):
+            result = model.transcribe(audio, **options)
+        if on_segments:
+            on_segments(result.get("segments", []))
+        return result
+
+
+class FasterWhisperEngine(TranscriptionEngine):
+    """faster-whisper：CTranslate2推理，CPU上默认int8量化，片段逐个解码产出"""
+
+    name = FASTER_WHISPER_ENGINE
+
+    def load(self, model_name: str, device: str) -> Any:
+        from faster_whisper import WhisperModel
+
+        return WhisperModel(
+            model_name,
+            device=device,
+            compute_type=self._compute_type(device),
+            cpu_threads=settings.FASTER_WHISPER_CPU_THREADS,
+            download_root=_models_dir(),
+        )
+
+    def decode_options(self, model_name: str, device: str) -> Dict[str, Any]:
+        return {"compute_type": self._compute_type(device), "beam_size": settings.FASTER_WHISPER_BEAM_SIZE}
+
+    @staticmethod
+    def _compute_type(device: str) -> str:
+        return settings.FASTER_WHISPER_COMPUTE_TYPE or ("float16" if device == "cuda" else "int8")
+
+    def transcribe(
+        self,
+        model,
+        audio: np.ndarray,
+        language: Optional[str],
+        on_segments: Optional[SegmentCallback] = None
+    ) -> Dict[str, Any]:
+        # 静音已由本服务的VAD处理，不再启用faster-whisper内置的VAD
+        segment_iter, info = model.transcribe(
+            audio,
+            language=language,
+            task="transcribe",
+            beam_size=settings.FASTER_WHISPER_BEAM_SIZE,
+            vad_filter=False,
+        )
+
+        # 返回的是生成器，每解码完一个片段产出一个，可直接增量发布
+        segments = []
+        for segment in segment_iter:
+            item = {"start": round(segment.start, 3), "end": round(segment.end, 3), "text": segment.text}
+            segments.append(item)
+            if on_segments:
+                on_segments([item])
+
+        return {
+            "text": "".join(segment["text"] for segment in segments),
+            "language": info.language,
+            "segments": segments,
+        }
+
+
+ENGINES: Dict[str, TranscriptionEngine] = {
+    WHISPER_ENGINE: WhisperEngine(),
+    FASTER_WHISPER_ENGINE: FasterWhisperEngine(),
+}
+
+
+def get_engine(name: Optional[str] = None) -> TranscriptionEngine:
+    """按名称获取转录引擎，未指定时使用TRANSCRIBE_ENGINE配置"""
+    name = name or settings.TRANSCRIBE_ENGINE
+    if name not in ENGINES:
+        raise Exception(f"不支持的转录引擎: {name}，可选: {', '.join(ENGINES)}")
+    return ENGINES[name]
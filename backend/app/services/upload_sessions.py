@@ -0,0 +1,237 @@
+"""
+可续传分块上传会话服务
+每个会话在上传目录下拥有独立目录：预分配的数据文件 + 已接收区间标记
+客户端直传对象存储的会话只保存会话信息，不在本机保存数据
+"""
+
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+import aiofiles
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+
+SESSION_META_FILE = "session.json"
+SESSION_DATA_FILE = "data.part"
+SESSION_RANGES_DIR = "ranges"
+# 合并文件时创建的标记，保证同一会话只被合并一次
+SESSION_FINALIZING_FILE = "finalizing"
+
+
+class UploadSessionError(Exception):
+    """上传会话操作错误"""
+
+
+class UploadSessionNotFound(UploadSessionError):
+    """上传会话不存在"""
+
+
+class UploadSessionConflict(UploadSessionError):
+    """上传会话正在被另一个请求合并"""
+
+
+def get_sessions_dir(upload_dir: str) -> Path:
+    """获取上传会话根目录"""
+    sessions_dir = Path(upload_dir) / "sessions"
+    sessions_dir.mkdir(parents=True, exist_ok=True)
+    return sessions_dir
+
+
+def _session_dir(upload_dir: str, session_id: str) -> Path:
+    # session_id 由服务端生成，这里防止路径穿越
+    try:
+        uuid.UUID(session_id)
+    except ValueError:
+        raise UploadSessionNotFound(f"上传会话不存在: {session_id}")
+
+    session_dir = get_sessions_dir(upload_dir) / session_id
+    if not (session_dir / SESSION_META_FILE).exists():
+        raise UploadSessionNotFound(f"上传会话不存在: {session_id}")
+    return session_dir
+
+
+def create_session(
+    upload_dir: str,
+    file_size: int,
+    metadata: Dict[str, Any],
+    direct: bool = False,
+) -> Dict[str, Any]:
+    """
+    创建上传会话并预分配数据文件
+
+    Args:
+        upload_dir: 上传目录
+        file_size: 文件总大小
+        metadata: 随会话保存的文件信息（文件名、会议标题等）
+        direct: 是否为客户端直传对象存储的会话（不预分配本地数据文件）
+
+    Returns:
+        会话信息
+    """
+    session_id = str(uuid.uuid4())
+    session_dir = get_sessions_dir(upload_dir) / session_id
+    (session_dir / SESSION_RANGES_DIR).mkdir(parents=True)
+
+    # 预分配到目标大小，各分块可按偏移量乱序/并行写入
+    if not direct:
+        with open(session_dir / SESSION_DATA_FILE, "wb") as f:
+            f.truncate(file_size)
+
+    session = {
+        "session_id": session_id,
+        "file_size": file_size,
+        "created_at": datetime.utcnow().isoformat(),
+        "direct": direct,
+        **metadata
+    }
+    with open(session_dir / SESSION_META_FILE, "w", encoding="utf-8") as f:
+        json.dump(session, f, ensure_ascii=False)
+
+    return session
+
+
+def load_session(upload_dir: str, session_id: str) -> Dict[str, Any]:
+    """读取会话信息"""
+    session_dir = _session_dir(upload_dir, session_id)
+    with open(session_dir / SESSION_META_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+async def write_chunk(
+    upload_dir: str,
+    session_id: str,
+    offset: int,
+    request: Request,
+    max_chunk_size: int,
+    write_size: int,
+) -> Tuple[int, int]:
+    """
+    将请求体作为一个分块写入会话数据文件的指定偏移
+
+    分块写完后才记录区间标记，中途断开的分块不会被当作已接收。
+
+    Args:
+        upload_dir: 上传目录
+        session_id: 会话ID
+        offset: 分块起始偏移
+        request: 请求对象（请求体为分块原始字节）
+        max_chunk_size: 单个分块的最大字节数
+        write_size: 单次写盘的块大小
+
+    Returns:
+        写入的区间 (start, end)
+    """
+    session_dir = _session_dir(upload_dir, session_id)
+    session = await run_in_threadpool(load_session, upload_dir, session_id)
+    file_size = session["file_size"]
+    if session.get("direct"):
+        raise UploadSessionError("直传会话不接受分块上传")
+
+    if offset < 0 or offset >= file_size:
+        raise UploadSessionError(f"分块偏移量超出范围: {offset}")
+
+    limit = min(max_chunk_size, file_size - offset)
+    content_length = request.headers.get("content-length")
+    if content_length:
+        try:
+            declared = int(content_length)
+        except ValueError:
+            raise UploadSessionError(f"无效的Content-Length: {content_length}")
+        if declared < 0:
+            raise UploadSessionError(f"无效的Content-Length: {content_length}")
+        if declared > limit:
+            raise UploadSessionError(f"分块过大，偏移 {offset} 处最多允许 {limit} 字节")
+
+    written = 0
+    buffer = bytearray()
+    async with aiofiles.open(session_dir / SESSION_DATA_FILE, "r+b") as out:
+        await out.seek(offset)
+        async for body_chunk in request.stream():
+            written += len(body_chunk)
+            if written > limit:
+                raise UploadSessionError(f"分块过大，偏移 {offset} 处最多允许 {limit} 字节")
+            buffer += body_chunk
+            if len(buffer) >= write_size:
+                await out.write(bytes(buffer))
+                buffer.clear()
+        if buffer:
+            await out.write(bytes(buffer))
+
+    if written == 0:
+        raise UploadSessionError("分块内容为空")
+
+    end = offset + written
+    (session_dir / SESSION_RANGES_DIR / f"{offset}-{end}").touch()
+    return offset, end
+
+
+def get_received_ranges(upload_dir: str, session_id: str) -> List[Tuple[int, int]]:
+    """获取已接收的字节区间（已合并、按起点排序）"""
+    session_dir = _session_dir(upload_dir, session_id)
+
+    ranges = []
+    for marker in os.listdir(session_dir / SESSION_RANGES_DIR):
+        start, _, end = marker.partition("-")
+        ranges.append((int(start), int(end)))
+    ranges.sort()
+
+    merged: List[Tuple[int, int]] = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def finalize_session(upload_dir: str, session_id: str, dest_path: Path) -> Dict[str, Any]:
+    """
+    校验所有分块已到齐，将数据文件移动到最终位置并删除会话
+
+    先以独占方式创建合并标记，并发的合并请求得到UploadSessionConflict，不会同时移动数据文件。
+
+    Args:
+        upload_dir: 上传目录
+        session_id: 会话ID
+        dest_path: 最终文件路径
+
+    Returns:
+        会话信息
+    """
+    session_dir = _session_dir(upload_dir, session_id)
+    try:
+        os.close(os.open(session_dir / SESSION_FINALIZING_FILE, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        raise UploadSessionConflict(f"上传会话正在合并: {session_id}")
+    except FileNotFoundError:
+        raise UploadSessionNotFound(f"上传会话不存在: {session_id}")
+
+    try:
+        session = load_session(upload_dir, session_id)
+        if session.get("direct"):
+            raise UploadSessionError("直传会话请调用直传完成接口")
+        ranges = get_received_ranges(upload_dir, session_id)
+        if ranges != [(0, session["file_size"])]:
+            received = sum(end - start for start, end in ranges)
+            raise UploadSessionError(
+                f"文件尚未上传完整: 已接收 {received}/{session['file_size']} 字节"
+            )
+        os.replace(session_dir / SESSION_DATA_FILE, dest_path)
+    except BaseException:
+        # 未完成合并时移除标记，客户端补传后可再次合并
+        (session_dir / SESSION_FINALIZING_FILE).unlink(missing_ok=True)
+        raise
+
+    shutil.rmtree(session_dir, ignore_errors=True)
+    return session
+
+
+def delete_session(upload_dir: str, session_id: str) -> None:
+    """放弃上传会话并删除已接收的数据"""
+    session_dir = _session_dir(upload_dir, session_id)
+    shutil.rmtree(session_dir, ignore_errors=True)
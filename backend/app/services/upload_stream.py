@@ -0,0 +1,364 @@
+"""
+上传文件流式写入服务
+直接解析multipart请求体，按固定大小分块写入上传目录，避免整文件驻留内存
+"""
+
+import hashlib
+import zipfile
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+import aiofiles
+from fastapi import Request
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # 旧版本python-multipart
+    from multipart.multipart import MultipartParser, parse_options_header
+
+# multipart边界、表单字段等额外开销的估算上限（用于Content-Length预检）
+MULTIPART_OVERHEAD_ALLOWANCE = 64 * 1024
+
+# 普通表单字段的最大长度
+MAX_FORM_FIELD_SIZE = 64 * 1024
+
+
+class UploadTooLargeError(Exception):
+    """上传内容超过大小限制"""
+
+
+class UploadFormatError(Exception):
+    """上传请求格式错误或文件类型不被允许"""
+
+
+def check_content_length(request: Request, max_size: int) -> None:
+    """
+    根据Content-Length请求头提前拒绝超大上传
+
+    Args:
+        request: 请求对象
+        max_size: 文件最大字节数
+
+    Raises:
+        UploadTooLargeError: 声明的请求体大小超过限制
+    """
+    content_length = request.headers.get("content-length")
+    if not content_length:
+        return
+
+    try:
+        declared_size = int(content_length)
+    except ValueError:
+        raise UploadFormatError("无效的Content-Length请求头")
+
+    if declared_size > max_size + MULTIPART_OVERHEAD_ALLOWANCE:
+        raise UploadTooLargeError(f"请求体过大: {declared_size} 字节")
+
+
+def _parse_content_disposition(value: bytes) -> Tuple[Optional[str], Optional[str]]:
+    """解析Content-Disposition，返回(字段名, 文件名)"""
+    _, options = parse_options_header(value)
+    name = options.get(b"name")
+    filename = options.get(b"filename")
+    return (
+        name.decode("utf-8", errors="replace") if name is not None else None,
+        filename.decode("utf-8", errors="replace") if filename is not None else None,
+    )
+
+
+async def stream_multipart_files(
+    request: Request,
+    file_field: str,
+    build_path: Callable[[str], Path],
+    max_file_size: int,
+    max_total_size: int,
+    max_files: int,
+    chunk_size: int,
+    file_size_limit: Optional[Callable[[str], int]] = None,
+) -> Dict[str, Any]:
+    """
+    流式解析multipart上传请求并将其中的文件逐个写入磁盘
+
+    文件内容按chunk_size聚合后通过aiofiles异步写入，单个文件超过max_file_size或
+    总量超过max_total_size时立即中止读取并删除已写入的文件。
+    写入的同时计算每个文件内容的SHA-256，无需再次读取文件。
+
+    Args:
+        request: 请求对象
+        file_field: 文件字段名
+        build_path: 根据原始文件名生成保存路径的回调（可在此校验文件格式）
+        max_file_size: 单个文件最大字节数
+        max_total_size: 全部文件合计最大字节数
+        max_files: 最多允许的文件数
+        chunk_size: 单次写盘的块大小
+        file_size_limit: 按原始文件名返回单个文件大小上限的回调（可选，默认max_file_size）
+
+    Returns:
+        包含表单字段和文件列表（原始文件名、保存路径、文件大小、SHA-256）的字典
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise UploadFormatError("请求必须为multipart/form-data格式")
+
+    check_content_length(request, max_total_size)
+
+    # 解析器回调只记录事件，实际的异步写盘在主循环中完成
+    events: List[Tuple[str, Any]] = []
+    header_state = {"field": b"", "value": b""}
+
+    def on_part_begin() -> None:
+        events.append(("begin", None))
+
+    def on_header_field(data: bytes, start: int, end: int) -> None:
+        header_state["field"] += data[start:end]
+
+    def on_header_value(data: bytes, start: int, end: int) -> None:
+        header_state["value"] += data[start:end]
+
+    def on_header_end() -> None:
+        events.append(("header", (header_state["field"].lower(), header_state["value"])))
+        header_state["field"] = b""
+        header_state["value"] = b""
+
+    def on_headers_finished() -> None:
+        events.append(("headers_finished", None))
+
+    def on_part_data(data: bytes, start: int, end: int) -> None:
+        events.append(("data", data[start:end]))
+
+    def on_part_end() -> None:
+        events.append(("end", None))
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+
+    fields: Dict[str, str] = {}
+    files: List[Dict[str, Any]] = []
+    total_size = 0
+
+    out = None
+    current: Optional[Dict[str, Any]] = None
+    current_limit = max_file_size
+    file_hash = None
+    buffer = bytearray()
+    part_name: Optional[str] = None
+    part_filename: Optional[str] = None
+    part_value = bytearray()
+
+    try:
+        async for body_chunk in request.stream():
+            if not body_chunk:
+                continue
+            parser.write(body_chunk)
+
+            for event, payload in events:
+                if event == "begin":
+                    part_name, part_filename = None, None
+                    part_value = bytearray()
+                elif event == "header":
+                    header_name, header_value = payload
+                    if header_name == b"content-disposition":
+                        part_name, part_filename = _parse_content_disposition(header_value)
+                elif event == "headers_finished":
+                    if part_name == file_field and part_filename is not None:
+                        if len(files) >= max_files:
+                            raise UploadFormatError(
+                                "一次只能上传一个文件" if max_files == 1 else f"一次最多上传 {max_files} 个文件"
+                            )
+                        current = {
+                            "filename": part_filename,
+                            "file_path": build_path(part_filename),
+                            "file_size": 0,
+                        }
+                        current_limit = (
+                            file_size_limit(part_filename) if file_size_limit else max_file_size
+                        )
+                        files.append(current)
+                        file_hash = hashlib.sha256()
+                        out = await aiofiles.open(current["file_path"], "wb")
+                elif event == "data":
+                    if current is not None:
+                        current["file_size"] += len(payload)
+                        total_size += len(payload)
+                        if current["file_size"] > current_limit:
+                            raise UploadTooLargeError(f"文件超过 {current_limit} 字节")
+                        if total_size > max_total_size:
+                            raise UploadTooLargeError(f"上传总量超过 {max_total_size} 字节")
+                        file_hash.update(payload)
+                        buffer += payload
+                        if len(buffer) >= chunk_size:
+                            await out.write(bytes(buffer))
+                            buffer.clear()
+                    else:
+                        part_value += payload
+                        if len(part_value) > MAX_FORM_FIELD_SIZE:
+                            raise UploadFormatError(f"表单字段过长: {part_name}")
+                elif event == "end":
+                    if current is not None:
+                        if buffer:
+                            await out.write(bytes(buffer))
+                            buffer.clear()
+                        await out.close()
+                        out = None
+                        current["sha256"] = file_hash.hexdigest()
+                        current = None
+                    elif part_name:
+                        fields[part_name] = part_value.decode("utf-8", errors="replace")
+            events.clear()
+
+        parser.finalize()
+
+        if not files:
+            raise UploadFormatError("未选择文件")
+        if out is not None:
+            raise UploadFormatError("上传数据不完整")
+
+    except BaseException:
+        if out is not None:
+            await out.close()
+        for saved in files:
+            if saved["file_path"].exists():
+                saved["file_path"].unlink()
+        raise
+
+    return {
+        "fields": fields,
+        "files": files,
+    }
+
+
+async def stream_multipart_upload(
+    request: Request,
+    file_field: str,
+    build_path: Callable[[str], Path],
+    max_size: int,
+    chunk_size: int,
+) -> Dict[str, Any]:
+    """
+    流式解析单文件multipart上传请求并写入磁盘
+
+    Args:
+        request: 请求对象
+        file_field: 文件字段名
+        build_path: 根据原始文件名生成保存路径的回调（可在此校验文件格式）
+        max_size: 文件最大字节数
+        chunk_size: 单次写盘的块大小
+
+    Returns:
+        包含表单字段、原始文件名、保存路径、文件大小和SHA-256的字典
+    """
+    upload = await stream_multipart_files(
+        request,
+        file_field=file_field,
+        build_path=build_path,
+        max_file_size=max_size,
+        max_total_size=max_size,
+        max_files=1,
+        chunk_size=chunk_size,
+    )
+    return {
+        "fields": upload["fields"],
+        **upload["files"][0],
+    }
+
+
+def compute_sha256(file_path: Path, chunk_size: int) -> str:
+    """
+    分块计算文件的SHA-256（用于无法边写边算的场景，如乱序分块上传）
+
+    Args:
+        file_path: 文件路径
+        chunk_size: 读取块大小
+
+    Returns:
+        十六进制摘要
+    """
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def extract_zip_members(
+    zip_path: Path,
+    build_path: Callable[[str], Path],
+    is_allowed: Callable[[str], bool],
+    max_file_size: int,
+    max_total_size: int,
+    max_files: int,
+    chunk_size: int,
+) -> List[Dict[str, Any]]:
+    """
+    分块解压zip中符合条件的文件，同时计算SHA-256
+
+    按实际解压出的字节数校验大小，不信任zip目录中声明的大小，防止压缩炸弹。
+
+    Args:
+        zip_path: zip文件路径
+        build_path: 根据成员文件名生成保存路径的回调
+        is_allowed: 判断成员文件是否需要解压的回调
+        max_file_size: 单个文件最大字节数
+        max_total_size: 解压总量最大字节数
+        max_files: 最多解压的文件数
+        chunk_size: 读写块大小
+
+    Returns:
+        文件列表（原始文件名、保存路径、文件大小、SHA-256）
+    """
+    extracted: List[Dict[str, Any]] = []
+    total_size = 0
+
+    try:
+        with zipfile.ZipFile(zip_path) as archive:
+            for member in archive.infolist():
+                member_name = Path(member.filename).name
+                if member.is_dir() or member_name.startswith(".") or not is_allowed(member_name):
+                    continue
+                if len(extracted) >= max_files:
+                    raise UploadFormatError(f"一次最多上传 {max_files} 个文件")
+
+                entry = {
+                    "filename": member_name,
+                    "file_path": build_path(member_name),
+                    "file_size": 0,
+                }
+                extracted.append(entry)
+                file_hash = hashlib.sha256()
+
+                with archive.open(member) as src, open(entry["file_path"], "wb") as dst:
+                    while True:
+                        chunk = src.read(chunk_size)
+                        if not chunk:
+                            break
+                        entry["file_size"] += len(chunk)
+                        total_size += len(chunk)
+                        if entry["file_size"] > max_file_size:
+                            raise UploadTooLargeError(f"文件超过 {max_file_size} 字节: {member_name}")
+                        if total_size > max_total_size:
+                            raise UploadTooLargeError(f"解压总量超过 {max_total_size} 字节")
+                        file_hash.update(chunk)
+                        dst.write(chunk)
+
+                entry["sha256"] = file_hash.hexdigest()
+    except zipfile.BadZipFile:
+        for entry in extracted:
+            entry["file_path"].unlink(missing_ok=True)
+        raise UploadFormatError(f"无效的zip文件: {zip_path.name}")
+    except BaseException:
+        for entry in extracted:
+            entry["file_path"].unlink(missing_ok=True)
+        raise
+
+    return extracted
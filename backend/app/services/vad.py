@@ -0,0 +1,172 @@
+"""
+语音活动检测（VAD）服务
+基于短时能量与语音频带能量占比的向量化检测，转录前剪掉长时间静音，
+并提供将剪辑后时间轴映射回原始音频时间轴的方法
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+# Whisper统一使用16kHz单声道音频
+SAMPLE_RATE = 16000
+
+# 帧长与一次做FFT的帧数（分块计算，避免长音频一次性占用过多内存）
+FRAME_MS = 30
+FFT_BLOCK_FRAMES = 4096
+
+# 人声主要能量所在频带
+SPEECH_BAND_HZ = (300, 3400)
+
+# 时间轴映射：各语音区间在 (拼接后, 原始) 时间轴上的起点（秒）
+Timeline = Tuple[np.ndarray, np.ndarray]
+
+
+def _frames(audio: np.ndarray, frame_size: int) -> np.ndarray:
+    num_frames = len(audio) // frame_size
+    return audio[: num_frames * frame_size].reshape(num_frames, frame_size)
+
+
+def frame_energy_db(audio: np.ndarray, frame_size: int) -> np.ndarray:
+    """计算每帧的能量（dBFS）"""
+    rms = np.sqrt(np.mean(_frames(audio, frame_size).astype(np.float32) ** 2, axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+def _frame_features(audio: np.ndarray, frame_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    计算每帧的能量（dBFS）与语音频带能量占比
+
+    Returns:
+        (能量dB数组, 频带能量占比数组)
+    """
+    frames = _frames(audio, frame_size)
+    num_frames = len(frames)
+    energy_db = frame_energy_db(audio, frame_size)
+
+    freqs = np.fft.rfftfreq(frame_size, d=1.0 / SAMPLE_RATE)
+    band = (freqs >= SPEECH_BAND_HZ[0]) & (freqs <= SPEECH_BAND_HZ[1])
+    window = np.hanning(frame_size).astype(np.float32)
+
+    band_ratio = np.empty(num_frames, dtype=np.float32)
+    for start in range(0, num_frames, FFT_BLOCK_FRAMES):
+        block = frames[start:start + FFT_BLOCK_FRAMES] * window
+        power = np.abs(np.fft.rfft(block, axis=1)) ** 2
+        total = power.sum(axis=1)
+        band_ratio[start:start + len(block)] = power[:, band].sum(axis=1) / np.maximum(total, 1e-10)
+
+    return energy_db, band_ratio
+
+
+def _mask_to_regions(mask: np.ndarray) -> List[Tuple[int, int]]:
+    """将布尔帧掩码转换为[起始帧, 结束帧)区间列表"""
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(np.diff(padded.astype(np.int8)))
+    return list(zip(edges[0::2].tolist(), edges[1::2].tolist()))
+
+
+def detect_speech(audio: np.ndarray) -> List[Tuple[int, int]]:
+    """
+    检测语音区间
+
+    能量阈值按整段音频的噪声底（低分位能量）自适应确定，再结合语音频带能量占比排除
+    低频嗡声等非语音噪声；语音区间前后各保留一段余量，短于最小静音时长的间隔不剪。
+
+    Args:
+        audio: 16kHz单声道float32波形
+
+    Returns:
+        语音区间列表，单位为采样点 [start, end)
+    """
+    frame_size = SAMPLE_RATE * FRAME_MS // 1000
+    if len(audio) < frame_size:
+        return [(0, len(audio))] if len(audio) else []
+
+    energy_db, band_ratio = _frame_features(audio, frame_size)
+
+    noise_floor = np.percentile(energy_db, 10)
+    threshold = max(noise_floor + settings.VAD_ENERGY_MARGIN_DB, settings.VAD_MIN_ENERGY_DB)
+    speech = (energy_db > threshold) & (band_ratio > settings.VAD_SPEECH_BAND_RATIO)
+
+    # 去掉过短的孤立语音帧（如咳嗽、碰撞声）
+    min_speech = max(1, settings.VAD_MIN_SPEECH_MS // FRAME_MS)
+    regions = [(s, e) for s, e in _mask_to_regions(speech) if e - s >= min_speech]
+    if not regions:
+        return []
+
+    # 前后保留余量，并合并间隔短于最小静音时长的区间
+    pad = settings.VAD_SPEECH_PAD_MS // FRAME_MS
+    min_silence = settings.VAD_MIN_SILENCE_MS // FRAME_MS
+    num_frames = len(energy_db)
+
+    merged: List[List[int]] = []
+    for start, end in regions:
+        start, end = max(0, start - pad), min(num_frames, end + pad)
+        if merged and start - merged[-1][1] < min_silence:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+
+    # 最后一个区间延伸到音频末尾不足一帧的部分
+    total_samples = len(audio)
+    return [
+        (start * frame_size, total_samples if end == num_frames else end * frame_size)
+        for start, end in merged
+    ]
+
+
+def apply_vad(audio: np.ndarray) -> Dict[str, Any]:
+    """
+    剪掉静音部分，返回拼接后的语音音频以及时间轴映射
+
+    Args:
+        audio: 16kHz单声道float32波形
+
+    Returns:
+        audio: 拼接后的语音音频
+        offsets: 时间轴映射（Timeline），每个语音区间在 (拼接后, 原始) 时间轴上的起点（秒）
+        total_seconds / speech_seconds / skipped_seconds: 原始时长、保留时长、跳过时长
+    """
+    regions = detect_speech(audio)
+    total_seconds = len(audio) / SAMPLE_RATE
+
+    # 拼接后的区间起点为前面各区间长度的累加，映射数组只构建一次
+    bounds = np.array(regions, dtype=np.int64).reshape(-1, 2)
+    lengths = bounds[:, 1] - bounds[:, 0]
+    concat_starts = np.concatenate(([0], np.cumsum(lengths)[:-1])) if len(regions) else np.zeros(0, dtype=np.int64)
+    offsets = (concat_starts / SAMPLE_RATE, bounds[:, 0] / SAMPLE_RATE)
+
+    speech_audio = (
+        np.concatenate([audio[start:end] for start, end in regions])
+        if regions else np.zeros(0, dtype=np.float32)
+    )
+    speech_seconds = len(speech_audio) / SAMPLE_RATE
+
+    return {
+        "audio": speech_audio,
+        "offsets": offsets,
+        "regions": len(regions),
+        "total_seconds": round(total_seconds, 3),
+        "speech_seconds": round(speech_seconds, 3),
+        "skipped_seconds": round(total_seconds - speech_seconds, 3),
+    }
+
+
+def remap_timestamp(timestamp: float, offsets: Optional[Timeline], is_end: bool = False) -> float:
+    """
+    将拼接后音频上的时间映射回原始时间轴
+
+    Args:
+        timestamp: 拼接后音频上的时间（秒）
+        offsets: apply_vad返回的时间轴映射（None表示未剪辑）
+        is_end: 是否为片段结束时间（恰好落在区间边界时归属前一个区间）
+    """
+    if offsets is None or not len(offsets[0]):
+        return timestamp
+
+    concat_starts, original_starts = offsets
+    side = "left" if is_end else "right"
+    index = max(0, int(np.searchsorted(concat_starts, timestamp, side=side)) - 1)
+    return round(float(original_starts[index]) + (timestamp - float(concat_starts[index])), 3)
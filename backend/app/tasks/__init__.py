@@ -4,13 +4,26 @@
 """
 
 from app.core.celery_app import celery_app
-from .audio_processing import process_audio_task, cleanup_temp_files
+from .audio_processing import (
+    process_audio_task,
+    cleanup_temp_files,
+    transcribe_chunk_task,
+    merge_transcription_chunks,
+    finalize_processing_task,
+)
 from .ai_processing import generate_meeting_summary, test_deepseek_connection
+from .storage_maintenance import sweep_storage
+from .queue_balancing import rebalance_model_queues
 
 __all__ = [
     "celery_app",
     "process_audio_task", 
     "cleanup_temp_files",
+    "transcribe_chunk_task",
+    "merge_transcription_chunks",
+    "finalize_processing_task",
     "generate_meeting_summary",
-    "test_deepseek_connection"
+    "test_deepseek_connection",
+    "sweep_storage",
+    "rebalance_model_queues"
 ]
\ No newline at end of file
@@ -2,33 +2,50 @@
 AI处理任务
 """
 
+import asyncio
 import httpx
 import json
-from typing import Dict, Any
+from typing import Callable, Dict, Any, List, Optional
 from celery import current_task
 from datetime import datetime
 
 from app.core.celery_app import celery_app
 from app.core.config import settings
+from app.services import async_runtime, deepseek_client
+from app.services.summary_chunking import estimate_tokens, plan_summary_chunks, group_by_budget
+from app.services.summary_stream import SummaryStreamWriter, REASONING, CONTENT
+
+# 增量文本回调：(增量类型, 文本)
+DeltaCallback = Callable[[str, str], None]
 
 @celery_app.task(bind=True, name="generate_meeting_summary")
 def generate_meeting_summary(
     self, 
     transcription_text: str, 
     meeting_title: str = "会议录音",
-    language: str = "auto"
+    language: str = "auto",
+    stream_task_id: Optional[str] = None,
+    segments: Optional[List[Dict[str, Any]]] = None
 ) -> Dict[str, Any]:
     """
     使用DeepSeek API生成会议摘要
     
+    指定stream_task_id时以流式方式调用，生成过程中的增量文本发布到该任务下，
+    可通过 /api/tasks/{stream_task_id}/summary-stream 读取。
+    估算token数超过SUMMARY_SINGLE_PASS_MAX_TOKENS的转录按片段边界分段，并发提炼各段要点后
+    再汇总成纪要，耗时取决于分段大小而非会议时长。
+    
     Args:
         transcription_text: 转录文本
         meeting_title: 会议标题
         language: 语言
+        stream_task_id: 发布增量文本的任务ID（通常为主任务ID）
+        segments: 转录片段（用于按片段边界分段，可选）
         
     Returns:
         生成的摘要结果
     """
+    writer = SummaryStreamWriter(stream_task_id) if stream_task_id and settings.SUMMARY_STREAM_ENABLED else None
     try:
         # 更新任务状态
         current_task.update_state(
@@ -40,9 +57,6 @@ def generate_meeting_summary(
             }
         )
         
-        # 构建提示词
-        prompt = build_summary_prompt(transcription_text, meeting_title, language)
-        
         # 调用DeepSeek API
         current_task.update_state(
             state='PROGRESS',
@@ -53,7 +67,18 @@ def generate_meeting_summary(
             }
         )
         
-        summary_response = call_deepseek_api(prompt)
+        on_delta = writer.add if writer else None
+        if should_map_reduce(transcription_text):
+            # 超长转录分段提炼要点后汇总
+            summary_response = async_runtime.run(
+                summarize_map_reduce(transcription_text, segments, meeting_title, language, on_delta)
+            )
+        else:
+            # 构建提示词
+            prompt = build_summary_prompt(transcription_text, meeting_title, language)
+            summary_response = call_deepseek_api(prompt, on_delta=on_delta)
+        if writer:
+            writer.close()
         
         # 处理响应
         current_task.update_state(
@@ -74,35 +99,51 @@ def generate_meeting_summary(
             "language": language,
             "original_text_length": len(transcription_text)
         }
+        if summary_response.get("map_reduce"):
+            summary_result["map_reduce"] = summary_response["map_reduce"]
         
         return summary_result
         
     except Exception as e:
         error_msg = f"AI摘要生成失败: {str(e)}"
+        if writer:
+            writer.close(error=error_msg)
         # 不要使用 update_state 设置 FAILURE，直接抛出异常让 Celery 正确记录失败信息
         raise Exception(error_msg)
 
-def build_summary_prompt(transcription_text: str, meeting_title: str, language: str) -> str:
+def use_chinese_prompt(text: str, language: str) -> bool:
+    """是否使用中文提示词"""
+    return language in ["zh", "auto"] or any(ord(char) > 127 for char in text[:100])
+
+def build_summary_prompt(
+    transcription_text: str,
+    meeting_title: str,
+    language: str,
+    from_notes: bool = False
+) -> str:
     """
     构建AI摘要提示词
     
     Args:
-        transcription_text: 转录文本
+        transcription_text: 转录文本（from_notes为True时为按时间顺序排列的分段要点）
         meeting_title: 会议标题
         language: 语言
+        from_notes: 是否根据分段提炼的要点（而非完整转录）生成纪要
         
     Returns:
         构建的提示词
     """
     
     # 根据语言选择提示词模板
-    if language in ["zh", "auto"] or any(ord(char) > 127 for char in transcription_text[:100]):
+    if use_chinese_prompt(transcription_text, language):
+        source = "按时间顺序分段整理的会议要点" if from_notes else "会议录音转录内容"
+        source_label = "分段要点" if from_notes else "转录内容"
         # 中文提示词 - 使用详细的会议纪要模板格式
-        prompt = f"""请根据以下会议录音转录内容，生成一份专业的会议纪要。请严格按照提供的模板格式进行输出。
+        prompt = f"""请根据以下{source}，生成一份专业的会议纪要。请严格按照提供的模板格式进行输出。
 
 会议标题：{meeting_title}
 
-转录内容：
+{source_label}：
 {transcription_text}
 
 请按照以下模板格式生成会议纪要：
@@ -166,12 +207,14 @@ def build_summary_prompt(transcription_text: str, meeting_title: str, language:
 6. 使用正式的会议纪要语言风格
 """
     else:
+        source = "chronological notes extracted from each part of the meeting" if from_notes else "meeting transcription"
+        source_label = "Meeting Notes" if from_notes else "Transcription Content"
         # 英文提示词 - 使用结构化的会议纪要模板格式
-        prompt = f"""Please generate a professional meeting minutes based on the following meeting transcription. Please strictly follow the provided template format.
+        prompt = f"""Please generate a professional meeting minutes based on the following {source}. Please strictly follow the provided template format.
 
 Meeting Title: {meeting_title}
 
-Transcription Content:
+{source_label}:
 {transcription_text}
 
 Please generate the meeting minutes according to the following template format:
@@ -237,12 +280,36 @@ Requirements:
     
     return prompt
 
-def call_deepseek_api(prompt: str) -> Dict[str, Any]:
+def call_deepseek_api(
+    prompt: str,
+    on_delta: Optional[DeltaCallback] = None,
+    max_tokens: int = 4000
+) -> Dict[str, Any]:
+    """
+    调用DeepSeek API（同步接口，请求在进程共享的事件循环上执行）
+    
+    Args:
+        prompt: 提示词
+        on_delta: 增量文本回调，指定时以流式方式调用
+        max_tokens: 输出token上限
+        
+    Returns:
+        API响应结果
+    """
+    return async_runtime.run(call_deepseek_api_async(prompt, on_delta=on_delta, max_tokens=max_tokens))
+
+async def call_deepseek_api_async(
+    prompt: str,
+    on_delta: Optional[DeltaCallback] = None,
+    max_tokens: int = 4000
+) -> Dict[str, Any]:
     """
     调用DeepSeek API
     
     Args:
         prompt: 提示词
+        on_delta: 增量文本回调，指定时以流式方式（SSE）调用，每收到一段思考过程或正文即回调
+        max_tokens: 输出token上限
         
     Returns:
         API响应结果
@@ -261,10 +328,10 @@ def call_deepseek_api(prompt: str) -> Dict[str, Any]:
                     "content": prompt
                 }
             ],
-            "max_tokens": 4000,
+            "max_tokens": max_tokens,
             "temperature": 0.3,
             "top_p": 0.9,
-            "stream": False
+            "stream": on_delta is not None
         }
         
         # 设置请求头
@@ -273,33 +340,36 @@ def call_deepseek_api(prompt: str) -> Dict[str, Any]:
             "Authorization": f"Bearer {settings.DEEPSEEK_API_KEY}"
         }
         
-        # 发送请求
-        with httpx.Client(timeout=60.0) as client:
-            response = client.post(
-                settings.DEEPSEEK_API_URL,
-                json=request_data,
-                headers=headers
-            )
-            
-            response.raise_for_status()
-            
-            # 解析响应
-            response_data = response.json()
-            
-            if "choices" not in response_data or not response_data["choices"]:
-                raise ValueError("API响应格式错误：缺少choices字段")
-            
-            choice = response_data["choices"][0]
-            if "message" not in choice:
-                raise ValueError("API响应格式错误：缺少message字段")
-            
-            return {
-                "content": choice["message"]["content"],
-                "model": response_data.get("model", "deepseek-chat"),
-                "usage": response_data.get("usage", {}),
-                "finish_reason": choice.get("finish_reason", "unknown")
-            }
-            
+        # 发送请求（复用进程内共享的长连接客户端）
+        client = deepseek_client.get_client()
+        if on_delta is not None:
+            return await _stream_chat_completion(client, request_data, headers, on_delta)
+        
+        response = await client.post(
+            settings.DEEPSEEK_API_URL,
+            json=request_data,
+            headers=headers
+        )
+        
+        response.raise_for_status()
+        
+        # 解析响应
+        response_data = response.json()
+        
+        if "choices" not in response_data or not response_data["choices"]:
+            raise ValueError("API响应格式错误：缺少choices字段")
+        
+        choice = response_data["choices"][0]
+        if "message" not in choice:
+            raise ValueError("API响应格式错误：缺少message字段")
+        
+        return {
+            "content": choice["message"]["content"],
+            "model": response_data.get("model", "deepseek-chat"),
+            "usage": response_data.get("usage", {}),
+            "finish_reason": choice.get("finish_reason", "unknown")
+        }
+        
     except httpx.HTTPStatusError as e:
         error_detail = f"HTTP错误 {e.response.status_code}"
         try:
@@ -316,6 +386,208 @@ def call_deepseek_api(prompt: str) -> Dict[str, Any]:
     except Exception as e:
         raise Exception(f"DeepSeek API调用失败: {str(e)}")
 
+def should_map_reduce(transcription_text: str) -> bool:
+    """转录是否超出单次生成纪要的token预算，需要分段提炼后汇总"""
+    return bool(
+        settings.SUMMARY_MAP_REDUCE_ENABLED
+        and estimate_tokens(transcription_text) > settings.SUMMARY_SINGLE_PASS_MAX_TOKENS
+    )
+
+def _format_clock(seconds: Optional[float]) -> str:
+    """秒数格式化为 时:分:秒"""
+    seconds = int(seconds or 0)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+def _chunk_span(chunk: Dict[str, Any], chinese: bool) -> str:
+    """分段对应的时间范围（没有片段信息时为空）"""
+    if chunk["start"] is None:
+        return ""
+    if chinese:
+        return f"（{_format_clock(chunk['start'])}–{_format_clock(chunk['end'])}）"
+    return f" ({_format_clock(chunk['start'])}-{_format_clock(chunk['end'])})"
+
+def build_chunk_notes_prompt(
+    chunk: Dict[str, Any],
+    index: int,
+    total: int,
+    meeting_title: str,
+    chinese: bool
+) -> str:
+    """构建分段要点提炼的提示词（map阶段）"""
+    span = _chunk_span(chunk, chinese)
+    if chinese:
+        return f"""以下是会议「{meeting_title}」录音转录的第{index}/{total}部分{span}。请提炼这一部分的要点，供之后汇总成完整的会议纪要：
+
+- 讨论的议题及主要观点
+- 做出的决定
+- 待办事项（负责人、期限）
+- 提到的参会人员、单位、时间和地点
+
+只依据本部分内容，不要编造；使用简洁的条目，不需要套用会议纪要模板。
+
+转录内容：
+{chunk['text']}
+"""
+    return f"""The following is part {index}/{total}{span} of the transcription of the meeting "{meeting_title}". Extract the key points of this part so they can later be merged into complete meeting minutes:
+
+- Topics discussed and main points
+- Decisions made
+- Action items (owner, deadline)
+- Participants, organizations, times and places mentioned
+
+Use only the content of this part and do not invent anything. Use concise bullet points; do not apply the minutes template.
+
+Transcription Content:
+{chunk['text']}
+"""
+
+def build_merge_notes_prompt(notes: List[str], meeting_title: str, chinese: bool) -> str:
+    """构建合并相邻分段要点的提示词（分段过多、要点仍超出预算时的中间汇总）"""
+    joined = "\n\n".join(notes)
+    if chinese:
+        return f"""以下是会议「{meeting_title}」中连续几个部分按时间顺序提炼的要点。请合并为一份按时间顺序排列的要点：去除重复内容，保留全部决定和待办事项，使用简洁的条目。
+
+要点：
+{joined}
+"""
+    return f"""The following are chronological key points extracted from consecutive parts of the meeting "{meeting_title}". Merge them into one chronological list: remove duplicates, keep every decision and action item, and use concise bullet points.
+
+Key Points:
+{joined}
+"""
+
+def _add_usage(total: Dict[str, Any], usage: Dict[str, Any]) -> None:
+    """累加各次调用的token用量"""
+    for key, value in (usage or {}).items():
+        if isinstance(value, (int, float)):
+            total[key] = total.get(key, 0) + value
+
+async def summarize_map_reduce(
+    transcription_text: str,
+    segments: Optional[List[Dict[str, Any]]],
+    meeting_title: str,
+    language: str,
+    on_delta: Optional[DeltaCallback] = None
+) -> Dict[str, Any]:
+    """
+    分层生成会议纪要：按片段边界把转录切分为不超过SUMMARY_CHUNK_TOKENS的分段，并发提炼各段要点；
+    要点合计仍超出单次预算时逐层合并相邻要点，最后按纪要模板汇总（仅最后一步流式输出正文）
+    
+    Returns:
+        与call_deepseek_api相同结构的结果，附带分段统计
+    """
+    chinese = use_chinese_prompt(transcription_text, language)
+    chunks = plan_summary_chunks(transcription_text, segments, settings.SUMMARY_CHUNK_TOKENS)
+    semaphore = asyncio.Semaphore(settings.SUMMARY_MAP_CONCURRENCY)
+    usage: Dict[str, Any] = {}
+    done = 0
+    
+    async def complete(prompt: str, total: int, stage: str) -> str:
+        nonlocal done
+        async with semaphore:
+            response = await call_deepseek_api_async(prompt, max_tokens=settings.SUMMARY_MAP_MAX_TOKENS)
+        _add_usage(usage, response.get("usage"))
+        done += 1
+        if on_delta:
+            on_delta(REASONING, f"{stage} {done}/{total}\n")
+        return response["content"].strip()
+    
+    # map：并发提炼各分段要点，按时间顺序加上分段标题
+    notes = await asyncio.gather(*[
+        complete(
+            build_chunk_notes_prompt(chunk, index + 1, len(chunks), meeting_title, chinese),
+            len(chunks),
+            "分段要点提炼" if chinese else "Extracted notes"
+        )
+        for index, chunk in enumerate(chunks)
+    ])
+    notes = [
+        (f"## 第{index + 1}部分" if chinese else f"## Part {index + 1}") + f"{_chunk_span(chunk, chinese)}\n{note}"
+        for index, (chunk, note) in enumerate(zip(chunks, notes))
+    ]
+    
+    # 要点合计仍超出单次预算时，逐层合并相邻分段的要点
+    levels = 1
+    while len(notes) > 1 and estimate_tokens("\n\n".join(notes)) > settings.SUMMARY_SINGLE_PASS_MAX_TOKENS:
+        # 每次合并的输入与单次生成纪要使用相同的预算
+        groups = group_by_budget(notes, settings.SUMMARY_SINGLE_PASS_MAX_TOKENS)
+        if len(groups) == len(notes):
+            # 相邻要点两两相加都超出预算，无法继续合并
+            break
+        done = 0
+        merges = sum(1 for group in groups if len(group) > 1)
+        notes = await asyncio.gather(*[
+            complete(
+                build_merge_notes_prompt(group, meeting_title, chinese),
+                merges,
+                "合并要点" if chinese else "Merged notes"
+            ) if len(group) > 1
+            else asyncio.sleep(0, result=group[0])
+            for group in groups
+        ])
+        levels += 1
+    
+    # reduce：按纪要模板汇总，提示词语言与分段提示词一致（由原始转录决定）
+    prompt = build_summary_prompt("\n\n".join(notes), meeting_title, "zh" if chinese else language, from_notes=True)
+    response = await call_deepseek_api_async(prompt, on_delta=on_delta)
+    _add_usage(usage, response.get("usage"))
+    
+    return {
+        **response,
+        "usage": usage,
+        "map_reduce": {"chunks": len(chunks), "levels": levels}
+    }
+
+async def _stream_chat_completion(
+    client: httpx.AsyncClient,
+    request_data: Dict[str, Any],
+    headers: Dict[str, str],
+    on_delta: DeltaCallback
+) -> Dict[str, Any]:
+    """
+    流式调用：逐行解析SSE事件，回调增量文本，结束后返回与非流式调用相同结构的结果
+    """
+    content_parts = []
+    model = request_data["model"]
+    usage = {}
+    finish_reason = "unknown"
+    
+    async with client.stream("POST", settings.DEEPSEEK_API_URL, json=request_data, headers=headers) as response:
+        if response.is_error:
+            # 读取错误响应体，供调用方解析错误信息
+            await response.aread()
+        response.raise_for_status()
+        
+        async for line in response.aiter_lines():
+            # 只处理data事件，忽略空行与keep-alive注释
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            
+            chunk = json.loads(data)
+            model = chunk.get("model", model)
+            usage = chunk.get("usage") or usage
+            for choice in chunk.get("choices", []):
+                delta = choice.get("delta") or {}
+                if delta.get("reasoning_content"):
+                    on_delta(REASONING, delta["reasoning_content"])
+                if delta.get("content"):
+                    content_parts.append(delta["content"])
+                    on_delta(CONTENT, delta["content"])
+                finish_reason = choice.get("finish_reason") or finish_reason
+    
+    if not content_parts:
+        raise ValueError("API流式响应中没有正文内容")
+    
+    return {
+        "content": "".join(content_parts),
+        "model": model,
+        "usage": usage,
+        "finish_reason": finish_reason
+    }
+
 @celery_app.task(name="test_deepseek_connection")
 def test_deepseek_connection() -> Dict[str, Any]:
     """
@@ -4,36 +4,98 @@
 
 import os
 import shutil
+from collections import Counter
 from pathlib import Path
-from typing import Dict, Any
-from celery import current_task
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+from celery import current_task, chain, chord
+from celery.exceptions import Ignore
 from datetime import datetime
-import json
 
 from app.core.celery_app import celery_app
 from app.core.config import settings
-from app.tasks.ai_processing import generate_meeting_summary
+from app.services import file_index, pcm_cache, transcript_cache
+from app.services.audio_decode import load_audio, load_audio_clip
+from app.services.blob_storage import get_storage
+from app.services.model_cache import get_model_cache, publish_stats
+from app.services.redis_client import get_client as get_redis
+from app.services.result_store import save_result
+from app.services.segment_stream import append_segments, mark_complete
+from app.services.parallel_transcription import plan_time_chunks, stitch_segments
+from app.services.transcription_engines import get_engine
+from app.services.vad import SAMPLE_RATE, Timeline, remap_timestamp
+from app.tasks.ai_processing import generate_meeting_summary, should_map_reduce
+
+# 分块任务完成数计数器（用于汇总进度）
+CHUNKS_DONE_KEY_PREFIX = "meetmemo:chunks_done:"
+# 影响VAD剪辑结果、需要计入转录结果缓存key的配置
+VAD_SETTINGS = (
+    "VAD_ENERGY_MARGIN_DB",
+    "VAD_MIN_ENERGY_DB",
+    "VAD_SPEECH_BAND_RATIO",
+    "VAD_MIN_SPEECH_MS",
+    "VAD_MIN_SILENCE_MS",
+    "VAD_SPEECH_PAD_MS",
+    "VAD_MIN_SKIP_SECONDS",
+)
 
 @celery_app.task(bind=True, name="process_audio_task")
 def process_audio_task(self, file_path: str, file_info: Dict[str, Any]) -> Dict[str, Any]:
     """
     处理音频文件的主任务
     
+    超过CLUSTER_FANOUT_MIN_SECONDS的音频拆分为分块任务，以chord分发到transcription队列，
+    由集群中的多个Worker并行转录，回调任务合并转录结果后生成摘要。
+    相同内容、模型与选项的转录结果已缓存时（如摘要失败后重试）直接生成摘要，不再转录。
+    转录完成后当前任务由摘要任务链替换，摘要在ai_summary队列上生成，转录Worker不等待大模型响应。
+    
     Args:
-        file_path: 音频文件路径
-        file_info: 文件信息
+        file_path: 音频文件路径（共享存储下的本地路径）
+        file_info: 文件信息，含storage_key时从存储后端拉取音频
         
     Returns:
         处理结果
     """
     try:
+        file_index.update_file(file_info['file_id'], state='processing', task_id=self.request.id)
+        
+        whisper_model = file_info.get('whisper_model', settings.WHISPER_MODEL)
+        task_id = self.request.id
+        
+        # 转录结果已缓存时直接生成摘要，无需从存储后端拉取音频、加载模型或分发分块任务
+        cache_key = transcription_cache_key(
+            file_info.get('sha256'), whisper_model, file_info.get('engine'), file_info.get('language', 'auto')
+        )
+        cached_transcription = transcript_cache.get(cache_key) if cache_key else None
+        if cached_transcription is not None:
+            append_segments(task_id, cached_transcription['segments'])
+            mark_complete(task_id)
+            raise self.replace(build_summary_chain(file_info, {**cached_transcription, "transcript_cache": "hit"}))
+        
+        # 超长音频拆分到集群并行转录（当前任务由chord替换，结果仍记录在当前任务ID下）
+        if should_fan_out(file_info):
+            current_task.update_state(
+                state='PROGRESS',
+                meta={
+                    'progress': 10,
+                    'current_step': '分发分块转录任务',
+                    'total_steps': 4,
+                    'audio_duration': file_info.get('duration')
+                }
+            )
+            raise self.replace(build_fanout_chord(file_info, root_task_id=self.request.id))
+        
+        # 按存储key拉取音频，Worker无需与API共享上传目录
+        if file_info.get('storage_key'):
+            file_path = str(get_storage().fetch(file_info['storage_key']))
+        
         # 更新任务状态
         current_task.update_state(
             state='PROGRESS',
             meta={
                 'progress': 10,
                 'current_step': '初始化音频处理',
-                'total_steps': 4
+                'total_steps': 4,
+                'audio_duration': file_info.get('duration')
             }
         )
         
@@ -47,60 +109,105 @@ def process_audio_task(self, file_path: str, file_info: Dict[str, Any]) -> Dict[
                 "未检测到 ffmpeg，可执行文件不在 PATH。请安装 ffmpeg 并添加到系统 PATH 后重试。"
             )
         
-        # 加载Whisper模型
-        current_task.update_state(
-            state='PROGRESS',
-            meta={
-                'progress': 25,
-                'current_step': '加载Whisper模型',
-                'total_steps': 4
-            }
-        )
-        
-        # 使用用户选择的模型，如果没有指定则使用默认模型
-        whisper_model = file_info.get('whisper_model', settings.WHISPER_MODEL)
-        model = load_whisper_model(whisper_model)
-        
-        # 执行语音转录
+        # 执行语音转录（模型在转录结果缓存未命中时才加载）
         current_task.update_state(
             state='PROGRESS',
             meta={
                 'progress': 50,
                 'current_step': '执行语音转录',
-                'total_steps': 4
+                'total_steps': 4,
+                'audio_duration': file_info.get('duration')
             }
         )
         
+        # 已完成的片段增量发布到Redis，转录进行中即可通过 /api/tasks/{task_id}/segments 读取
+        # 使用用户选择的模型（未指定时为默认模型），在转录结果缓存未命中时加载
         transcription_result = transcribe_audio(
-            model=model,
+            model=None,
+            model_name=whisper_model,
             file_path=file_path,
-            language=file_info.get('language', 'auto')
+            language=file_info.get('language', 'auto'),
+            on_segments=(
+                (lambda segments: append_segments(task_id, segments))
+                if settings.TRANSCRIPT_STREAM_ENABLED else None
+            ),
+            engine=file_info.get('engine'),
+            duration=file_info.get('duration'),
+            content_hash=file_info.get('sha256')
         )
+        mark_complete(task_id)
         
-        # 生成AI摘要
-        current_task.update_state(
-            state='PROGRESS',
-            meta={
-                'progress': 75,
-                'current_step': '生成AI摘要',
-                'total_steps': 4
-            }
-        )
+        raise self.replace(build_summary_chain(file_info, transcription_result))
         
-        # 调用AI处理逻辑（同步执行，避免在任务内调用 .get() 阻塞）
-        summary_result = generate_meeting_summary.run(
+    except Ignore:
+        raise
+    except Exception as e:
+        # 记录错误并返回失败状态
+        error_msg = f"音频处理失败: {str(e)}"
+        try:
+            file_index.update_file(file_info['file_id'], state='failed', error=error_msg[:1024])
+        except Exception:
+            pass
+        # 不要使用 update_state 设置 FAILURE，直接抛出异常让 Celery 正确记录失败信息
+        raise Exception(error_msg)
+
+def build_summary_chain(file_info: Dict[str, Any], transcription_result: Dict[str, Any]):
+    """
+    构建摘要任务链并更新主任务进度：摘要任务进入ai_summary队列，由AI Worker调用大模型，
+    完成后由finalize_processing_task保存结果并更新文件索引
+    
+    用于替换当前任务（self.replace），任务链最后一步沿用当前任务ID，结果仍记录在主任务下。
+    """
+    current_task.update_state(
+        state='PROGRESS',
+        meta={
+            'progress': 75,
+            'current_step': '生成AI摘要',
+            'total_steps': 4,
+            'audio_duration': file_info.get('duration')
+        }
+    )
+    
+    return chain(
+        generate_meeting_summary.si(
             transcription_text=transcription_result['text'],
             meeting_title=file_info.get('meeting_title', '会议录音'),
-            language=file_info.get('language', 'auto')
-        )
+            language=file_info.get('language', 'auto'),
+            # 增量文本发布在主任务ID下，前端与转录片段一样按主任务ID读取
+            stream_task_id=current_task.request.id,
+            # 超长转录按片段边界分段摘要（只在需要分段时传递片段，减小消息体积）
+            segments=transcription_result['segments'] if should_map_reduce(transcription_result['text']) else None
+        ),
+        finalize_processing_task.s(file_info=file_info, transcription_result=transcription_result)
+    ).on_error(mark_processing_failed.s(file_id=file_info['file_id']))
+
+@celery_app.task(bind=True, name="finalize_processing_task")
+def finalize_processing_task(
+    self,
+    summary_result: Dict[str, Any],
+    file_info: Dict[str, Any],
+    transcription_result: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    摘要任务链的最后一步：保存结果并更新文件索引
+    
+    Args:
+        summary_result: generate_meeting_summary的返回值
+        file_info: 文件信息
+        transcription_result: 转录结果
         
+    Returns:
+        与process_audio_task一致的处理结果
+    """
+    try:
         # 完成处理
         current_task.update_state(
             state='PROGRESS',
             meta={
                 'progress': 100,
                 'current_step': '处理完成',
-                'total_steps': 4
+                'total_steps': 4,
+                'audio_duration': file_info.get('duration')
             }
         )
         
@@ -116,6 +223,14 @@ def process_audio_task(self, file_path: str, file_info: Dict[str, Any]) -> Dict[
         # 保存结果文件
         result_file_path = save_processing_result(file_info['file_id'], result_data)
         
+        # 更新文件索引，相同内容再次上传时可直接复用结果
+        file_index.update_file(
+            file_info['file_id'],
+            state='completed',
+            result_path=result_file_path,
+            error=None
+        )
+        
         return {
             "success": True,
             "file_id": file_info['file_id'],
@@ -126,90 +241,482 @@ def process_audio_task(self, file_path: str, file_info: Dict[str, Any]) -> Dict[
         }
         
     except Exception as e:
-        # 记录错误并返回失败状态
         error_msg = f"音频处理失败: {str(e)}"
-        # 不要使用 update_state 设置 FAILURE，直接抛出异常让 Celery 正确记录失败信息
+        try:
+            file_index.update_file(file_info['file_id'], state='failed', error=error_msg[:1024])
+        except Exception:
+            pass
         raise Exception(error_msg)
 
-def load_whisper_model(model_name: str = "base"):
+def should_fan_out(file_info: Dict[str, Any]) -> bool:
+    """音频是否足够长、需要拆分到集群中并行转录"""
+    duration = file_info.get('duration')
+    return bool(
+        settings.CLUSTER_FANOUT_ENABLED
+        and file_info.get('storage_key')
+        and duration
+        and duration >= settings.CLUSTER_FANOUT_MIN_SECONDS
+    )
+
+def build_fanout_chord(file_info: Dict[str, Any], root_task_id: str):
+    """构建分块转录chord：各分块任务进入transcription队列，全部完成后由回调合并"""
+    chunks = plan_time_chunks(
+        file_info['duration'],
+        settings.CLUSTER_CHUNK_SECONDS,
+        settings.TRANSCRIBE_CHUNK_OVERLAP_SECONDS
+    )
+    header = [
+        transcribe_chunk_task.s(
+            file_info=file_info,
+            chunk=chunk,
+            chunk_index=index,
+            total_chunks=len(chunks),
+            root_task_id=root_task_id
+        )
+        for index, chunk in enumerate(chunks)
+    ]
+    body = merge_transcription_chunks.s(file_info=file_info, chunks=chunks).on_error(
+        mark_processing_failed.s(file_id=file_info['file_id'])
+    )
+    return chord(header, body)
+
+def _report_chunk_progress(root_task_id: str, total_chunks: int, file_info: Dict[str, Any]) -> None:
+    """分块完成后更新主任务的进度（失败时忽略）"""
+    try:
+        client = get_redis()
+        key = CHUNKS_DONE_KEY_PREFIX + root_task_id
+        done = client.incr(key)
+        client.expire(key, settings.TASK_TIMEOUT)
+        celery_app.backend.store_result(
+            root_task_id,
+            {
+                'progress': 25 + int(50 * done / total_chunks),
+                'current_step': f'分块转录 {done}/{total_chunks}',
+                'total_steps': 4,
+                'audio_duration': file_info.get('duration')
+            },
+            'PROGRESS'
+        )
+    except Exception:
+        pass
+
+@celery_app.task(name="transcribe_chunk_task")
+def transcribe_chunk_task(
+    file_info: Dict[str, Any],
+    chunk: Dict[str, int],
+    chunk_index: int,
+    total_chunks: int,
+    root_task_id: str
+) -> Dict[str, Any]:
+    """
+    转录长音频中的一个分块
+    
+    Args:
+        file_info: 文件信息
+        chunk: 分块范围（采样点，含重叠部分）
+        chunk_index: 分块序号
+        total_chunks: 分块总数
+        root_task_id: 主任务ID（用于汇总进度）
+        
+    Returns:
+        映射到整段音频时间轴的片段
+    """
+    try:
+        clip_start = chunk['start'] / SAMPLE_RATE
+        # 已有解码缓存时直接从memmap中切出分块，无需拉取原文件和启动ffmpeg
+        cached = pcm_cache.open_cached(file_info['sha256']) if pcm_cache.is_enabled(file_info.get('sha256')) else None
+        if cached is not None:
+            audio = cached[chunk['start']:chunk['end']]
+        else:
+            file_path = str(get_storage().fetch(file_info['storage_key']))
+            audio = load_audio_clip(file_path, clip_start, (chunk['end'] - chunk['start']) / SAMPLE_RATE)
+        
+        # 只发布本分块负责范围内的片段，重叠部分由相邻分块发布
+        own_start = chunk['own_start'] / SAMPLE_RATE
+        own_end = chunk['own_end'] / SAMPLE_RATE
+        
+        def publish(segments: List[Dict[str, Any]]) -> None:
+            shifted = [
+                {**segment, "start": round(segment['start'] + clip_start, 3), "end": round(segment['end'] + clip_start, 3)}
+                for segment in segments
+            ]
+            append_segments(root_task_id, [
+                segment for segment in shifted
+                if own_start <= (segment['start'] + segment['end']) / 2 < own_end
+            ])
+        
+        model = load_whisper_model(
+            file_info.get('whisper_model', settings.WHISPER_MODEL),
+            engine=file_info.get('engine')
+        )
+        result = transcribe_audio(
+            model=model,
+            file_path=audio,
+            language=file_info.get('language', 'auto'),
+            on_segments=publish if settings.TRANSCRIPT_STREAM_ENABLED else None,
+            engine=file_info.get('engine')
+        )
+        
+        _report_chunk_progress(root_task_id, total_chunks, file_info)
+        
+        return {
+            "chunk_index": chunk_index,
+            "language": result['language'],
+            "segments": [
+                {
+                    "start": round(segment['start'] + clip_start, 3),
+                    "end": round(segment['end'] + clip_start, 3),
+                    "text": segment['text']
+                }
+                for segment in result['segments']
+            ],
+            "vad": result.get('vad')
+        }
+        
+    except Exception as e:
+        raise Exception(f"分块 {chunk_index + 1}/{total_chunks} 转录失败: {str(e)}")
+
+@celery_app.task(bind=True, name="merge_transcription_chunks")
+def merge_transcription_chunks(
+    self,
+    chunk_results: List[Dict[str, Any]],
+    file_info: Dict[str, Any],
+    chunks: List[Dict[str, int]]
+) -> Dict[str, Any]:
+    """
+    chord回调：合并各分块的转录结果（去掉重叠部分的重复片段），然后生成摘要并保存
+    
+    Args:
+        chunk_results: 各分块任务的返回值
+        file_info: 文件信息
+        chunks: 分块范围
+        
+    Returns:
+        与process_audio_task一致的处理结果
+    """
+    try:
+        mark_complete(self.request.id)
+        chunk_results = sorted(chunk_results, key=lambda result: result['chunk_index'])
+        segments = stitch_segments(chunks, [result['segments'] for result in chunk_results])
+        
+        # 各分块独立检测语言，按片段数取多数
+        languages = Counter()
+        for result in chunk_results:
+            languages[result['language']] += len(result['segments']) or 1
+        language = languages.most_common(1)[0][0] if languages else "unknown"
+        
+        transcription_result = {
+            "text": join_segment_texts([segment['text'] for segment in segments], language),
+            "language": language,
+            "segments": segments,
+            "duration": segments[-1]['end'] if segments else 0,
+            "fanout": {"chunks": len(chunks)}
+        }
+        
+        cache_key = transcription_cache_key(
+            file_info.get('sha256'),
+            file_info.get('whisper_model', settings.WHISPER_MODEL),
+            file_info.get('engine'),
+            file_info.get('language', 'auto')
+        )
+        if cache_key:
+            transcript_cache.put(cache_key, transcription_result)
+        
+        raise self.replace(build_summary_chain(file_info, transcription_result))
+        
+    except Ignore:
+        raise
+    except Exception as e:
+        error_msg = f"音频处理失败: {str(e)}"
+        try:
+            file_index.update_file(file_info['file_id'], state='failed', error=error_msg[:1024])
+        except Exception:
+            pass
+        raise Exception(error_msg)
+
+@celery_app.task(name="mark_processing_failed")
+def mark_processing_failed(request, exc, traceback, file_id: str) -> None:
+    """chord中的分块任务失败时，将文件索引标记为失败"""
+    file_index.update_file(file_id, state='failed', error=f"音频处理失败: {str(exc)}"[:1024])
+
+def resolve_whisper_device() -> str:
+    """优先使用配置的设备，如果配置为cuda但不可用则回退到cpu"""
+    if settings.WHISPER_DEVICE != "cuda":
+        return "cpu"
+    try:
+        import torch
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    except ImportError:
+        # 仅安装faster-whisper时没有PyTorch
+        import ctranslate2
+        return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+
+def load_whisper_model(model_name: str = "base", engine: Optional[str] = None):
     """
     加载Whisper模型
     
+    模型按(模型名, 设备, 引擎)缓存在Worker进程内，同一模型的后续任务直接复用。
+    
     Args:
         model_name: 模型名称
+        engine: 转录引擎（whisper/faster-whisper，默认使用TRANSCRIBE_ENGINE配置）
         
     Returns:
         加载的模型
     """
     try:
-        # 导入whisper和torch（延迟导入）
-        import whisper
-        import torch
+        transcription_engine = get_engine(engine)
         
         # 设置设备
-        # 优先使用配置的设备，如果配置为cuda但不可用则回退到cpu
-        if settings.WHISPER_DEVICE == "cuda" and torch.cuda.is_available():
-            device = "cuda"
-        else:
-            device = "cpu"
+        device = resolve_whisper_device()
         
-        # 确保模型目录存在
-        models_dir = Path(settings.WHISPER_MODELS_DIR)
-        models_dir.mkdir(exist_ok=True)
-        
-        # 加载模型
-        model = whisper.load_model(
+        # 加载模型（命中缓存时跳过）
+        model = get_model_cache().get(
             model_name,
-            device=device,
-            download_root=str(models_dir)
+            device,
+            loader=lambda: transcription_engine.load(model_name, device),
+            engine=transcription_engine.name
         )
+        publish_stats()
         
         return model
         
     except Exception as e:
         raise Exception(f"加载Whisper模型失败: {str(e)}")
 
-def transcribe_audio(model, file_path: str, language: str = "auto") -> Dict[str, Any]:
+def transcription_cache_key(
+    content_hash: Optional[str],
+    model_name: Optional[str],
+    engine: Optional[str] = None,
+    language: str = "auto",
+    use_vad: Optional[bool] = None
+) -> Optional[str]:
+    """
+    转录结果缓存key：内容哈希、模型、引擎、语言以及影响输出的解码选项
+    
+    Returns:
+        缓存key，未启用缓存或缺少内容哈希/模型名时返回None
+    """
+    if not (settings.TRANSCRIPT_CACHE_ENABLED and content_hash and model_name):
+        return None
+    
+    transcription_engine = get_engine(engine)
+    vad_enabled = settings.VAD_ENABLED if use_vad is None else use_vad
+    options = {"vad": vad_enabled, **transcription_engine.decode_options(model_name, resolve_whisper_device())}
+    if vad_enabled:
+        options.update({name.lower(): getattr(settings, name) for name in VAD_SETTINGS})
+    return transcript_cache.make_key(content_hash, model_name, transcription_engine.name, language, options)
+
+def _format_segments(segments: List[Dict[str, Any]], offsets: Optional[Timeline], time_offset: float = 0.0) -> List[Dict[str, Any]]:
+    """将模型输出的片段时间戳映射回原始音频时间轴（time_offset为所在窗口的起点）"""
+    return [
+        {
+            "start": round(remap_timestamp(segment["start"], offsets) + time_offset, 3),
+            "end": round(remap_timestamp(segment["end"], offsets, is_end=True) + time_offset, 3),
+            "text": segment["text"].strip()
+        }
+        for segment in segments
+    ]
+
+def join_segment_texts(texts: List[str], language: str) -> str:
+    """拼接各部分文本，中日韩文本之间不加空格"""
+    separator = "" if language in ("zh", "ja", "ko") else " "
+    return separator.join(text for text in texts if text)
+
+def should_stream_decode(duration: Optional[float]) -> bool:
+    """是否流式解码（已知时长且足够长的音频，避免整段PCM驻留内存）"""
+    return bool(settings.STREAM_DECODE_ENABLED and duration and duration >= settings.STREAM_DECODE_MIN_SECONDS)
+
+def _transcribe_waveform(
+    transcription_engine,
+    model,
+    audio,
+    language: Optional[str],
+    vad_enabled: bool,
+    on_segments: Optional[Callable[[List[Dict[str, Any]]], None]],
+    time_offset: float = 0.0
+) -> Dict[str, Any]:
+    """对一段波形执行VAD与转录，片段映射到原始音频时间轴"""
+    # 语音活动检测：静音部分不送入模型，减少计算并避免在静音处产生幻觉文本
+    vad_report = None
+    offsets = None
+    if vad_enabled:
+        from app.services.vad import apply_vad
+        
+        waveform = audio
+        vad_result = apply_vad(waveform)
+        vad_report = {
+            "total_seconds": vad_result["total_seconds"],
+            "speech_seconds": vad_result["speech_seconds"],
+            "skipped_seconds": vad_result["skipped_seconds"],
+            "speech_regions": vad_result["regions"],
+            "applied": False
+        }
+        # 未检测到语音时按原音频转录，跳过的静音太短时也不剪辑
+        if vad_result["regions"] and vad_result["skipped_seconds"] >= settings.VAD_MIN_SKIP_SECONDS:
+            audio = vad_result["audio"]
+            offsets = vad_result["offsets"]
+            vad_report["applied"] = True
+        else:
+            audio = waveform
+            vad_report["skipped_seconds"] = 0.0
+    
+    publish = None
+    if on_segments:
+        def publish(raw_segments: List[Dict[str, Any]]) -> None:
+            on_segments(_format_segments(raw_segments, offsets, time_offset))
+    
+    # 执行转录
+    result = transcription_engine.transcribe(model, audio, language=language, on_segments=publish)
+    
+    return {
+        "text": result["text"].strip(),
+        "language": result.get("language", "unknown"),
+        "segments": _format_segments(result.get("segments", []), offsets, time_offset),
+        "vad": vad_report,
+        "parallel": result.get("parallel"),
+        "batched": result.get("batched")
+    }
+
+def _transcribe_streaming(
+    transcription_engine,
+    model,
+    audio_windows: Iterator[Tuple[float, Any]],
+    language: Optional[str],
+    vad_enabled: bool,
+    on_segments: Optional[Callable[[List[Dict[str, Any]]], None]]
+) -> Dict[str, Any]:
+    """按窗口依次转录（窗口来自后台解码的环形缓冲区）"""
+    texts = []
+    segments = []
+    vad_report = None
+    windows = 0
+    for offset, audio in audio_windows:
+        part = _transcribe_waveform(
+            transcription_engine, model, audio, language, vad_enabled, on_segments, time_offset=offset
+        )
+        windows += 1
+        # 首个有语音的窗口确定语言，后续窗口沿用
+        if language is None and part["segments"]:
+            language = part["language"]
+        texts.append(part["text"])
+        segments.extend(part["segments"])
+        
+        if part["vad"]:
+            if vad_report is None:
+                vad_report = {key: 0 for key in ("total_seconds", "speech_seconds", "skipped_seconds", "speech_regions")}
+                vad_report["applied"] = False
+            for key in ("total_seconds", "speech_seconds", "skipped_seconds", "speech_regions"):
+                vad_report[key] = round(vad_report[key] + part["vad"][key], 3)
+            vad_report["applied"] = vad_report["applied"] or part["vad"]["applied"]
+    
+    language = language or "unknown"
+    return {
+        "text": join_segment_texts(texts, language),
+        "language": language,
+        "segments": segments,
+        "vad": vad_report,
+        "streamed": {"windows": windows, "window_seconds": settings.STREAM_DECODE_WINDOW_SECONDS}
+    }
+
+def transcribe_audio(
+    model,
+    file_path: str,
+    language: str = "auto",
+    use_vad: Optional[bool] = None,
+    on_segments: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    engine: Optional[str] = None,
+    duration: Optional[float] = None,
+    content_hash: Optional[str] = None,
+    model_name: Optional[str] = None
+) -> Dict[str, Any]:
     """
     转录音频文件
     
+    启用VAD时先剪掉长时间静音再转录，片段时间戳映射回原始音频时间轴。
+    具体的推理方式由转录引擎决定（见transcription_engines），结果结构与引擎无关。
+    超过STREAM_DECODE_MIN_SECONDS且没有解码缓存的音频边解码边按窗口转录，内存占用与音频时长无关。
+    指定content_hash时首次解码的PCM写入解码缓存，之后的转录通过memmap零拷贝读取，不再解码；
+    同时指定model_name时先查转录结果缓存，命中则直接返回，未命中时转录后写入缓存。
+    指定on_segments时每完成一部分即以已完成的片段回调。
+    
     Args:
-        model: Whisper模型
-        file_path: 音频文件路径
+        model: load_whisper_model返回的模型（须与engine一致），为None时按model_name在缓存未命中后加载
+        file_path: 音频文件路径（或16kHz单声道float32波形，用于预热）
         language: 语言代码
+        use_vad: 是否跳过静音（默认使用VAD_ENABLED配置）
+        on_segments: 增量片段回调（片段已映射到原始时间轴）
+        engine: 转录引擎（默认使用TRANSCRIBE_ENGINE配置）
+        duration: 音频时长（上传时探测得到，用于决定是否流式解码）
+        content_hash: 文件内容哈希（用于解码缓存与转录结果缓存）
+        model_name: 模型名称（用于转录结果缓存）
         
     Returns:
         转录结果
     """
     try:
-        # 检查模型设备
-        device = next(model.parameters()).device
-        is_cuda = device.type == "cuda"
-
-        # 设置转录选项
-        options = {
-            "fp16": is_cuda,  # 在GPU上使用fp16，CPU上使用fp32
-            "language": None if language == "auto" else language,
-            "task": "transcribe"
-        }
-        
-        # 执行转录
-        result = model.transcribe(file_path, **options)
+        transcription_engine = get_engine(engine)
+        vad_enabled = settings.VAD_ENABLED if use_vad is None else use_vad
+        language_code = None if language == "auto" else language
+        
+        cache_key = None
+        if isinstance(file_path, str):
+            cache_key = transcription_cache_key(content_hash, model_name, engine, language, vad_enabled)
+        if cache_key:
+            cached_result = transcript_cache.get(cache_key)
+            if cached_result is not None:
+                if on_segments and cached_result["segments"]:
+                    on_segments(cached_result["segments"])
+                return {**cached_result, "transcript_cache": "hit"}
+        
+        if model is None:
+            model = load_whisper_model(model_name or settings.WHISPER_MODEL, engine=engine)
+        
+        use_pcm_cache = isinstance(file_path, str) and pcm_cache.is_enabled(content_hash)
+        cached_pcm = pcm_cache.open_cached(content_hash) if use_pcm_cache else None
+        
+        if not isinstance(file_path, str):
+            result = _transcribe_waveform(transcription_engine, model, file_path, language_code, vad_enabled, on_segments)
+        elif cached_pcm is None and should_stream_decode(duration):
+            from app.services.audio_stream import StreamingDecoder
+            
+            # 后台解码的同时将PCM写入解码缓存
+            with StreamingDecoder(
+                file_path,
+                settings.STREAM_DECODE_BUFFER_SECONDS,
+                cache_key=content_hash if use_pcm_cache else None,
+                read_timeout=settings.STREAM_DECODE_READ_TIMEOUT_SECONDS
+            ) as decoder:
+                result = _transcribe_streaming(
+                    transcription_engine, model, decoder.windows(settings.STREAM_DECODE_WINDOW_SECONDS),
+                    language_code, vad_enabled, on_segments
+                )
+        else:
+            # 已有解码缓存时整段memmap交给引擎（由页缓存承载，不占进程内存），长音频仍可并行分块转录
+            # 解码为16kHz波形（VAD与各引擎都直接处理波形）
+            audio = cached_pcm
+            if audio is None:
+                audio = load_audio(file_path)
+                if use_pcm_cache:
+                    pcm_cache.store(content_hash, audio)
+            result = _transcribe_waveform(transcription_engine, model, audio, language_code, vad_enabled, on_segments)
         
         # 格式化结果
+        segments = result["segments"]
         transcription_result = {
-            "text": result["text"].strip(),
-            "language": result.get("language", "unknown"),
-            "segments": [
-                {
-                    "start": segment["start"],
-                    "end": segment["end"],
-                    "text": segment["text"].strip()
-                }
-                for segment in result.get("segments", [])
-            ],
-            "duration": result.get("segments", [])[-1]["end"] if result.get("segments") else 0
+            "text": result["text"],
+            "language": result["language"],
+            "segments": segments,
+            "duration": segments[-1]["end"] if segments else 0,
+            "engine": transcription_engine.name
         }
+        for key in ("vad", "parallel", "batched", "streamed"):
+            if result.get(key) is not None:
+                transcription_result[key] = result[key]
+        if cache_key:
+            transcript_cache.put(cache_key, transcription_result)
+        if use_pcm_cache:
+            transcription_result["pcm_cache"] = "hit" if cached_pcm is not None else "miss"
         
         return transcription_result
         
@@ -225,20 +732,10 @@ def save_processing_result(file_id: str, result_data: Dict[str, Any]) -> str:
         result_data: 结果数据
         
     Returns:
-        结果文件路径
+        结果文件的存储key
     """
     try:
-        # 创建结果目录
-        results_dir = Path(settings.UPLOAD_DIR) / "results"
-        results_dir.mkdir(exist_ok=True)
-        
-        # 保存结果文件
-        result_file_path = results_dir / f"{file_id}_result.json"
-        
-        with open(result_file_path, 'w', encoding='utf-8') as f:
-            json.dump(result_data, f, ensure_ascii=False, indent=2)
-        
-        return str(result_file_path)
+        return save_result(file_id, result_data)
         
     except Exception as e:
         raise Exception(f"保存处理结果失败: {str(e)}")
@@ -257,19 +754,24 @@ def cleanup_temp_files(file_path: str, keep_result: bool = True) -> Dict[str, An
     """
     try:
         cleaned_files = []
+        storage = get_storage()
+        
+        file_id = Path(file_path).stem.split('_')[0]
+        record = file_index.get_file(file_id)
         
         # 删除原始音频文件
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            cleaned_files.append(file_path)
+        audio_key = record["audio_path"] if record and record["audio_path"] else file_path
+        if storage.exists(audio_key):
+            storage.delete(audio_key)
+            cleaned_files.append(audio_key)
+        file_index.update_file(file_id, audio_path=None)
         
         # 如果不保留结果，也删除结果文件
         if not keep_result:
-            file_id = Path(file_path).stem.split('_')[0]
-            result_file = Path(settings.UPLOAD_DIR) / "results" / f"{file_id}_result.json"
-            if result_file.exists():
-                result_file.unlink()
-                cleaned_files.append(str(result_file))
+            if record and record["result_path"] and storage.exists(record["result_path"]):
+                storage.delete(record["result_path"])
+                cleaned_files.append(record["result_path"])
+            file_index.delete_file(file_id)
         
         return {
             "success": True,
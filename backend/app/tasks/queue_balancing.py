@@ -0,0 +1,37 @@
+"""
+模型队列负载均衡任务
+"""
+
+from typing import Dict, Any
+from datetime import datetime
+
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.services.queue_balancer import rebalance, request_rebalance
+
+@celery_app.task(name="rebalance_model_queues")
+def rebalance_model_queues() -> Dict[str, Any]:
+    """
+    定期检查各模型队列积压情况，让空闲Worker临时分担积压的模型队列，
+    积压清空后取消临时订阅
+
+    Returns:
+        均衡结果
+    """
+    try:
+        stats = rebalance()
+        if stats["unassigned_queues"]:
+            # 暂无空闲Worker可分配，稍后重试（不依赖beat）
+            request_rebalance(countdown=settings.MODEL_QUEUE_REBALANCE_INTERVAL_SECONDS)
+        return {
+            "success": True,
+            **stats,
+            "rebalance_time": datetime.utcnow().isoformat()
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "rebalance_time": datetime.utcnow().isoformat()
+        }
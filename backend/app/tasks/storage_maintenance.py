@@ -0,0 +1,33 @@
+"""
+存储维护任务
+"""
+
+from typing import Dict, Any
+from datetime import datetime
+
+from app.core.celery_app import celery_app
+from app.services.retention import run_sweep
+
+@celery_app.task(name="sweep_storage")
+def sweep_storage() -> Dict[str, Any]:
+    """
+    定期清理上传目录：按TTL删除过期音频、结果和未完成的上传会话，
+    磁盘空间不足时按LRU淘汰已有结果的原始音频
+    
+    Returns:
+        清理结果
+    """
+    try:
+        stats = run_sweep()
+        return {
+            "success": True,
+            **stats,
+            "sweep_time": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "sweep_time": datetime.utcnow().isoformat()
+        }
@@ -0,0 +1,218 @@
+"""
+Worker生命周期钩子
+Worker进程启动时预加载配置的Whisper模型并用合成音频预热推理，完成后才开始接收任务并上报就绪
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Any, List
+
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown, worker_shutdown
+from celery.utils.log import get_logger
+
+from app.core.celery_app import model_queue, AUDIO_PROCESSING_QUEUE
+from app.core.config import settings, WHISPER_MODEL_SIZES
+from app.services import async_runtime, deepseek_client, parallel_transcription
+from app.services.model_cache import get_model_cache, worker_id
+from app.services.redis_client import get_client
+
+logger = get_logger(__name__)
+
+# Worker就绪标记在Redis中的key前缀
+READY_KEY_PREFIX = "meetmemo:worker_ready:"
+
+# Worker角色（由celery_worker.py设置）：AI Worker只处理摘要队列，不加载Whisper模型
+WORKER_ROLE_ENV = "MEETMEMO_WORKER_ROLE"
+AI_WORKER_ROLE = "ai"
+AI_QUEUES = ["ai_summary"]
+
+# 预热音频时长（秒），Whisper采样率16kHz
+WARMUP_SECONDS = 2
+WHISPER_SAMPLE_RATE = 16000
+
+
+def get_preload_models() -> List[str]:
+    """
+    获取需要预加载的模型列表
+
+    WHISPER_PRELOAD_MODELS为逗号分隔的模型名，all表示全部模型，留空时只预加载默认模型WHISPER_MODEL
+    """
+    configured = [name.strip() for name in settings.WHISPER_PRELOAD_MODELS.split(",") if name.strip()]
+    if not configured:
+        return [settings.WHISPER_MODEL]
+    if "all" in configured:
+        return list(WHISPER_MODEL_SIZES.keys())
+    return [name for name in configured if name in WHISPER_MODEL_SIZES]
+
+
+def is_ai_worker() -> bool:
+    """当前进程是否为AI Worker"""
+    return os.environ.get(WORKER_ROLE_ENV) == AI_WORKER_ROLE
+
+
+def get_worker_queues() -> List[str]:
+    """
+    Worker订阅的队列：通用队列 + 预加载模型对应的专用音频队列
+
+    启用AI Worker时摘要队列只由AI Worker订阅，转录并发槽不会被等待大模型响应的任务占用。
+    """
+    queues = ["default", AUDIO_PROCESSING_QUEUE, "transcription"]
+    if not settings.AI_WORKER_ENABLED:
+        queues.extend(AI_QUEUES)
+    queues.extend(model_queue(name) for name in get_preload_models())
+    return list(dict.fromkeys(queues))
+
+
+def make_warmup_clip():
+    """生成预热用的合成音频（低幅度正弦波，16kHz单声道float32）"""
+    import numpy as np
+
+    t = np.arange(WARMUP_SECONDS * WHISPER_SAMPLE_RATE, dtype=np.float32) / WHISPER_SAMPLE_RATE
+    return (0.01 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+
+
+def preload_models() -> Dict[str, Any]:
+    """
+    预加载模型并执行一次预热推理
+
+    Returns:
+        每个模型的加载与预热耗时
+    """
+    from app.tasks.audio_processing import load_whisper_model, transcribe_audio
+
+    report = {}
+    for model_name in get_preload_models():
+        started = time.monotonic()
+        model = load_whisper_model(model_name)
+        loaded = time.monotonic()
+
+        if settings.WHISPER_WARMUP_ENABLED:
+            # 首次推理会触发算子初始化/显存分配，预热后正式任务不再承担这部分延迟
+            transcribe_audio(model=model, file_path=make_warmup_clip(), language="en", use_vad=False)
+
+        report[model_name] = {
+            "load_seconds": round(loaded - started, 2),
+            "warmup_seconds": round(time.monotonic() - loaded, 2),
+        }
+        logger.info("模型 %s 预加载完成: %s", model_name, report[model_name])
+
+    cached = {entry["model"] for entry in get_model_cache().stats()["models"]}
+    evicted = [name for name in report if name not in cached]
+    if evicted:
+        logger.warning("模型缓存预算不足，预加载的模型已被淘汰: %s", ", ".join(evicted))
+
+    return report
+
+
+def mark_ready(report: Dict[str, Any]) -> None:
+    """在Redis中记录当前Worker进程已就绪"""
+    get_client().set(
+        READY_KEY_PREFIX + worker_id(),
+        json.dumps({
+            "models": list(report.keys()),
+            "preload": report,
+            "ready_at": datetime.utcnow().isoformat(),
+        }),
+    )
+
+
+def clear_ready() -> None:
+    """移除当前Worker进程的就绪标记"""
+    try:
+        get_client().delete(READY_KEY_PREFIX + worker_id())
+    except Exception:
+        pass
+
+
+def list_ready_workers() -> Dict[str, Any]:
+    """列出已完成预热的Worker进程"""
+    client = get_client()
+    workers = {}
+    for key in client.scan_iter(match=READY_KEY_PREFIX + "*"):
+        value = client.get(key)
+        if value:
+            workers[key.decode("utf-8")[len(READY_KEY_PREFIX):]] = json.loads(value)
+    return workers
+
+
+def warm_up_worker() -> None:
+    """预加载并预热；失败时不阻止Worker启动，任务将按需加载模型"""
+    if not settings.WHISPER_PRELOAD_ENABLED or is_ai_worker():
+        return
+
+    try:
+        report = preload_models()
+    except Exception as e:
+        logger.error("模型预加载失败，将在任务中按需加载: %s", str(e))
+        report = {}
+
+    try:
+        mark_ready(report)
+    except Exception as e:
+        logger.warning("上报Worker就绪状态失败: %s", str(e))
+
+
+def handles_ai_queue() -> bool:
+    """当前Worker是否处理摘要队列（AI Worker，或未部署AI Worker时的音频Worker）"""
+    return is_ai_worker() or not settings.AI_WORKER_ENABLED
+
+
+def open_ai_client() -> None:
+    """创建DeepSeek共享客户端；失败时不阻止Worker启动，首次请求时再创建"""
+    if not handles_ai_queue():
+        return
+    try:
+        deepseek_client.open_client()
+    except Exception as e:
+        logger.warning("创建DeepSeek客户端失败: %s", str(e))
+
+
+def close_ai_client() -> None:
+    """关闭DeepSeek共享客户端与事件循环"""
+    try:
+        deepseek_client.close_client()
+    except Exception as e:
+        logger.warning("关闭DeepSeek客户端失败: %s", str(e))
+    async_runtime.shutdown()
+
+
+def _pool_name(worker) -> str:
+    pool_cls = getattr(worker, "pool_cls", "")
+    return pool_cls if isinstance(pool_cls, str) else getattr(pool_cls, "__module__", "")
+
+
+def _is_inline_pool(worker) -> bool:
+    """solo/threads池不会派生子进程，worker_process_init不会触发"""
+    name = _pool_name(worker)
+    return "solo" in name or "thread" in name
+
+
+@worker_init.connect
+def on_worker_init(sender=None, **kwargs) -> None:
+    if sender is not None and "thread" in _pool_name(sender):
+        # 多个任务在同一进程的线程中并发执行，不能再fork子进程并行转录
+        parallel_transcription.disable_fork()
+    if sender is not None and _is_inline_pool(sender):
+        warm_up_worker()
+        open_ai_client()
+
+
+@worker_process_init.connect
+def on_worker_process_init(**kwargs) -> None:
+    # prefork子进程在此钩子返回前不会接收任务
+    warm_up_worker()
+    open_ai_client()
+
+
+@worker_process_shutdown.connect
+def on_worker_process_shutdown(**kwargs) -> None:
+    clear_ready()
+    close_ai_client()
+
+
+@worker_shutdown.connect
+def on_worker_shutdown(**kwargs) -> None:
+    clear_ready()
+    close_ai_client()
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+Celery Beat启动脚本（定时执行存储清理等周期任务）
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from app.core.celery_app import celery_app
+
+if __name__ == "__main__":
+    # 设置环境变量
+    os.environ.setdefault("CELERY_APP", "app.core.celery_app:celery_app")
+    
+    # 启动Celery beat
+    celery_app.start(["beat", "--loglevel=info"])
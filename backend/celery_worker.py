@@ -12,24 +12,46 @@ project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
 from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.tasks.worker_lifecycle import get_worker_queues, WORKER_ROLE_ENV, AI_WORKER_ROLE, AI_QUEUES
 
 if __name__ == "__main__":
     # 设置环境变量
     os.environ.setdefault("CELERY_APP", "app.core.celery_app:celery_app")
     
+    # python celery_worker.py ai 启动AI Worker：只处理摘要队列，不加载Whisper模型
+    is_ai_worker = len(sys.argv) > 1 and sys.argv[1] == AI_WORKER_ROLE
+    if is_ai_worker:
+        os.environ[WORKER_ROLE_ENV] = AI_WORKER_ROLE
+    
     # 构建启动参数
-    argv = [
-        "worker",
-        "--loglevel=info",
-        "--queues=default,audio_processing,transcription,ai_summary",
-        "--hostname=worker@%h"
-    ]
+    if is_ai_worker:
+        argv = [
+            "worker",
+            "--loglevel=info",
+            f"--queues={','.join(AI_QUEUES)}",
+            "--hostname=ai@%h"
+        ]
+    else:
+        argv = [
+            "worker",
+            "--loglevel=info",
+            # 只订阅预加载模型的专用队列（WHISPER_PRELOAD_MODELS），其余模型的积压由均衡任务临时分配
+            f"--queues={','.join(get_worker_queues())}",
+            "--hostname=worker@%h"
+        ]
     
-    # Windows环境下必须使用 solo 池
-    if sys.platform == "win32":
+    if is_ai_worker:
+        # 大模型请求在进程共享的事件循环上等待响应，一个进程可同时保持数十个请求
+        argv.append(f"--pool={settings.AI_WORKER_POOL}")
+        argv.append(f"--concurrency={settings.AI_WORKER_CONCURRENCY}")
+    elif sys.platform == "win32":
+        # Windows环境下必须使用 solo 池
         argv.append("--pool=solo")
     else:
-        argv.append("--concurrency=2")
+        # threads池下多个任务共享同一进程中的模型，短音频的窗口可跨任务合批推理
+        argv.append(f"--pool={settings.AUDIO_WORKER_POOL}")
+        argv.append(f"--concurrency={settings.AUDIO_WORKER_CONCURRENCY}")
 
     # 启动Celery worker
     celery_app.worker_main(argv)
\ No newline at end of file
@@ -7,13 +7,13 @@
 import os
 import sys
 import asyncio
-import httpx
 from datetime import datetime
 
 # 添加项目路径
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from app.core.config import settings
+from app.services import deepseek_client
 
 async def call_deepseek_api(prompt: str) -> dict:
     """
@@ -26,38 +26,39 @@ async def call_deepseek_api(prompt: str) -> dict:
         API响应结果
     """
     try:
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                settings.DEEPSEEK_API_URL,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {settings.DEEPSEEK_API_KEY}"
-                },
-                json={
-                    "model": "deepseek-reasoner",
-                    "messages": [
-                        {
-                            "role": "system", 
-                            "content": "你是一个专业的会议纪要生成助手，能够根据提供的模板格式生成完整、规范的会议纪要文档。请严格按照模板的结构和格式要求生成内容。"
-                        },
-                        {
-                            "role": "user", 
-                            "content": prompt
-                        }
-                    ],
-                    "max_tokens": 4000,
-                    "temperature": 0.7,
-                    "top_p": 0.9
-                }
-            )
+        # 复用共享的长连接客户端（超时与连接池见DEEPSEEK_*配置）
+        client = deepseek_client.get_client()
+        response = await client.post(
+            settings.DEEPSEEK_API_URL,
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {settings.DEEPSEEK_API_KEY}"
+            },
+            json={
+                "model": "deepseek-reasoner",
+                "messages": [
+                    {
+                        "role": "system", 
+                        "content": "你是一个专业的会议纪要生成助手，能够根据提供的模板格式生成完整、规范的会议纪要文档。请严格按照模板的结构和格式要求生成内容。"
+                    },
+                    {
+                        "role": "user", 
+                        "content": prompt
+                    }
+                ],
+                "max_tokens": 4000,
+                "temperature": 0.7,
+                "top_p": 0.9
+            }
+        )
+        
+        if response.status_code == 200:
+            result = response.json()
+            content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
+            return {"success": True, "content": content}
+        else:
+            return {"success": False, "error": f"HTTP {response.status_code}: {response.text}"}
             
-            if response.status_code == 200:
-                result = response.json()
-                content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
-                return {"success": True, "content": content}
-            else:
-                return {"success": False, "error": f"HTTP {response.status_code}: {response.text}"}
-                
     except Exception as e:
         return {"success": False, "error": str(e)}
 
@@ -121,7 +122,10 @@ async def generate_meeting_minutes(meeting_topic: str = None, meeting_type: str
     print("⏳ 调用DeepSeek API生成内容...")
     
     # 调用API生成内容
-    result = await call_deepseek_api(prompt)
+    try:
+        result = await call_deepseek_api(prompt)
+    finally:
+        await deepseek_client.aclose()
     
     if result.get("success"):
         return result.get("content", "")
@@ -11,6 +11,7 @@ import os
 from pathlib import Path
 
 from app.core.config import settings
+from app.core.database import init_db
 from app.api import api_router
 
 # 创建FastAPI应用实例
@@ -38,6 +39,12 @@ upload_dir.mkdir(exist_ok=True)
 # 挂载静态文件服务
 app.mount("/uploads", StaticFiles(directory=str(upload_dir)), name="uploads")
 
+# 初始化数据库表
+@app.on_event("startup")
+async def startup_event():
+    """应用启动时创建数据表"""
+    init_db()
+
 # 注册API路由
 app.include_router(api_router, prefix="/api")
 
@@ -0,0 +1,17 @@
+"""
+测试用的替身对象
+"""
+
+from typing import Dict, List
+
+
+class FakeRequest:
+    """只提供请求头与流式请求体的请求对象"""
+
+    def __init__(self, body_chunks: List[bytes], headers: Dict[str, str]):
+        self.headers = headers
+        self._body_chunks = body_chunks
+
+    async def stream(self):
+        for chunk in self._body_chunks:
+            yield chunk
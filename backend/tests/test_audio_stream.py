@@ -0,0 +1,62 @@
+"""
+流式解码测试
+"""
+
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+from app.services import audio_stream
+from app.services.audio_stream import PcmRingBuffer, StreamingDecoder
+
+
+def test_ring_buffer_wraps_around():
+    """跨越缓冲区末尾的读写保持顺序"""
+    buffer = PcmRingBuffer(8)
+    samples = np.arange(20, dtype=np.float32)
+
+    writer = threading.Thread(target=lambda: (buffer.write(samples), buffer.finish()))
+    writer.start()
+    received = np.concatenate([buffer.read(6, timeout=5) for _ in range(4)])
+    writer.join()
+
+    np.testing.assert_array_equal(received, samples)
+
+
+def test_ring_buffer_read_times_out_without_data():
+    """解码端没有新数据时读取超时，而不是无限等待"""
+    buffer = PcmRingBuffer(8)
+
+    with pytest.raises(Exception, match="超时"):
+        buffer.read(4, timeout=0.05)
+
+
+def test_ring_buffer_reports_decode_error():
+    buffer = PcmRingBuffer(8)
+    buffer.finish("bad input")
+
+    with pytest.raises(Exception, match="bad input"):
+        buffer.read(4, timeout=1)
+
+
+def test_decoder_drains_stderr(monkeypatch, tmp_path):
+    """错误输出超过管道容量时解码仍能完成，失败信息取自错误输出末尾"""
+    script = (
+        "import sys\n"
+        "sys.stderr.write('x' * 1024 * 1024 + '\\n')\n"
+        "sys.stderr.write('tail message\\n')\n"
+        "sys.stdout.buffer.write(b'\\x00\\x01' * 32000)\n"
+        "sys.exit(1)\n"
+    )
+    real_popen = audio_stream.subprocess.Popen
+    monkeypatch.setattr(
+        audio_stream.subprocess,
+        "Popen",
+        lambda args, **kwargs: real_popen([sys.executable, "-c", script], **kwargs),
+    )
+
+    with StreamingDecoder(str(tmp_path / "input.wav"), buffer_seconds=1, read_timeout=10) as decoder:
+        with pytest.raises(Exception, match="tail message"):
+            list(decoder.windows(60))
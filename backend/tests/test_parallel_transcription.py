@@ -0,0 +1,55 @@
+"""
+并行分块转录的分块规划与拼接测试
+"""
+
+from app.services.parallel_transcription import plan_time_chunks, stitch_segments
+from app.services.vad import SAMPLE_RATE
+
+
+def test_plan_time_chunks_covers_audio_with_overlap():
+    chunks = plan_time_chunks(duration=2100, chunk_seconds=900, overlap_seconds=5)
+
+    assert [(c["own_start"], c["own_end"]) for c in chunks] == [
+        (0, 900 * SAMPLE_RATE),
+        (900 * SAMPLE_RATE, 1800 * SAMPLE_RATE),
+        (1800 * SAMPLE_RATE, 2100 * SAMPLE_RATE),
+    ]
+    assert chunks[0]["start"] == 0
+    assert chunks[1]["start"] == 895 * SAMPLE_RATE
+    assert chunks[1]["end"] == 1805 * SAMPLE_RATE
+    assert chunks[-1]["end"] == 2100 * SAMPLE_RATE
+
+
+def test_plan_time_chunks_merges_short_tail():
+    """最后一段不足四分之一分块时长时并入前一块"""
+    chunks = plan_time_chunks(duration=1900, chunk_seconds=900, overlap_seconds=0)
+
+    assert [(c["own_start"], c["own_end"]) for c in chunks] == [
+        (0, 900 * SAMPLE_RATE),
+        (900 * SAMPLE_RATE, 1900 * SAMPLE_RATE),
+    ]
+
+
+def test_plan_time_chunks_short_audio_is_one_chunk():
+    chunks = plan_time_chunks(duration=30, chunk_seconds=900, overlap_seconds=5)
+
+    assert chunks == [{"start": 0, "end": 30 * SAMPLE_RATE, "own_start": 0, "own_end": 30 * SAMPLE_RATE}]
+
+
+def test_stitch_segments_drops_overlap_duplicates():
+    """重叠区的片段只保留中点落在负责范围内的一份"""
+    chunks = plan_time_chunks(duration=20, chunk_seconds=10, overlap_seconds=2)
+    first = [
+        {"start": 0.0, "end": 4.0, "text": "a"},
+        {"start": 8.5, "end": 10.5, "text": "b"},
+        {"start": 10.5, "end": 11.8, "text": "c"},
+    ]
+    second = [
+        {"start": 8.2, "end": 9.0, "text": "b'"},
+        {"start": 10.4, "end": 11.9, "text": "c'"},
+        {"start": 12.0, "end": 15.0, "text": "d"},
+    ]
+
+    segments = stitch_segments(chunks, [first, second])
+
+    assert [segment["text"] for segment in segments] == ["a", "b", "c'", "d"]
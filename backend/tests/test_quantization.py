@@ -0,0 +1,56 @@
+"""
+Whisper动态int8量化测试（需要torch与openai-whisper）
+"""
+
+import pytest
+
+torch = pytest.importorskip("torch")
+whisper_model = pytest.importorskip("whisper.model")
+
+from app.services import quantization
+
+
+@pytest.fixture
+def fp32_model():
+    """结构与Whisper一致的小模型"""
+    dims = whisper_model.ModelDimensions(
+        n_mels=80, n_audio_ctx=8, n_audio_state=16, n_audio_head=2, n_audio_layer=1,
+        n_vocab=51865, n_text_ctx=8, n_text_state=16, n_text_head=2, n_text_layer=1,
+    )
+    model = whisper_model.Whisper(dims)
+    model.eval()
+    return model
+
+
+@pytest.fixture
+def models_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(quantization.settings, "WHISPER_MODELS_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_quantize_leaves_fp32_model_unchanged(fp32_model, models_dir):
+    """量化在副本上进行，模型缓存中共享的fp32模型保持原样"""
+    classes = {name: type(module) for name, module in fp32_model.named_modules()}
+    state = {name: tensor.clone() for name, tensor in fp32_model.state_dict().items()}
+
+    quantized = quantization.load_quantized("tiny", lambda: fp32_model)
+
+    assert {name: type(module) for name, module in fp32_model.named_modules()} == classes
+    for name, tensor in fp32_model.state_dict().items():
+        assert torch.equal(tensor, state[name]), name
+    assert any(isinstance(module, torch.ao.nn.quantized.dynamic.Linear) for module in quantized.modules())
+
+
+def test_cached_quantized_model_reloads(fp32_model, models_dir):
+    """第二次加载直接读取磁盘缓存，不再加载fp32模型，输出与首次量化一致"""
+    quantized = quantization.load_quantized("tiny", lambda: fp32_model)
+    assert quantization.quantized_model_path("tiny").exists()
+
+    def loader():
+        raise AssertionError("不应重新加载fp32模型")
+
+    reloaded = quantization.load_quantized("tiny", loader)
+
+    mel = torch.randn(1, 80, 16)
+    with torch.no_grad():
+        assert torch.allclose(quantized.encoder(mel), reloaded.encoder(mel))
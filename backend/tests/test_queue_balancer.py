@@ -0,0 +1,156 @@
+"""
+模型队列负载均衡测试
+"""
+
+import json
+from typing import Dict, List
+
+import pytest
+
+from app.services import queue_balancer
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values: Dict[str, object] = {}
+
+    def hgetall(self, key):
+        return {k.encode("utf-8"): v for k, v in self.values.get(key, {}).items()}
+
+    def hset(self, key, mapping):
+        self.values.setdefault(key, {}).update(mapping)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return False
+        self.values[key] = value
+        return True
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+
+class FakeInspect:
+    def __init__(self, queues: Dict[str, List[str]], active: Dict[str, list]):
+        self._queues = queues
+        self._active = active
+
+    def active_queues(self):
+        return {worker: [{"name": name} for name in names] for worker, names in self._queues.items()}
+
+    def active(self):
+        return self._active
+
+    def reserved(self):
+        return {}
+
+
+class FakeControl:
+    def __init__(self, inspect: FakeInspect):
+        self._inspect = inspect
+        self.added = []
+        self.cancelled = []
+
+    def inspect(self):
+        return self._inspect
+
+    def add_consumer(self, queue, destination):
+        self.added.append((queue, destination[0]))
+
+    def cancel_consumer(self, queue, destination):
+        self.cancelled.append((queue, destination[0]))
+
+
+@pytest.fixture
+def balancer(monkeypatch):
+    """以假的Redis与Celery控制接口运行rebalance"""
+    redis_client = FakeRedis()
+    sent = []
+    monkeypatch.setattr(queue_balancer, "get_client", lambda: redis_client)
+    monkeypatch.setattr(queue_balancer.settings, "MODEL_QUEUE_STEAL_THRESHOLD", 2)
+    monkeypatch.setattr(
+        queue_balancer.celery_app, "send_task", lambda name, countdown=0: sent.append((name, countdown))
+    )
+
+    def run(queues, depths, active=None):
+        control = FakeControl(FakeInspect(queues, active or {}))
+        monkeypatch.setattr(queue_balancer.celery_app, "control", control)
+        monkeypatch.setattr(
+            queue_balancer,
+            "get_queue_depths",
+            lambda names: {name: depths.get(name, 0) for name in names},
+        )
+        return queue_balancer.rebalance(), control
+
+    run.redis = redis_client
+    run.sent = sent
+    return run
+
+
+BASE_WORKER_QUEUES = ["default", "audio_processing", "transcription", "audio_processing.base"]
+
+
+def test_lone_job_in_unconsumed_queue_is_assigned(balancer):
+    """无人订阅的模型队列中只有一个任务时，也立即分配给空闲Worker"""
+    stats, control = balancer({"worker@a": BASE_WORKER_QUEUES}, {"audio_processing.large": 1})
+
+    assert control.added == [("audio_processing.large", "worker@a")]
+    assert stats["unassigned_queues"] == []
+    assert json.loads(balancer.redis.values[queue_balancer.STOLEN_QUEUES_KEY]["worker@a"]) == [
+        "audio_processing.large"
+    ]
+
+
+def test_lone_job_in_consumed_queue_waits_for_threshold(balancer):
+    """已有Worker订阅的队列未达到积压阈值时不窃取"""
+    queues = {
+        "worker@a": BASE_WORKER_QUEUES,
+        "worker@b": ["default", "audio_processing", "audio_processing.large"],
+    }
+    stats, control = balancer(queues, {"audio_processing.large": 1}, active={"worker@b": [{"id": "1"}]})
+
+    assert control.added == []
+    assert stats["unassigned_queues"] == []
+
+
+def test_unconsumed_queue_is_served_before_backlog(balancer):
+    """只有一个空闲Worker时，优先分配无人订阅的队列"""
+    queues = {
+        "worker@a": BASE_WORKER_QUEUES,
+        "worker@b": ["default", "audio_processing", "audio_processing.small"],
+    }
+    depths = {"audio_processing.small": 5, "audio_processing.turbo": 1}
+    stats, control = balancer(queues, depths, active={"worker@b": [{"id": "1"}]})
+
+    assert control.added == [("audio_processing.turbo", "worker@a")]
+
+
+def test_unassigned_queue_is_reported_when_no_worker_is_idle(balancer):
+    """没有空闲Worker时报告仍无人订阅的队列，供任务稍后重试"""
+    stats, control = balancer(
+        {"worker@a": BASE_WORKER_QUEUES}, {"audio_processing.turbo": 1}, active={"worker@a": [{"id": "1"}]}
+    )
+
+    assert control.added == []
+    assert stats["unassigned_queues"] == ["audio_processing.turbo"]
+
+
+def test_stolen_queue_is_released_once_drained(balancer):
+    """临时订阅的队列清空后取消订阅"""
+    balancer.redis.values[queue_balancer.STOLEN_QUEUES_KEY] = {"worker@a": json.dumps(["audio_processing.large"])}
+    queues = {"worker@a": BASE_WORKER_QUEUES + ["audio_processing.large"]}
+    stats, control = balancer(queues, {})
+
+    assert control.cancelled == [("audio_processing.large", "worker@a")]
+    assert queue_balancer.STOLEN_QUEUES_KEY not in balancer.redis.values
+
+
+def test_request_rebalance_sends_one_pending_request(balancer):
+    """同一时间只有一个待执行的均衡请求，均衡开始执行后可再次请求"""
+    queue_balancer.request_rebalance()
+    queue_balancer.request_rebalance()
+    assert balancer.sent == [("rebalance_model_queues", 0)]
+
+    balancer({"worker@a": BASE_WORKER_QUEUES}, {})
+    queue_balancer.request_rebalance(countdown=30)
+    assert balancer.sent[-1] == ("rebalance_model_queues", 30)
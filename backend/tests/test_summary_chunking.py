@@ -0,0 +1,54 @@
+"""
+摘要分段测试
+"""
+
+from app.services.summary_chunking import estimate_tokens, group_by_budget, plan_summary_chunks
+
+
+def segment(start, text):
+    return {"start": start, "end": start + 1, "text": text}
+
+
+def test_plan_summary_chunks_splits_between_segments():
+    segments = [segment(i, "今天讨论项目进度和下周安排。") for i in range(10)]
+    budget = estimate_tokens(segments[0]["text"]) * 3
+
+    chunks = plan_summary_chunks("", segments, budget)
+
+    assert len(chunks) == 4
+    assert all(estimate_tokens(chunk["text"]) <= budget for chunk in chunks)
+    assert [(chunk["start"], chunk["end"]) for chunk in chunks] == [(0, 3), (3, 6), (6, 9), (9, 10)]
+    assert "\n".join(chunk["text"] for chunk in chunks) == "\n".join(s["text"] for s in segments)
+
+
+def test_plan_summary_chunks_splits_oversized_segment():
+    """单个片段超出预算时在句末切分，各部分沿用该片段的时间范围"""
+    long_text = "第一句话说明背景。" * 20
+    segments = [segment(0, "开场。"), segment(5, long_text), segment(9, "结束。")]
+
+    chunks = plan_summary_chunks("", segments, budget=30)
+
+    assert all(estimate_tokens(chunk["text"]) <= 30 for chunk in chunks)
+    assert chunks[0] == {"text": "开场。", "start": 0, "end": 1}
+    assert {(chunk["start"], chunk["end"]) for chunk in chunks[1:-1]} == {(5, 6)}
+    assert "".join(chunk["text"] for chunk in chunks[1:-1]) == long_text
+    assert chunks[-1]["text"] == "结束。"
+
+
+def test_plan_summary_chunks_without_segments_uses_text():
+    text = "First point. Second point. Third point."
+
+    chunks = plan_summary_chunks(text, None, budget=6)
+
+    assert "".join(chunk["text"] for chunk in chunks) == text
+    assert all(chunk["start"] is None and chunk["end"] is None for chunk in chunks)
+    assert all(estimate_tokens(chunk["text"]) <= 6 for chunk in chunks)
+
+
+def test_group_by_budget_keeps_order():
+    texts = ["要点一" * 5, "要点二" * 5, "要点三" * 5, "要点四" * 20]
+    each = estimate_tokens(texts[0])
+
+    groups = group_by_budget(texts, budget=each * 2)
+
+    assert groups == [texts[:2], [texts[2]], [texts[3]]]
@@ -0,0 +1,84 @@
+"""
+转录结果缓存测试
+"""
+
+import os
+import time
+
+import pytest
+
+from app.services import transcript_cache
+
+TRANSCRIPTION = {"text": "你好", "language": "zh", "segments": [{"start": 0.0, "end": 1.0, "text": "你好"}]}
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(transcript_cache.settings, "TRANSCRIPT_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(transcript_cache.settings, "TRANSCRIPT_CACHE_TTL_SECONDS", 3600)
+    monkeypatch.setattr(transcript_cache.settings, "TRANSCRIPT_CACHE_MAX_BYTES", 1024 * 1024)
+    return tmp_path
+
+
+def make_key(**overrides):
+    options = {"content_hash": "a" * 64, "model_name": "base", "engine": "whisper", "language": "auto",
+               "options": {"vad": True}}
+    options.update(overrides)
+    return transcript_cache.make_key(**options)
+
+
+def test_make_key_depends_on_every_input():
+    key = make_key()
+
+    assert key == make_key()
+    assert key != make_key(content_hash="b" * 64)
+    assert key != make_key(model_name="small")
+    assert key != make_key(engine="faster-whisper")
+    assert key != make_key(language="zh")
+    assert key != make_key(options={"vad": False})
+
+
+def test_put_then_get():
+    key = make_key()
+    assert transcript_cache.get(key) is None
+
+    transcript_cache.put(key, TRANSCRIPTION)
+
+    assert transcript_cache.get(key) == TRANSCRIPTION
+
+
+def test_expired_entry_is_a_miss(monkeypatch):
+    key = make_key()
+    transcript_cache.put(key, TRANSCRIPTION)
+
+    later = time.time() + 7200
+    monkeypatch.setattr(transcript_cache.time, "time", lambda: later)
+
+    assert transcript_cache.get(key) is None
+    assert not transcript_cache.entry_path(key).exists()
+
+
+def test_corrupt_entry_is_a_miss():
+    key = make_key()
+    path = transcript_cache.entry_path(key)
+    path.parent.mkdir(parents=True)
+    path.write_text("{not json", encoding="utf-8")
+
+    assert transcript_cache.get(key) is None
+
+
+def test_evict_removes_least_recently_used():
+    keys = [make_key(model_name=name) for name in ("tiny", "base", "small")]
+    for index, key in enumerate(keys):
+        transcript_cache.put(key, TRANSCRIPTION)
+        os.utime(transcript_cache.entry_path(key), (1000 + index, time.time() - 100 + index))
+    # 读取后成为最近使用的条目
+    transcript_cache.get(keys[0])
+    kept_size = sum(transcript_cache.entry_path(key).stat().st_size for key in (keys[0], keys[2]))
+
+    removed = transcript_cache.evict(max_bytes=kept_size)
+
+    assert removed == 1
+    assert transcript_cache.get(keys[1]) is None
+    assert transcript_cache.get(keys[0]) == TRANSCRIPTION
+    assert transcript_cache.get(keys[2]) == TRANSCRIPTION
@@ -0,0 +1,88 @@
+"""
+可续传分块上传会话测试
+"""
+
+import asyncio
+
+import pytest
+
+from app.services import upload_sessions
+from app.services.upload_sessions import (
+    UploadSessionConflict,
+    UploadSessionError,
+    UploadSessionNotFound,
+)
+from tests.fakes import FakeRequest
+
+FILE_SIZE = 100
+
+
+@pytest.fixture
+def session(tmp_path):
+    return upload_sessions.create_session(str(tmp_path), FILE_SIZE, {"filename": "a.mp3"})
+
+
+def write(tmp_path, session, offset, body, content_length=None, max_chunk_size=64):
+    headers = {} if content_length is None else {"content-length": content_length}
+    request = FakeRequest([body[i:i + 10] for i in range(0, len(body), 10)], headers)
+    return asyncio.run(upload_sessions.write_chunk(
+        str(tmp_path), session["session_id"], offset, request, max_chunk_size=max_chunk_size, write_size=16
+    ))
+
+
+def test_write_chunk_out_of_order_then_finalize(tmp_path, session):
+    data = bytes(range(FILE_SIZE))
+
+    assert write(tmp_path, session, 60, data[60:]) == (60, 100)
+    assert write(tmp_path, session, 0, data[:60], content_length="60") == (0, 60)
+    assert upload_sessions.get_received_ranges(str(tmp_path), session["session_id"]) == [(0, 100)]
+
+    dest = tmp_path / "a.mp3"
+    upload_sessions.finalize_session(str(tmp_path), session["session_id"], dest)
+
+    assert dest.read_bytes() == data
+    with pytest.raises(UploadSessionNotFound):
+        upload_sessions.load_session(str(tmp_path), session["session_id"])
+
+
+@pytest.mark.parametrize("content_length", ["abc", "-1", "65"])
+def test_write_chunk_rejects_bad_content_length(tmp_path, session, content_length):
+    with pytest.raises(UploadSessionError):
+        write(tmp_path, session, 0, b"x" * 10, content_length=content_length)
+    assert upload_sessions.get_received_ranges(str(tmp_path), session["session_id"]) == []
+
+
+def test_write_chunk_rejects_body_past_end_of_file(tmp_path, session):
+    with pytest.raises(UploadSessionError):
+        write(tmp_path, session, 90, b"x" * 20)
+    assert upload_sessions.get_received_ranges(str(tmp_path), session["session_id"]) == []
+
+
+@pytest.mark.parametrize("offset", [-1, FILE_SIZE])
+def test_write_chunk_rejects_offset_out_of_range(tmp_path, session, offset):
+    with pytest.raises(UploadSessionError):
+        write(tmp_path, session, offset, b"x")
+
+
+def test_write_chunk_unknown_session(tmp_path):
+    with pytest.raises(UploadSessionNotFound):
+        write(tmp_path, {"session_id": "not-a-uuid"}, 0, b"x")
+
+
+def test_finalize_incomplete_session_can_retry(tmp_path, session):
+    write(tmp_path, session, 0, b"x" * 50)
+
+    with pytest.raises(UploadSessionError, match="尚未上传完整"):
+        upload_sessions.finalize_session(str(tmp_path), session["session_id"], tmp_path / "a.mp3")
+
+    write(tmp_path, session, 50, b"y" * 50)
+    upload_sessions.finalize_session(str(tmp_path), session["session_id"], tmp_path / "a.mp3")
+    assert (tmp_path / "a.mp3").read_bytes() == b"x" * 50 + b"y" * 50
+
+
+def test_finalize_while_another_finalize_is_running(tmp_path, session):
+    marker = upload_sessions.get_sessions_dir(str(tmp_path)) / session["session_id"] / "finalizing"
+    marker.touch()
+
+    with pytest.raises(UploadSessionConflict):
+        upload_sessions.finalize_session(str(tmp_path), session["session_id"], tmp_path / "a.mp3")
@@ -0,0 +1,143 @@
+"""
+上传流式写入测试
+"""
+
+import asyncio
+import hashlib
+import zipfile
+
+import pytest
+
+from app.services.upload_stream import (
+    UploadFormatError,
+    UploadTooLargeError,
+    extract_zip_members,
+    stream_multipart_files,
+)
+from tests.fakes import FakeRequest
+
+BOUNDARY = "testboundary"
+
+
+def multipart_body(parts):
+    """构造multipart请求体，parts为 (字段名, 文件名或None, 内容)"""
+    body = b""
+    for name, filename, content in parts:
+        disposition = f'form-data; name="{name}"'
+        if filename is not None:
+            disposition += f'; filename="{filename}"'
+        body += f"--{BOUNDARY}\r\nContent-Disposition: {disposition}\r\n\r\n".encode("utf-8")
+        body += content + b"\r\n"
+    return body + f"--{BOUNDARY}--\r\n".encode("utf-8")
+
+
+def multipart_request(body, chunk_size=7):
+    """按小块发送请求体，覆盖跨块的边界与头部"""
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+    headers = {
+        "content-type": f"multipart/form-data; boundary={BOUNDARY}",
+        "content-length": str(len(body)),
+    }
+    return FakeRequest(chunks, headers)
+
+
+def stream_files(request, tmp_path, **limits):
+    options = {"max_file_size": 1024, "max_total_size": 4096, "max_files": 5, "chunk_size": 16, **limits}
+    return asyncio.run(stream_multipart_files(
+        request, file_field="files", build_path=lambda filename: tmp_path / filename, **options
+    ))
+
+
+def test_stream_multipart_files_writes_files_and_fields(tmp_path):
+    first = b"a" * 100
+    second = b"b" * 37
+    body = multipart_body([
+        ("meeting_title", None, "周会".encode("utf-8")),
+        ("files", "one.mp3", first),
+        ("files", "two.wav", second),
+    ])
+
+    upload = stream_files(multipart_request(body), tmp_path)
+
+    assert upload["fields"] == {"meeting_title": "周会"}
+    assert [(f["filename"], f["file_size"]) for f in upload["files"]] == [("one.mp3", 100), ("two.wav", 37)]
+    assert (tmp_path / "one.mp3").read_bytes() == first
+    assert upload["files"][1]["sha256"] == hashlib.sha256(second).hexdigest()
+
+
+def test_stream_multipart_files_rejects_oversized_file(tmp_path):
+    body = multipart_body([("files", "big.mp3", b"x" * 200)])
+
+    with pytest.raises(UploadTooLargeError):
+        stream_files(multipart_request(body), tmp_path, max_file_size=100)
+    assert not (tmp_path / "big.mp3").exists()
+
+
+def test_stream_multipart_files_removes_written_files_on_error(tmp_path):
+    body = multipart_body([
+        ("files", "one.mp3", b"a" * 10),
+        ("files", "two.mp3", b"b" * 10),
+    ])
+
+    with pytest.raises(UploadFormatError):
+        stream_files(multipart_request(body), tmp_path, max_files=1)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_stream_multipart_files_requires_multipart(tmp_path):
+    request = FakeRequest([b"{}"], {"content-type": "application/json"})
+
+    with pytest.raises(UploadFormatError):
+        stream_files(request, tmp_path)
+
+
+def make_zip(path, members):
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return path
+
+
+def extract(zip_path, out_dir, **limits):
+    options = {"max_file_size": 1024, "max_total_size": 4096, "max_files": 5, "chunk_size": 16, **limits}
+    return extract_zip_members(
+        zip_path,
+        build_path=lambda name: out_dir / name,
+        is_allowed=lambda name: name.endswith(".mp3"),
+        **options,
+    )
+
+
+def test_extract_zip_members_skips_unlisted_and_hidden(tmp_path):
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    zip_path = make_zip(tmp_path / "upload.zip", {
+        "meetings/a.mp3": b"a" * 50,
+        "notes.txt": b"text",
+        "__MACOSX/._a.mp3": b"meta",
+    })
+
+    extracted = extract(zip_path, out_dir)
+
+    assert [(entry["filename"], entry["file_size"]) for entry in extracted] == [("a.mp3", 50)]
+    assert extracted[0]["sha256"] == hashlib.sha256(b"a" * 50).hexdigest()
+    assert (out_dir / "a.mp3").read_bytes() == b"a" * 50
+
+
+def test_extract_zip_members_checks_actual_size(tmp_path):
+    """按实际解压出的字节数限制大小（高压缩比内容）"""
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    zip_path = make_zip(tmp_path / "bomb.zip", {"a.mp3": b"\0" * 10000, "b.mp3": b"b"})
+
+    with pytest.raises(UploadTooLargeError):
+        extract(zip_path, out_dir, max_file_size=1000)
+    assert list(out_dir.iterdir()) == []
+
+
+def test_extract_zip_members_rejects_invalid_zip(tmp_path):
+    zip_path = tmp_path / "broken.zip"
+    zip_path.write_bytes(b"not a zip")
+
+    with pytest.raises(UploadFormatError):
+        extract(zip_path, tmp_path)
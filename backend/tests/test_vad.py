@@ -0,0 +1,62 @@
+"""
+语音活动检测测试
+"""
+
+import numpy as np
+
+from app.services.vad import SAMPLE_RATE, apply_vad, remap_timestamp
+
+
+def tone(seconds, frequency=1000.0, amplitude=0.3):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def silence(seconds):
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(int(seconds * SAMPLE_RATE)) * 1e-4).astype(np.float32)
+
+
+def test_apply_vad_removes_long_silence():
+    audio = np.concatenate([tone(2), silence(10), tone(3)])
+
+    result = apply_vad(audio)
+
+    assert result["regions"] == 2
+    assert result["total_seconds"] == 15.0
+    # 区间前后保留余量，剪掉的静音略少于10秒
+    assert 9.0 < result["skipped_seconds"] < 10.0
+    assert len(result["audio"]) == round(result["speech_seconds"] * SAMPLE_RATE)
+
+
+def test_apply_vad_timeline_maps_back_to_original_audio():
+    audio = np.concatenate([tone(2), silence(10), tone(3)])
+    result = apply_vad(audio)
+    concat_starts, original_starts = result["offsets"]
+
+    # 第二个区间在剪辑后音频中的起点映射回原始时间轴
+    assert remap_timestamp(float(concat_starts[1]), result["offsets"]) == round(float(original_starts[1]), 3)
+    # 第二段语音的中间位置（原始时间约13.5秒）
+    speech_middle = float(concat_starts[1]) + (13.5 - float(original_starts[1]))
+    assert remap_timestamp(speech_middle, result["offsets"]) == 13.5
+
+
+def test_apply_vad_without_speech():
+    result = apply_vad(silence(5))
+
+    assert result["regions"] == 0
+    assert len(result["audio"]) == 0
+    assert result["skipped_seconds"] == 5.0
+
+
+def test_remap_timestamp_boundary_belongs_to_previous_region_for_end():
+    offsets = (np.array([0.0, 2.0]), np.array([1.0, 10.0]))
+
+    assert remap_timestamp(2.0, offsets) == 10.0
+    assert remap_timestamp(2.0, offsets, is_end=True) == 3.0
+    assert remap_timestamp(0.5, offsets) == 1.5
+
+
+def test_remap_timestamp_without_offsets():
+    assert remap_timestamp(4.2, None) == 4.2
+    assert remap_timestamp(4.2, (np.zeros(0), np.zeros(0))) == 4.2
@@ -20,9 +20,9 @@ import {
 } from '@ant-design/icons';
 import type { UploadProps, UploadFile } from 'antd';
 
-import { ApiService } from '../services/api';
-import { UploadComponentProps, LanguageOption, WhisperModelOption } from '../types';
-import { validateAudioFile, formatFileSize, LANGUAGE_OPTIONS, WHISPER_MODEL_OPTIONS } from '../utils';
+import { ApiService, RESUMABLE_UPLOAD_THRESHOLD } from '../services/api';
+import { UploadComponentProps, LanguageOption, WhisperModelOption, TranscriptionEngineOption } from '../types';
+import { validateAudioFile, formatFileSize, LANGUAGE_OPTIONS, WHISPER_MODEL_OPTIONS, TRANSCRIBE_ENGINE_OPTIONS } from '../utils';
 
 const { Dragger } = Upload;
 const { Text } = Typography;
@@ -51,12 +51,18 @@ const UploadComponent: React.FC<UploadComponentProps> = ({
       setUploading(true);
       setUploadProgress(0);
 
-      const response = await ApiService.uploadAudio({
+      const params = {
         file: file,
         meeting_title: values.title || file.name,
         language: values.language || 'auto',
-        whisper_model: values.whisper_model || 'base'
-      });
+        whisper_model: values.whisper_model || 'base',
+        engine: values.engine
+      };
+
+      // 大文件使用可续传分块上传，网络中断时只需补传缺失分块
+      const response = file.size > RESUMABLE_UPLOAD_THRESHOLD
+        ? await ApiService.uploadAudioResumable(params, setUploadProgress)
+        : await ApiService.uploadAudio(params);
 
       onUploadSuccess(response);
       
@@ -228,6 +234,20 @@ const UploadComponent: React.FC<UploadComponentProps> = ({
               ))}
             </Select>
           </Form.Item>
+
+          <Form.Item
+            label="转录引擎"
+            name="engine"
+            extra="可选，不选择时使用服务端默认引擎"
+          >
+            <Select allowClear placeholder="服务端默认" disabled={uploading}>
+              {TRANSCRIBE_ENGINE_OPTIONS.map((option: TranscriptionEngineOption) => (
+                <Option key={option.value} value={option.value}>
+                  {option.label} - {option.description}
+                </Option>
+              ))}
+            </Select>
+          </Form.Item>
         </Form>
 
         {/* 上传按钮 */}
@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import {
   Card,
@@ -26,7 +26,7 @@ import {
 } from '@ant-design/icons';
 
 import { ApiService } from '../services/api';
-import { TaskStatusResponse, TaskStatus } from '../types';
+import { TaskStatusResponse, TaskStatus, TranscriptionSegment } from '../types';
 import { formatTime, getErrorMessage, TASK_STATUS_MAP } from '../utils';
 
 const { Title, Text, Paragraph } = Typography;
@@ -40,6 +40,54 @@ const ProcessingPage: React.FC = () => {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [polling, setPolling] = useState(true);
+  const [segments, setSegments] = useState<TranscriptionSegment[]>([]);
+  const segmentCursor = useRef(0);
+  const [summaryText, setSummaryText] = useState('');
+  const [reasoningText, setReasoningText] = useState('');
+  const summaryCursor = useRef(0);
+
+  // 拉取转录进行中已完成的片段（失败时忽略，不影响状态轮询）
+  const fetchSegments = useCallback(async () => {
+    if (!taskId) return;
+
+    try {
+      const data = await ApiService.getTaskSegments(taskId, segmentCursor.current);
+      if (data.segments.length > 0) {
+        segmentCursor.current = data.next_cursor;
+        // 超长音频分块并行转录时片段可能乱序到达，按开始时间排序
+        setSegments(prev => [...prev, ...data.segments].sort((a, b) => a.start - b.start));
+      }
+    } catch (err) {
+      console.warn('获取转录片段失败:', err);
+    }
+  }, [taskId]);
+
+  // 拉取摘要生成中的增量文本（失败时忽略，不影响状态轮询）
+  const fetchSummary = useCallback(async () => {
+    if (!taskId) return;
+
+    try {
+      const data = await ApiService.getTaskSummaryStream(taskId, summaryCursor.current);
+      if (data.next_cursor > summaryCursor.current) {
+        summaryCursor.current = data.next_cursor;
+        setReasoningText(prev => prev + data.reasoning);
+        setSummaryText(prev => prev + data.content);
+      }
+    } catch (err) {
+      console.warn('获取摘要增量失败:', err);
+    }
+  }, [taskId]);
+
+  // 进入摘要阶段后更频繁地拉取摘要增量
+  const summarizing = polling && taskStatus?.status === 'processing'
+    && (taskStatus.current_step || '').toString().includes('摘要');
+
+  useEffect(() => {
+    if (!summarizing) return;
+
+    const interval = setInterval(fetchSummary, 1000);
+    return () => clearInterval(interval);
+  }, [summarizing, fetchSummary]);
 
   const fetchTaskStatus = useCallback(async () => {
     if (!taskId) return;
@@ -49,6 +97,10 @@ const ProcessingPage: React.FC = () => {
       setTaskStatus(status);
       setError(null);
 
+      if (status.status === 'processing') {
+        fetchSegments();
+      }
+
       // 如果任务完成或失败，停止轮询
       if (status.status === 'completed' || status.status === 'failed') {
         setPolling(false);
@@ -66,7 +118,7 @@ const ProcessingPage: React.FC = () => {
     } finally {
       setLoading(false);
     }
-  }, [taskId, navigate]);
+  }, [taskId, navigate, fetchSegments]);
 
   useEffect(() => {
     if (!taskId) {
@@ -288,6 +340,40 @@ const ProcessingPage: React.FC = () => {
         </Space>
       </Card>
 
+      {/* 实时转录 */}
+      {segments.length > 0 && taskStatus?.status !== 'completed' && (
+        <Card className="content-card" title="实时转录">
+          <div style={{ maxHeight: '320px', overflowY: 'auto' }}>
+            {segments.map((segment, index) => (
+              <Paragraph key={index} style={{ marginBottom: '8px' }}>
+                <Text type="secondary" style={{ marginRight: '8px' }}>
+                  [{formatTime(segment.start)}]
+                </Text>
+                {segment.text}
+              </Paragraph>
+            ))}
+          </div>
+        </Card>
+      )}
+
+      {/* 纪要生成中 */}
+      {(summaryText || reasoningText) && taskStatus?.status !== 'completed' && (
+        <Card className="content-card" title="会议纪要生成中">
+          <div style={{ maxHeight: '480px', overflowY: 'auto' }}>
+            {!summaryText && (
+              <Paragraph type="secondary" style={{ whiteSpace: 'pre-wrap' }}>
+                {reasoningText}
+              </Paragraph>
+            )}
+            {summaryText && (
+              <Paragraph style={{ whiteSpace: 'pre-wrap' }}>
+                {summaryText}
+              </Paragraph>
+            )}
+          </div>
+        </Card>
+      )}
+
       {/* 任务详情 */}
       {taskStatus && (
         <Card className="content-card" title="任务详情">
@@ -2,11 +2,21 @@ import axios, { AxiosInstance, AxiosResponse } from 'axios';
 import {
   UploadResponse,
   TaskStatusResponse,
+  TaskSegmentsResponse,
+  TaskSummaryStreamResponse,
   SupportedFormatsResponse,
   HealthCheckResponse,
   UploadParams,
+  UploadSession,
+  UploadSessionStatus,
 } from '@/types';
 
+// 超过该大小的文件使用可续传分块上传
+export const RESUMABLE_UPLOAD_THRESHOLD = 20 * 1024 * 1024;
+// 分块上传的并行数与单个分块的重试次数
+const RESUMABLE_UPLOAD_PARALLEL = 3;
+const RESUMABLE_CHUNK_RETRIES = 3;
+
 // 创建axios实例
 const api: AxiosInstance = axios.create({
   baseURL: process.env.REACT_APP_API_BASE_URL || 'http://localhost:8000',
@@ -65,6 +75,10 @@ export class ApiService {
       formData.append('whisper_model', params.whisper_model);
     }
 
+    if (params.engine) {
+      formData.append('engine', params.engine);
+    }
+
     const response = await api.post<UploadResponse>('/api/upload/audio', formData, {
       headers: {
         'Content-Type': 'multipart/form-data',
@@ -75,6 +89,120 @@ export class ApiService {
     return response.data;
   }
 
+  /**
+   * 可续传分块上传音频文件
+   * 分块并行上传，失败的分块单独重试；传入已有sessionId时只补传缺失区间
+   */
+  static async uploadAudioResumable(
+    params: UploadParams,
+    onProgress?: (percent: number) => void,
+    sessionId?: string
+  ): Promise<UploadResponse> {
+    const { file } = params;
+
+    let session: UploadSession | UploadSessionStatus;
+    let chunkSize: number;
+    let received: Array<[number, number]> = [];
+
+    if (sessionId) {
+      const status = await api.get<UploadSessionStatus>(`/api/upload/sessions/${sessionId}`);
+      session = status.data;
+      received = status.data.received_ranges;
+      chunkSize = 8 * 1024 * 1024;
+    } else {
+      const created = await api.post<UploadSession>('/api/upload/sessions', {
+        filename: file.name,
+        file_size: file.size,
+        meeting_title: params.meeting_title,
+        language: params.language,
+        whisper_model: params.whisper_model,
+        engine: params.engine,
+      });
+      session = created.data;
+      chunkSize = created.data.chunk_size;
+    }
+
+    // 计算尚未接收的分块
+    const pending: Array<[number, number]> = [];
+    for (let offset = 0; offset < file.size; offset += chunkSize) {
+      const end = Math.min(offset + chunkSize, file.size);
+      const done = received.some(([start, stop]) => start <= offset && end <= stop);
+      if (!done) {
+        pending.push([offset, end]);
+      }
+    }
+
+    let uploadedBytes = file.size - pending.reduce((sum, [start, end]) => sum + end - start, 0);
+    onProgress?.(Math.round((uploadedBytes / file.size) * 100));
+
+    const uploadChunk = async ([start, end]: [number, number]) => {
+      for (let attempt = 1; ; attempt++) {
+        try {
+          await api.put(`/api/upload/sessions/${session.session_id}/chunks`, file.slice(start, end), {
+            params: { offset: start },
+            headers: { 'Content-Type': 'application/octet-stream' },
+            timeout: 120000,
+          });
+          uploadedBytes += end - start;
+          onProgress?.(Math.round((uploadedBytes / file.size) * 100));
+          return;
+        } catch (error) {
+          if (attempt >= RESUMABLE_CHUNK_RETRIES) {
+            throw error;
+          }
+        }
+      }
+    };
+
+    const workers = Array.from({ length: RESUMABLE_UPLOAD_PARALLEL }, async () => {
+      while (pending.length > 0) {
+        await uploadChunk(pending.shift() as [number, number]);
+      }
+    });
+    await Promise.all(workers);
+
+    const response = await api.post<UploadResponse>(
+      `/api/upload/sessions/${session.session_id}/complete`
+    );
+    return response.data;
+  }
+
+  /**
+   * 批量上传音频文件（可包含zip压缩包）
+   */
+  static async uploadAudioBatch(
+    files: File[],
+    options: { language?: string; whisper_model?: string } = {}
+  ): Promise<any> {
+    const formData = new FormData();
+    files.forEach((file) => formData.append('files', file));
+
+    if (options.language) {
+      formData.append('language', options.language);
+    }
+
+    if (options.whisper_model) {
+      formData.append('whisper_model', options.whisper_model);
+    }
+
+    const response = await api.post('/api/upload/audio/batch', formData, {
+      headers: {
+        'Content-Type': 'multipart/form-data',
+      },
+      timeout: 0, // 批量上传不设超时
+    });
+
+    return response.data;
+  }
+
+  /**
+   * 获取批量上传的汇总进度
+   */
+  static async getBatchStatus(batchId: string): Promise<any> {
+    const response = await api.get(`/api/tasks/batch/${batchId}`);
+    return response.data;
+  }
+
   /**
    * 获取任务状态
    */
@@ -83,6 +211,26 @@ export class ApiService {
     return response.data;
   }
 
+  /**
+   * 获取转录进行中已完成的片段（cursor为上次返回的next_cursor）
+   */
+  static async getTaskSegments(taskId: string, cursor: number = 0): Promise<TaskSegmentsResponse> {
+    const response = await api.get<TaskSegmentsResponse>(`/api/tasks/${taskId}/segments`, {
+      params: { cursor },
+    });
+    return response.data;
+  }
+
+  /**
+   * 获取生成中的会议纪要增量文本（cursor为上次返回的next_cursor）
+   */
+  static async getTaskSummaryStream(taskId: string, cursor: number = 0): Promise<TaskSummaryStreamResponse> {
+    const response = await api.get<TaskSummaryStreamResponse>(`/api/tasks/${taskId}/summary-stream`, {
+      params: { cursor },
+    });
+    return response.data;
+  }
+
   /**
    * 取消任务
    */
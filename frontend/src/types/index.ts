@@ -18,7 +18,11 @@ export interface UploadResponse {
     meeting_title: string;
     language: string;
     upload_time: string;
+    duration?: number | null;
   };
+  // 相同文件已处理过时直接返回历史结果
+  deduplicated?: boolean;
+  result?: ProcessingResult;
 }
 
 // 任务状态类型
@@ -50,6 +54,24 @@ export interface TaskStatusResponse {
   started_at?: string;
 }
 
+// 转录进行中增量返回的片段
+export interface TaskSegmentsResponse {
+  task_id: string;
+  segments: TranscriptionSegment[];
+  next_cursor: number;
+  complete: boolean;
+}
+
+// 摘要生成中增量返回的文本
+export interface TaskSummaryStreamResponse {
+  task_id: string;
+  reasoning: string;
+  content: string;
+  next_cursor: number;
+  complete: boolean;
+  error?: string | null;
+}
+
 // 转录结果
 export interface TranscriptionResult {
   text: string;
@@ -150,6 +172,26 @@ export interface UploadParams {
   meeting_title?: string;
   language?: string;
   whisper_model?: WhisperModel;
+  engine?: TranscriptionEngine;
+}
+
+// 可续传上传会话
+export interface UploadSession {
+  success: boolean;
+  session_id: string;
+  file_size: number;
+  chunk_size: number;
+  max_chunk_size: number;
+}
+
+// 可续传上传会话状态
+export interface UploadSessionStatus {
+  session_id: string;
+  filename: string;
+  file_size: number;
+  received_ranges: Array<[number, number]>;
+  received_bytes: number;
+  complete: boolean;
 }
 
 // 语言选项
@@ -164,6 +206,16 @@ export type ExportFormat = 'markdown' | 'txt';
 // Whisper模型类型
 export type WhisperModel = 'base' | 'large' | 'turbo';
 
+// 转录引擎类型（不指定时使用服务端配置）
+export type TranscriptionEngine = 'whisper' | 'faster-whisper';
+
+// 转录引擎选项接口
+export interface TranscriptionEngineOption {
+  value: TranscriptionEngine;
+  label: string;
+  description: string;
+}
+
 // Whisper模型选项接口
 export interface WhisperModelOption {
   value: WhisperModel;
@@ -1,5 +1,5 @@
 import { saveAs } from 'file-saver';
-import { ExportFormat, WhisperModelOption } from '@/types';
+import { ExportFormat, WhisperModelOption, TranscriptionEngineOption } from '@/types';
 
 /**
  * 格式化文件大小
@@ -226,6 +226,20 @@ export const WHISPER_MODEL_OPTIONS: WhisperModelOption[] = [
   },
 ];
 
+// 转录引擎选项
+export const TRANSCRIBE_ENGINE_OPTIONS: TranscriptionEngineOption[] = [
+  {
+    value: 'whisper' as const,
+    label: 'Whisper（PyTorch）',
+    description: '官方实现，GPU上速度快',
+  },
+  {
+    value: 'faster-whisper' as const,
+    label: 'Faster-Whisper（CTranslate2）',
+    description: 'CPU上int8推理，速度提升数倍',
+  },
+];
+
 /**
  * 导出格式选项
  */
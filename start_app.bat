@@ -49,6 +49,9 @@ echo 正在启动后端服务 (API & Celery)...
 REM 启动 Celery Worker (在新窗口)
 start "MeetMemo Celery Worker" cmd /k "python celery_worker.py"
 
+REM 启动 AI摘要 Worker (在新窗口)
+start "MeetMemo AI Worker" cmd /k "python celery_worker.py ai"
+
 REM 启动 API Server (在新窗口)
 REM 使用 start_dev.py，但我们已禁用了它的自动安装依赖功能
 start "MeetMemo API Server" cmd /k "python start_dev.py"